@@ -3,11 +3,11 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from scipy.interpolate import interp1d
 from streamlit_lottie import st_lottie
 import json
 import io
 import matplotlib.pyplot as plt
+from functools import partial
 
 
 
@@ -25,6 +25,147 @@ def fig_to_png_bytes(x, y, title, xlabel, ylabel):
     buf.seek(0)
     return buf
 
+
+def parse_float_list(text, valid=None):
+    """
+    Parses a comma separated list of numbers into an array. Raises
+    ValueError for text that is not a number and, with `valid` (an
+    element-wise check of the array), for numbers out of range.
+    """
+    values = np.array([float(x) for x in text.split(",") if x.strip()])
+    if valid is not None and not np.all(valid(values)):
+        raise ValueError(f"Out of range: {text}")
+    return values
+
+
+def valid_damping(ζ):
+    """Damping ratios the solvers accept (underdamped, 0 <= ζ < 1)."""
+    return (ζ >= 0) & (ζ < 1)
+
+
+def valid_factor(x):
+    """Positive, finite factors (Ry, target ductility)."""
+    return np.isfinite(x) & (x > 0)
+
+
+def is_uniform(time):
+    """Checks that a record is sampled at a constant interval."""
+    steps = np.diff(time)
+    return np.allclose(steps, steps[0], rtol=1e-6, atol=0)
+
+
+def spectrum_solver(solver, multirate, tol):
+    """Wraps a response spectrum solver in the multirate engine when requested."""
+    if multirate:
+        return partial(multirate_response_spectrum, solver, tol=tol)
+    return solver
+
+
+# Spectral ordinates offered on the response spectrum pages: (title, axis label)
+SPECTRAL_ORDINATES = {
+    "SD": ("Displacement Response Spectrum", "Max Displacement (m)"),
+    "SV": ("Relative Velocity Response Spectrum", "Max Relative Velocity (m/s)"),
+    "SA": ("Absolute Acceleration Response Spectrum", "Max Absolute Acceleration (m/s²)"),
+    "PSV": ("Pseudo-Velocity Response Spectrum", "Pseudo-Velocity (m/s)"),
+    "PSA": ("Pseudo-Acceleration Response Spectrum", "Pseudo-Acceleration (m/s²)"),
+}
+
+
+def draw_spectrum_pass(placeholder, ζ_values, Tn_values, spectrum, n_pass):
+    """
+    Redraws the displacement spectrum of an unfinished adaptive run in
+    `placeholder` (callback of adaptive_response_spectrum). Changing an input
+    reruns the page, which interrupts the run at its next redraw.
+    """
+    fig = go.Figure()
+    for ζ, curve in zip(ζ_values, np.atleast_2d(spectrum["SD"])):
+        fig.add_trace(go.Scatter(x=Tn_values, y=curve, mode='lines+markers',
+                                 name=f"ζ = {ζ:g}", marker=dict(size=4)))
+    fig.update_layout(
+        title=f"Displacement Response Spectrum (pass {n_pass}, {len(Tn_values)} periods, refining...)",
+        xaxis_title='Natural Period (s)',
+        yaxis_title='Max Displacement (m)',
+        template='plotly_dark'
+    )
+    placeholder.plotly_chart(fig, use_container_width=True)
+
+
+def show_response_spectrum(method):
+    """
+    Plots the last spectrum computed on the page of `method` (kept in the
+    session state, so switching the ordinate does not recompute it): one
+    curve per damping ratio, their damping modification factors, and the
+    CSV/PNG downloads.
+    """
+    stored = st.session_state.get("spectrum")
+    if stored is None or stored[0] != method:
+        return
+    _, Tn_values, spectrum, ζ_values = stored
+
+    ordinate = st.radio("Spectral Ordinate", list(SPECTRAL_ORDINATES), horizontal=True)
+    title, axis_label = SPECTRAL_ORDINATES[ordinate]
+    values = np.atleast_2d(spectrum[ordinate])
+    labels = [f"ζ = {ζ:g}" for ζ in ζ_values]
+
+    fig_rs = go.Figure()
+    for label, curve in zip(labels, values):
+        fig_rs.add_trace(go.Scatter(
+            x=Tn_values,
+            y=curve,
+            mode='lines',
+            name=label,
+            line=dict(shape='spline', width=3)
+        ))
+    fig_rs.update_layout(
+        title=title,
+        xaxis_title='Natural Period (s)',
+        yaxis_title=axis_label,
+        yaxis=dict(range=[0, np.nanmax(values) * 1.1]),
+        template='plotly_dark'
+    )
+    st.plotly_chart(fig_rs, use_container_width=True)
+
+    # Damping modification factors relative to 5%
+    if len(ζ_values) > 1 and min(ζ_values) <= 0.05 <= max(ζ_values):
+        factors = damping_modification_factor(ζ_values, values)
+        fig_b = go.Figure()
+        for label, factor in zip(labels, factors):
+            fig_b.add_trace(go.Scatter(
+                x=Tn_values, y=factor, mode='lines', name=label))
+        fig_b.update_layout(
+            title='Damping Modification Factor (relative to 5%)',
+            xaxis_title='Natural Period (s)',
+            yaxis_title=f'{ordinate}(ζ) / {ordinate}(5%)',
+            template='plotly_dark'
+        )
+        st.plotly_chart(fig_b, use_container_width=True)
+
+    # --- DOWNLOAD SECTION FOR RESPONSE SPECTRUM ---
+    spectrum_df = pd.DataFrame({"Natural Period (s)": Tn_values})
+    for key in ("SD", "SV", "SA", "PSV", "PSA", "t_SD", "t_SV", "t_SA"):
+        for label, curve in zip(labels, np.atleast_2d(spectrum[key])):
+            spectrum_df[f"{key}, {label}"] = curve
+    csv_spectrum = spectrum_df.to_csv(index=False).encode('utf-8')
+    # Export response spectrum plot to PNG
+    buffer_spectrum = fig_to_png_bytes(
+        Tn_values, values.T, title, "Natural Period (s)", axis_label
+    )
+
+    # Download buttons
+    with st.expander("📥 Download Response Spectrum Outputs"):
+        st.download_button(
+            label="📄 Download Spectrum Data as CSV",
+            data=csv_spectrum,
+            file_name="response_spectrum.csv",
+            mime="text/csv"
+        )
+        st.download_button(
+            label="📊 Download Spectrum Plot (PNG)",
+            data=buffer_spectrum,
+            file_name="response_spectrum_plot.png",
+            mime="image/png"
+        )
+
 from PIL import Image
 
 from pathlib import Path
@@ -35,11 +176,78 @@ from solver.newmark_method_THL import newmark_solver
 from solver.newmark_method_RSL import newmark_response_spectrum_solver
 from solver.Interpolation_Excitation_THL import interpolation_excitation_solver
 from solver.Interpolation_Excitation_RSL import interpolation_response_spectrum_solver
+from solver.frequency_domain_THL import frequency_domain_solver
+from solver.frequency_domain_RSL import frequency_domain_response_spectrum_solver
+from solver.period_grid import adaptive_response_spectrum
+from solver.multirate_RSL import multirate_response_spectrum
+from solver.preprocessing import resample_record, load_record_suite
+from solver.damping import damping_modification_factor
 from solver.KR_aplha_THL import kr_alpha_linear_solver
 from solver.KR_alpha_RSL import kr_alpha_response_spectrum_solver
-from solver.EPP_CDM_THL import epp_time_history_solver
-from solver.EPP_Newmark_THL import epp_newmark_solver
-from solver.EPP_KR_THL import epp_kr_alpha_solver
+from solver.Hysteretic_THL import hysteretic_solver
+from solver.integrator import CentralDifference, Newmark, KRAlpha
+from solver.restoring_force import (ElasticPerfectlyPlastic, Bilinear, BilinearPDelta, Clough, Takeda, Pinching,
+                                    BoucWen)
+from solver.EPP_Newmark_RSL import epp_newmark_spectrum_solver, constant_ductility_spectrum_solver
+from solver.EPP_Event_THL import epp_event_solver
+from solver.convergence import epp_convergence_report
+from solver.ida import ida_suite
+from solver.ground_motion import synthetic_ground_motions
+from solver.backend import precompile, active_backend
+
+# Hysteretic models offered on the nonlinear time-history pages:
+# name -> (model class, {input label: (keyword, default)})
+HYSTERETIC_MODELS = {
+    "Elastic-Perfectly Plastic": (ElasticPerfectlyPlastic, {}),
+    "Bilinear (Kinematic Hardening)": (Bilinear, {
+        "Post-Yield Stiffness Ratio": ("alpha", 0.05)}),
+    "Bilinear with P-Δ": (BilinearPDelta, {
+        "Post-Yield Stiffness Ratio": ("alpha", 0.0),
+        "Stability Coefficient θ": ("theta", 0.05)}),
+    "Clough (Stiffness Degrading)": (Clough, {
+        "Post-Yield Stiffness Ratio": ("alpha", 0.0)}),
+    "Takeda": (Takeda, {
+        "Post-Yield Stiffness Ratio": ("alpha", 0.0),
+        "Unloading Stiffness Exponent": ("beta", 0.4)}),
+    "Pinching": (Pinching, {
+        "Post-Yield Stiffness Ratio": ("alpha", 0.0),
+        "Pinching Factor (0-1)": ("kappa", 0.5)}),
+    "Bouc-Wen": (BoucWen, {
+        "Post-Yield Stiffness Ratio": ("alpha", 0.05),
+        "Yield Sharpness n": ("n", 1.0),
+        "Bouc-Wen β": ("beta", 0.5),
+        "Bouc-Wen γ": ("gamma", 0.5)}),
+}
+
+
+def hysteretic_model_inputs():
+    """Hysteretic model selector: returns the model class and its parameters."""
+    name = st.selectbox("Hysteretic Model:", list(HYSTERETIC_MODELS))
+    model, fields = HYSTERETIC_MODELS[name]
+    params = {key: st.number_input(label, value=default) for label, (key, default) in fields.items()}
+    return model, params
+
+
+def damage_index_inputs():
+    """Park-Ang damage index parameters, passed on to the nonlinear solvers."""
+    return {"mu_u": st.number_input("Ductility Capacity μu (Park-Ang)", min_value=1.0, value=10.0),
+            "beta_PA": st.number_input("Cyclic Weight β (Park-Ang)", min_value=0.0, value=0.15)}
+
+
+def show_energy_history(time, energy):
+    """Displays the Park-Ang damage index and the energy time histories of a nonlinear run."""
+    st.markdown(f"**Park-Ang Damage Index:** {energy['park_ang']:.2f}")
+    fig_e = go.Figure()
+    for key, name in (("input", "Input"), ("kinetic", "Kinetic"), ("damping", "Damping"),
+                      ("hysteretic", "Hysteretic")):
+        fig_e.add_trace(go.Scatter(x=time, y=energy[key], mode='lines', name=name))
+    fig_e.update_layout(
+        title='Energy vs Time',
+        xaxis_title='Time (s)',
+        yaxis_title='Normalized Energy (E/(Fy uy))',
+        template='plotly_dark'
+    )
+    st.plotly_chart(fig_e, use_container_width=True)
 
 # === PAGE SETUP ===
 st.set_page_config(layout="wide", page_title="Dynamic Analysis")
@@ -50,6 +258,10 @@ if "started" not in st.session_state:
 if "page" not in st.session_state:
     st.session_state.page = "home"
 
+# === SOLVER BACKEND ===
+# Compile the Numba kernels once per server process (no-op without Numba)
+precompile()
+
 # === LOAD LOTTIE ===
 
 
@@ -231,6 +443,7 @@ elif st.session_state.page == "about":
     - Predefined ground motion datasets    - - Residual deformation & ductility demand estimation   - - Clean and interactive UI for better interpretation
 
     **Built With:** Python • Streamlit • NumPy • Matplotlib  
+    **Solver Backend:** """ + active_backend() + """  
     **Intended Users:** Civil engineering students, researchers, earthquake engineers, and educators.
 
     ---
@@ -303,9 +516,9 @@ if st.session_state.started:
         st.subheader("Select Ground Motion")
         motion_choice = selected_option = st.selectbox(
             "Choose a ground motion file or upload your own:",
-            ["-- Select --", "Upload your own", "El Centro", "Beverli Hill 009", "Beverli Hill 279", "Delta 262",
+            ["-- Select --", "Upload your own", "Synthetic (Clough-Penzien)", "El Centro", "Beverli Hill 009", "Beverli Hill 279", "Delta 262",
              "Delta 352", "Hollywood 90", "Hollywood 180", "Poe Road 270", "Poe Road 360", "Tolmezzo 000", "Tolmezzo 270"],
-            index=2  # "El Centro" is at index 2
+            index=3  # "El Centro" is at index 3
         )
 
         st.markdown(
@@ -318,6 +531,15 @@ if st.session_state.started:
             uploaded_file = st.file_uploader(
                 "Upload Ground Motion File", type=["txt", "csv"])
 
+        if motion_choice == "Synthetic (Clough-Penzien)":
+            # Filtered white noise, reproducible from its seed
+            pga = st.number_input("Peak Ground Acceleration (g)", min_value=0.01, value=0.30)
+            duration = st.number_input("Record Duration (s)", min_value=1.0, value=20.0)
+            seed = st.number_input("Random Seed", min_value=0, value=0, step=1)
+            time, accel = synthetic_ground_motions(1, duration=duration, seed=int(seed), pga=pga)
+            st.success("Synthetic ground motion generated.")
+            return time, accel[0]
+
         if motion_choice != "-- Select --":
             try:
                 if motion_choice == "Upload your own":
@@ -365,7 +587,7 @@ if st.session_state.started:
         if lin_type == "Time History":
             st.success("You selected Time History method.")
             time_history_method = st.selectbox("Choose Numerical Method:", [
-                                               "-- Select --", "Interpolation of Excitation", "K R-Alpha Method ", "Central Difference", "Newmark's Method"])
+                                               "-- Select --", "Interpolation of Excitation", "Frequency Domain (FFT)", "K R-Alpha Method ", "Central Difference", "Newmark's Method"])
 
             if time_history_method == "Central Difference":
                 st.subheader(
@@ -378,9 +600,7 @@ if st.session_state.started:
                 time, accel = load_raw_ground_motion()
                 if time is not None and accel is not None:
                     dt = 0.0001
-                    time_new = np.arange(time[0], time[-1], dt)
-                    interpolator = interp1d(time, accel, kind='linear')
-                    accel_new = interpolator(time_new)
+                    time_new, accel_new = resample_record(accel, time, dt=dt)
 
                     if st.button("Run Central Difference Simulation"):
                         with st.spinner("Running simulation..."):
@@ -490,9 +710,7 @@ if st.session_state.started:
                 time, accel = load_raw_ground_motion()
                 if time is not None and accel is not None:
                     dt = 0.0001
-                    time_new = np.arange(time[0], time[-1], dt)
-                    interpolator = interp1d(time, accel, kind='linear')
-                    accel_new = interpolator(time_new)
+                    time_new, accel_new = resample_record(accel, time, dt=dt)
 
                     if st.button("Run Newmark's Method Simulation"):
                         with st.spinner("Running simulation..."):
@@ -570,13 +788,20 @@ if st.session_state.started:
                 m = st.number_input("Mass (kg)", value=1)
                 ζ = st.number_input("Damping Ratio (0-1)", value=0.05)
                 Tn = st.number_input("Natural Period (s)", value=1.00)
+                native = st.checkbox(
+                    "Native Sampling (exact between samples, no upsampling)", value=True)
+                substeps = st.number_input(
+                    "Output Points per Sample Interval", min_value=1, value=10, step=1,
+                    disabled=not native)
 
                 time, accel = load_raw_ground_motion()
                 if time is not None and accel is not None:
-                    dt = 0.0001
-                    time_new = np.arange(time[0], time[-1], dt)
-                    interpolator = interp1d(time, accel, kind='linear')
-                    accel_new = interpolator(time_new)
+                    if native and is_uniform(time):
+                        time_new, accel_new = np.asarray(time, dtype=float), np.asarray(accel, dtype=float)
+                    else:
+                        dt = 0.0001
+                        time_new, accel_new = resample_record(accel, time, dt=dt)
+                        substeps = 1
 
                     if st.button("Run Interpolation of Excitation Simulation"):
                         with st.spinner("Running simulation..."):
@@ -584,7 +809,7 @@ if st.session_state.started:
                             lottie_placeholder_lottie = st_lottie(
                                 lottie_eq, speed=1, height=300, loop=True, key="loading_anim")
                             u, v, t = interpolation_excitation_solver(
-                                m, ζ, Tn, accel_new, time_new)
+                                m, ζ, Tn, accel_new, time_new, substeps=int(substeps))
                         lottie_placeholder.empty()
                         st.success("Simulation completed!")
                         fig_u = go.Figure()
@@ -640,6 +865,99 @@ if st.session_state.started:
                                 file_name="velocity_plot.png",
                                 mime="image/png"
                             )
+            elif time_history_method == "Frequency Domain (FFT)":
+                st.subheader(
+                    "Provide System Parameters and Upload Ground Acceleration File")
+                m = st.number_input("Mass (kg)", value=1)
+                ζ = st.number_input("Damping Ratio (0-1)", value=0.05)
+                Tn = st.number_input("Natural Period (s)", value=1.00)
+                pad = st.number_input("Free Vibration Tail (s)", value=20.0)
+
+                time, accel = load_raw_ground_motion()
+                if time is not None and accel is not None:
+                    dt = 0.0001
+                    time_new, accel_new = resample_record(accel, time, dt=dt)
+
+                    if st.button("Run Frequency Domain Simulation"):
+                        with st.spinner("Running simulation..."):
+                            lottie_placeholder = st.empty()
+                            lottie_placeholder_lottie = st_lottie(
+                                lottie_eq, speed=1, height=300, loop=True, key="loading_anim")
+                            u, v, a, t = frequency_domain_solver(
+                                m, ζ, Tn, accel_new, time_new, pad)
+                        lottie_placeholder.empty()
+                        st.success("Simulation completed!")
+
+                        fig_u = go.Figure()
+                        fig_u.add_trace(go.Scatter(
+                            x=t, y=u, mode='lines', name='Displacement'))
+                        fig_u.update_layout(
+                            title='Displacement vs Time',
+                            xaxis_title='Time (s)',
+                            yaxis_title='Displacement (m)',
+                            template='plotly_dark'
+                        )
+                        st.plotly_chart(fig_u, use_container_width=True)
+
+                        fig_v = go.Figure()
+                        fig_v.add_trace(go.Scatter(
+                            x=t, y=v, mode='lines', name='Velocity', line=dict(color='orange')))
+                        fig_v.update_layout(
+                            title='Velocity vs Time',
+                            xaxis_title='Time (s)',
+                            yaxis_title='Velocity (m/s)',
+                            template='plotly_dark'
+                        )
+                        st.plotly_chart(fig_v, use_container_width=True)
+
+                        fig_a = go.Figure()
+                        fig_a.add_trace(go.Scatter(
+                            x=t, y=a, mode='lines', name='Acceleration', line=dict(color='green')))
+                        fig_a.update_layout(
+                            title='Acceleration vs Time',
+                            xaxis_title='Time (s)',
+                            yaxis_title='Acceleration (m/s²)',
+                            template='plotly_dark'
+                        )
+                        st.plotly_chart(fig_a, use_container_width=True)
+                        # --- DOWNLOAD SECTION ---
+                        results = pd.DataFrame({
+                            "Time (s)": t,
+                            "Displacement (m)": u,
+                            "Velocity (m/s)": v,
+                            "Acceleration (m/s²)": a
+                        })
+                        csv = results.to_csv(index=False).encode('utf-8')
+                        # Create PNGs for all 3 plots
+                        buffer_u = fig_to_png_bytes(t, u, "Displacement vs Time", "Time (s)", "Displacement (m)")
+                        buffer_v = fig_to_png_bytes(t, v, "Velocity vs Time", "Time (s)", "Velocity (m/s)")
+                        buffer_a = fig_to_png_bytes(t, a, "Acceleration vs Time", "Time (s)", "Acceleration (m/s²)")
+                        # Download buttons
+                        with st.expander("📥 Download Simulation Outputs"):
+                            st.download_button(
+                                label="📄 Download Data as CSV",
+                                data=csv,
+                                file_name="simulation_results.csv",
+                                mime="text/csv"
+                            )
+                            st.download_button(
+                                label="📉 Download Displacement Plot (PNG)",
+                                data=buffer_u,
+                                file_name="displacement_plot.png",
+                                mime="image/png"
+                            )
+                            st.download_button(
+                                label="📈 Download Velocity Plot (PNG)",
+                                data=buffer_v,
+                                file_name="velocity_plot.png",
+                                mime="image/png"
+                            )
+                            st.download_button(
+                                label="📊 Download Acceleration Plot (PNG)",
+                                data=buffer_a,
+                                file_name="acceleration_plot.png",
+                                mime="image/png"
+                            )
             elif time_history_method == "K R-Alpha Method ":
                 st.subheader(
                     "Provide System Parameters and Upload Ground Acceleration File")
@@ -651,9 +969,7 @@ if st.session_state.started:
                 time, accel = load_raw_ground_motion()
                 if time is not None and accel is not None:
                     dt = 0.0001
-                    time_new = np.arange(time[0], time[-1], dt)
-                    interpolator = interp1d(time, accel, kind='linear')
-                    accel_new = interpolator(time_new)
+                    time_new, accel_new = resample_record(accel, time, dt=dt)
 
                     if st.button("Run K R-Alpha Method Simulation"):
                         with st.spinner("Running simulation..."):
@@ -739,83 +1055,73 @@ if st.session_state.started:
         elif lin_type == "Response Spectrum":
             st.success("You selected Response Spectrum method.")
             Response_Spectrum_method = st.selectbox("Choose Numerical Method:", [
-                                                    "-- Select --", "Interpolation of Excitation", "K R-Alpha Method", "Central Difference", "Newmark's Method"])
+                                                    "-- Select --", "Interpolation of Excitation", "Frequency Domain (FFT)", "K R-Alpha Method", "Central Difference", "Newmark's Method"])
+            n_workers = st.number_input(
+                "Worker Processes (1 = serial)", min_value=1, value=os.cpu_count() or 1, step=1)
+            Tn_min = st.number_input(
+                "Minimum Natural Period (s)", min_value=0.005, value=0.01)
+            Tn_max = st.number_input(
+                "Maximum Natural Period (s)", min_value=0.1, max_value=10.0, value=3.0)
+            grid_tol = st.number_input(
+                "Period Grid Tolerance (fraction of peak)", min_value=0.0005, value=0.005, format="%.4f")
+            # Opt-in: the pure Python kernels cost per time step rather than
+            # per oscillator, so extra rate levels only pay off with Numba
+            multirate = st.checkbox(
+                "Multirate Integration (time step chosen per period)",
+                value=False)
+            multirate_tol = st.number_input(
+                "Multirate Accuracy Tolerance (fraction of peak)", min_value=0.0001, value=0.001,
+                format="%.4f", disabled=not multirate)
+            progressive = st.checkbox(
+                "Progressive Rendering (draw every refinement pass)", value=True)
 
             if Response_Spectrum_method == "Central Difference":
 
                 st.subheader(
                     "Provide System Parameters and Upload Ground Acceleration File")
-                ζ = st.number_input("Damping Ratio (default 2%)", value=0.02)
+                ζ_text = st.text_input(
+                    "Damping Ratios (comma separated, default 2%)", value="0.02")
+                try:
+                    ζ = parse_float_list(ζ_text, valid_damping)
+                except ValueError:
+                    ζ = np.array([])
+                    st.error("Damping ratios must be numbers with 0 ≤ ζ < 1.")
                 time, accel = load_raw_ground_motion()
 
                 if time is not None and accel is not None:
                     dt = 0.001
-                    time_new = np.arange(time[0], time[-1], dt)
-                    interpolator = interp1d(time, accel, kind='linear')
-                    accel_new = interpolator(time_new)
+                    time_new, accel_new = resample_record(accel, time, dt=dt)
 
-                    if st.button("Run Response Spectrum Simulation"):
+                    if len(ζ) > 0 and st.button("Run Response Spectrum Simulation"):
+                        preview = st.empty()
                         with st.spinner("Running simulation..."):
                             st_lottie(lottie_eq, speed=1,
                                       height=300, loop=True)
-                            Tn_values, max_disp = cd_response_spectrum_solver(
-                                ζ, accel_new, time_new)
+                            Tn_values, spectrum = adaptive_response_spectrum(
+                                spectrum_solver(cd_response_spectrum_solver, multirate, multirate_tol),
+                                ζ, accel_new, time_new,
+                                Tn_min=Tn_min, Tn_max=Tn_max, tol=grid_tol,
+                                n_workers=n_workers, full_output=True,
+                                callback=partial(draw_spectrum_pass, preview, ζ) if progressive else None)
+                        preview.empty()
 
                         st.success("Simulation completed!")
+                        st.session_state.spectrum = (
+                            Response_Spectrum_method, Tn_values, spectrum, ζ)
 
-                        fig_rs = go.Figure()
-                        fig_rs.add_trace(go.Scatter(
-                            x=Tn_values,
-                            y=max_disp,
-                            mode='lines',
-                            name='Displacement Response Spectrum',
-                            line=dict(shape='spline',
-                                      color='lightblue', width=3)
-                        ))
-                        fig_rs.update_layout(
-                            title='Displacement Response Spectrum',
-                            xaxis_title='Natural Period (s)',
-                            yaxis_title='Max Displacement (m)',
-                            yaxis=dict(range=[0, max(max_disp) * 1.1]),
-                            template='plotly_dark'
-                        )
-                        st.plotly_chart(fig_rs, use_container_width=True)
-                        # --- DOWNLOAD SECTION FOR RESPONSE SPECTRUM ---
-                        spectrum_df = pd.DataFrame({
-                            "Natural Period (s)": Tn_values,
-                            "Max Displacement (m)": max_disp
-                        })
-                        csv_spectrum = spectrum_df.to_csv(
-                            index=False).encode('utf-8')
-
-                        # Export response spectrum plot to PNG
-                        buffer_spectrum = fig_to_png_bytes(
-                            Tn_values, max_disp,
-                            "Displacement Response Spectrum",
-                            "Natural Period (s)", "Max Displacement (m)"
-                        )
-
-
-                        # Download buttons
-                        with st.expander("📥 Download Response Spectrum Outputs"):
-                            st.download_button(
-                                label="📄 Download Spectrum Data as CSV",
-                                data=csv_spectrum,
-                                file_name="response_spectrum.csv",
-                                mime="text/csv"
-                            )
-                            st.download_button(
-                                label="📊 Download Spectrum Plot (PNG)",
-                                data=buffer_spectrum,
-                                file_name="response_spectrum_plot.png",
-                                mime="image/png"
-                            )
+                    show_response_spectrum(Response_Spectrum_method)
 
             elif Response_Spectrum_method == "Newmark's Method":
 
                 st.subheader(
                     "Provide System Parameters and Upload Ground Acceleration File")
-                ζ = st.number_input("Damping Ratio (default 2%)", value=0.02)
+                ζ_text = st.text_input(
+                    "Damping Ratios (comma separated, default 2%)", value="0.02")
+                try:
+                    ζ = parse_float_list(ζ_text, valid_damping)
+                except ValueError:
+                    ζ = np.array([])
+                    st.error("Damping ratios must be numbers with 0 ≤ ζ < 1.")
                 method_type = st.selectbox("Select Newmark Method:", [
                                            "Average Acceleration", "Linear Acceleration"])
                 # Set default gamma and beta based on selection
@@ -835,210 +1141,155 @@ if st.session_state.started:
 
                 if time is not None and accel is not None:
                     dt = 0.001
-                    time_new = np.arange(time[0], time[-1], dt)
-                    interpolator = interp1d(time, accel, kind='linear')
-                    accel_new = interpolator(time_new)
+                    time_new, accel_new = resample_record(accel, time, dt=dt)
 
-                    if st.button("Run Response Spectrum Simulation"):
+                    if len(ζ) > 0 and st.button("Run Response Spectrum Simulation"):
+                        preview = st.empty()
                         with st.spinner("Running simulation..."):
                             st_lottie(lottie_eq, speed=1,
                                       height=300, loop=True)
 
-                            Tn_values, max_disp = newmark_response_spectrum_solver(
-                                ζ, accel_new, time_new, gamma, beta)
+                            Tn_values, spectrum = adaptive_response_spectrum(
+                                spectrum_solver(newmark_response_spectrum_solver, multirate, multirate_tol),
+                                ζ, accel_new, time_new, gamma, beta,
+                                Tn_min=Tn_min, Tn_max=Tn_max, tol=grid_tol,
+                                n_workers=n_workers, full_output=True,
+                                callback=partial(draw_spectrum_pass, preview, ζ) if progressive else None)
+                        preview.empty()
 
                         st.success("Simulation completed!")
+                        st.session_state.spectrum = (
+                            Response_Spectrum_method, Tn_values, spectrum, ζ)
 
-                        fig_rs = go.Figure()
-                        fig_rs.add_trace(go.Scatter(
-                            x=Tn_values,
-                            y=max_disp,
-                            mode='lines',
-                            name='Displacement Response Spectrum',
-                            line=dict(shape='spline',
-                                      color='lightblue', width=3)
-                        ))
-                        fig_rs.update_layout(
-                            title='Displacement Response Spectrum',
-                            xaxis_title='Natural Period (s)',
-                            yaxis_title='Max Displacement (m)',
-                            yaxis=dict(range=[0, max(max_disp) * 1.1]),
-                            template='plotly_dark'
-                        )
-                        st.plotly_chart(fig_rs, use_container_width=True)
-                        # --- DOWNLOAD SECTION FOR RESPONSE SPECTRUM ---
-                        spectrum_df = pd.DataFrame({
-                            "Natural Period (s)": Tn_values,
-                            "Max Displacement (m)": max_disp
-                        })
-                        csv_spectrum = spectrum_df.to_csv(
-                            index=False).encode('utf-8')
-                        # Export response spectrum plot to PNG
-                        buffer_spectrum = fig_to_png_bytes(
-                            Tn_values, max_disp,
-                            "Displacement Response Spectrum",
-                            "Natural Period (s)", "Max Displacement (m)"
-                        )
+                    show_response_spectrum(Response_Spectrum_method)
 
+            elif Response_Spectrum_method == "Interpolation of Excitation":
+                st.subheader(
+                    "Provide System Parameters and Upload Ground Acceleration File")
+                ζ_text = st.text_input(
+                    "Damping Ratios (comma separated, default 2%)", value="0.02")
+                try:
+                    ζ = parse_float_list(ζ_text, valid_damping)
+                except ValueError:
+                    ζ = np.array([])
+                    st.error("Damping ratios must be numbers with 0 ≤ ζ < 1.")
+                native = st.checkbox(
+                    "Native Sampling (exact between samples, no upsampling)", value=True)
+                peak_tol = st.number_input(
+                    "Peak Sampling Tolerance (fraction of peak)", min_value=0.00001, value=0.0001,
+                    format="%.5f", disabled=not native)
+                time, accel = load_raw_ground_motion()
 
-                        # Download buttons
-                        with st.expander("📥 Download Response Spectrum Outputs"):
-                            st.download_button(
-                                label="📄 Download Spectrum Data as CSV",
-                                data=csv_spectrum,
-                                file_name="response_spectrum.csv",
-                                mime="text/csv"
-                            )
-                            st.download_button(
-                                label="📊 Download Spectrum Plot (PNG)",
-                                data=buffer_spectrum,
-                                file_name="response_spectrum_plot.png",
-                                mime="image/png"
-                            )
+                if time is not None and accel is not None:
+                    if native and is_uniform(time):
+                        # The recurrence is exact for the linearly interpolated
+                        # record, so the raw samples are used directly
+                        time_new, accel_new = np.asarray(time, dtype=float), np.asarray(accel, dtype=float)
+                        solver = partial(interpolation_response_spectrum_solver, peak_tol=peak_tol)
+                    else:
+                        dt = 0.001
+                        time_new, accel_new = resample_record(accel, time, dt=dt)
+                        solver = spectrum_solver(interpolation_response_spectrum_solver, multirate, multirate_tol)
 
-            elif Response_Spectrum_method == "Interpolation of Excitation":
+                    if len(ζ) > 0 and st.button("Run Response Spectrum Simulation"):
+                        preview = st.empty()
+                        with st.spinner("Running simulation..."):
+                            st_lottie(lottie_eq, speed=1,
+                                      height=300, loop=True)
+                            Tn_values, spectrum = adaptive_response_spectrum(
+                                solver, ζ, accel_new, time_new,
+                                Tn_min=Tn_min, Tn_max=Tn_max, tol=grid_tol,
+                                n_workers=n_workers, full_output=True,
+                                callback=partial(draw_spectrum_pass, preview, ζ) if progressive else None)
+                        preview.empty()
+
+                        st.success("Simulation completed!")
+                        st.session_state.spectrum = (
+                            Response_Spectrum_method, Tn_values, spectrum, ζ)
+
+                    show_response_spectrum(Response_Spectrum_method)
+
+            elif Response_Spectrum_method == "Frequency Domain (FFT)":
                 st.subheader(
                     "Provide System Parameters and Upload Ground Acceleration File")
-                ζ = st.number_input("Damping Ratio (default 2%)", value=0.02)
+                ζ_text = st.text_input(
+                    "Damping Ratios (comma separated, default 2%)", value="0.02")
+                try:
+                    ζ = parse_float_list(ζ_text, valid_damping)
+                except ValueError:
+                    ζ = np.array([])
+                    st.error("Damping ratios must be numbers with 0 ≤ ζ < 1.")
+                pad = st.number_input("Free Vibration Tail (s)", value=20.0)
                 time, accel = load_raw_ground_motion()
 
                 if time is not None and accel is not None:
                     dt = 0.001
-                    time_new = np.arange(time[0], time[-1], dt)
-                    interpolator = interp1d(time, accel, kind='linear')
-                    accel_new = interpolator(time_new)
+                    time_new, accel_new = resample_record(accel, time, dt=dt)
 
-                    if st.button("Run Response Spectrum Simulation"):
+                    if len(ζ) > 0 and st.button("Run Response Spectrum Simulation"):
+                        preview = st.empty()
                         with st.spinner("Running simulation..."):
                             st_lottie(lottie_eq, speed=1,
                                       height=300, loop=True)
-                            Tn_values, max_disp = interpolation_response_spectrum_solver(
-                                ζ, accel_new, time_new)
+                            Tn_values, spectrum = adaptive_response_spectrum(
+                                spectrum_solver(frequency_domain_response_spectrum_solver, multirate, multirate_tol),
+                                ζ, accel_new, time_new, pad,
+                                Tn_min=Tn_min, Tn_max=Tn_max, tol=grid_tol,
+                                n_workers=n_workers, full_output=True,
+                                callback=partial(draw_spectrum_pass, preview, ζ) if progressive else None)
+                        preview.empty()
 
                         st.success("Simulation completed!")
+                        st.session_state.spectrum = (
+                            Response_Spectrum_method, Tn_values, spectrum, ζ)
 
-                        fig_rs = go.Figure()
-                        fig_rs.add_trace(go.Scatter(
-                            x=Tn_values,
-                            y=max_disp,
-                            mode='lines',
-                            name='Displacement Response Spectrum',
-                            line=dict(shape='spline',
-                                      color='lightblue', width=3)
-                        ))
-                        fig_rs.update_layout(
-                            title='Displacement Response Spectrum',
-                            xaxis_title='Natural Period (s)',
-                            yaxis_title='Max Displacement (m)',
-                            yaxis=dict(range=[0, max(max_disp) * 1.1]),
-                            template='plotly_dark'
-                        )
-                        st.plotly_chart(fig_rs, use_container_width=True)
-                        # --- DOWNLOAD SECTION FOR RESPONSE SPECTRUM ---
-                        spectrum_df = pd.DataFrame({
-                            "Natural Period (s)": Tn_values,
-                            "Max Displacement (m)": max_disp
-                        })
-                        csv_spectrum = spectrum_df.to_csv(
-                            index=False).encode('utf-8')
-                        # Export response spectrum plot to PNG
-                        buffer_spectrum = fig_to_png_bytes(
-                            Tn_values, max_disp,
-                            "Displacement Response Spectrum",
-                            "Natural Period (s)", "Max Displacement (m)"
-                        )
-
-                        # Download buttons
-                        with st.expander("📥 Download Response Spectrum Outputs"):
-                            st.download_button(
-                                label="📄 Download Spectrum Data as CSV",
-                                data=csv_spectrum,
-                                file_name="response_spectrum.csv",
-                                mime="text/csv"
-                            )
-                            st.download_button(
-                                label="📊 Download Spectrum Plot (PNG)",
-                                data=buffer_spectrum,
-                                file_name="response_spectrum_plot.png",
-                                mime="image/png"
-                            )
+                    show_response_spectrum(Response_Spectrum_method)
 
             elif Response_Spectrum_method == "K R-Alpha Method":
                 st.subheader(
                     "Provide System Parameters and Upload Ground Acceleration File")
-                ζ = st.number_input("Damping Ratio (default 2%)", value=0.02)
+                ζ_text = st.text_input(
+                    "Damping Ratios (comma separated, default 2%)", value="0.02")
+                try:
+                    ζ = parse_float_list(ζ_text, valid_damping)
+                except ValueError:
+                    ζ = np.array([])
+                    st.error("Damping ratios must be numbers with 0 ≤ ζ < 1.")
                 rho = st.number_input("Rho (default 1)", value=1.0)
 
                 time, accel = load_raw_ground_motion()
 
                 if time is not None and accel is not None:
                     dt = 0.001
-                    time_new = np.arange(time[0], time[-1], dt)
-                    interpolator = interp1d(time, accel, kind='linear')
-                    accel_new = interpolator(time_new)
+                    time_new, accel_new = resample_record(accel, time, dt=dt)
 
-                    if st.button("Run Response Spectrum Simulation"):
+                    if len(ζ) > 0 and st.button("Run Response Spectrum Simulation"):
+                        preview = st.empty()
                         with st.spinner("Running simulation..."):
                             st_lottie(lottie_eq, speed=1,
                                       height=300, loop=True)
-                            Tn_values, max_disp = kr_alpha_response_spectrum_solver(
-                                ζ, accel_new, time_new, rho)
+                            Tn_values, spectrum = adaptive_response_spectrum(
+                                spectrum_solver(kr_alpha_response_spectrum_solver, multirate, multirate_tol),
+                                ζ, accel_new, time_new, rho,
+                                Tn_min=Tn_min, Tn_max=Tn_max, tol=grid_tol,
+                                n_workers=n_workers, full_output=True,
+                                callback=partial(draw_spectrum_pass, preview, ζ) if progressive else None)
+                        preview.empty()
 
                         st.success("Simulation completed!")
+                        st.session_state.spectrum = (
+                            Response_Spectrum_method, Tn_values, spectrum, ζ)
 
-                        fig_rs = go.Figure()
-                        fig_rs.add_trace(go.Scatter(
-                            x=Tn_values,
-                            y=max_disp,
-                            mode='lines',
-                            name='Displacement Response Spectrum',
-                            line=dict(shape='spline',
-                                      color='lightblue', width=3)
-                        ))
-                        fig_rs.update_layout(
-                            title='Displacement Response Spectrum',
-                            xaxis_title='Natural Period (s)',
-                            yaxis_title='Max Displacement (m)',
-                            yaxis=dict(range=[0, max(max_disp) * 1.1]),
-                            template='plotly_dark'
-                        )
-                        st.plotly_chart(fig_rs, use_container_width=True)
-                        # --- DOWNLOAD SECTION FOR RESPONSE SPECTRUM ---
-                        spectrum_df = pd.DataFrame({
-                            "Natural Period (s)": Tn_values,
-                            "Max Displacement (m)": max_disp
-                        })
-                        csv_spectrum = spectrum_df.to_csv(
-                            index=False).encode('utf-8')
-                        # Export response spectrum plot to PNG
-                        buffer_spectrum = fig_to_png_bytes(
-                            Tn_values, max_disp,
-                            "Displacement Response Spectrum",
-                            "Natural Period (s)", "Max Displacement (m)"
-                        )
-
-                        # Download buttons
-                        with st.expander("📥 Download Response Spectrum Outputs"):
-                            st.download_button(
-                                label="📄 Download Spectrum Data as CSV",
-                                data=csv_spectrum,
-                                file_name="response_spectrum.csv",
-                                mime="text/csv"
-                            )
-                            st.download_button(
-                                label="📊 Download Spectrum Plot (PNG)",
-                                data=buffer_spectrum,
-                                file_name="response_spectrum_plot.png",
-                                mime="image/png"
-                            )
+                    show_response_spectrum(Response_Spectrum_method)
 
     elif analysis_type == "Non-Linear":
         lin_type = st.selectbox("Select Response Type:", [
-                                "-- Select --", "Time History and Ductility Demand"])
+                                "-- Select --", "Time History and Ductility Demand", "Constant-Strength Inelastic Spectrum", "Constant-Ductility Inelastic Spectrum",
+                                "Incremental Dynamic Analysis"])
         if lin_type == "Time History and Ductility Demand":
             st.success("You selected Time History and Ductility Demand")
             time_history_method = st.selectbox("Choose Numerical Method:", [
-                                               "-- Select --", "Newmark-beta Method"])
+                                               "-- Select --", "Central Difference", "Newmark-beta Method", "K R-Alpha Method", "Event-Driven Exact Method"])
 
             if time_history_method == "Central Difference":
                 st.subheader(
@@ -1047,21 +1298,23 @@ if st.session_state.started:
                 ζ = st.number_input("Damping Ratio (0-1)", value=0.05)
                 Tn = st.number_input("Natural Period (s)", value=1.00)
                 Ry = st.number_input("Response Modification Factor", value=4.00)
+                model, model_params = hysteretic_model_inputs()
+                dt = st.number_input("Analysis Time Step (s)", min_value=0.0001, value=0.001, format="%.4f")
+                pad = st.number_input("Free Vibration Tail (s)", min_value=0.0, value=20.0)
+                damage_params = damage_index_inputs()
 
                 time, accel = load_raw_ground_motion()
                 if time is not None and accel is not None:
-                    dt = 0.0001
-                    time_new = np.arange(time[0], time[-1], dt)
-                    interpolator = interp1d(time, accel, kind='linear')
-                    accel_new = interpolator(time_new)
+                    time_new, accel_new = resample_record(accel, time, dt=dt, pad=pad)
 
                     if st.button("Run Time History Simulation"):
                         with st.spinner("Running simulation..."):
                             lottie_placeholder = st.empty()
                             lottie_placeholder_lottie = st_lottie(
                                 lottie_eq, speed=1, height=300, loop=True, key="loading_anim")
-                            normalized_u_epp, normalized_f_s, time, ductility_demand, normalized_residual_deformation = epp_time_history_solver(
-                                m, ζ, Tn, Ry, accel_new, time_new)
+                            normalized_u_epp, normalized_f_s, time, ductility_demand, normalized_residual_deformation, energy = hysteretic_solver(
+                                m, ζ, Tn, Ry, accel_new, time_new, CentralDifference(), model, energy=True,
+                                **damage_params, **model_params)
                         lottie_placeholder.empty()
                         st.success("Simulation completed!")
                         # Display ductility demand and residual deformation
@@ -1100,11 +1353,16 @@ if st.session_state.started:
                             template='plotly_dark'
                         )
                         st.plotly_chart(fig_z, use_container_width=True)
+                        show_energy_history(time, energy)
                         # --- DOWNLOAD SECTION ---
                         results = pd.DataFrame({
                             "Time (s)": time,
                             "Normalized Displacement (u/uy)": normalized_u_epp,
-                            "Normalized Restoring Force (f_s/Fy)": normalized_f_s
+                            "Normalized Restoring Force (f_s/Fy)": normalized_f_s,
+                            "Input Energy (E/(Fy uy))": energy["input"],
+                            "Kinetic Energy (E/(Fy uy))": energy["kinetic"],
+                            "Damping Energy (E/(Fy uy))": energy["damping"],
+                            "Hysteretic Energy (E/(Fy uy))": energy["hysteretic"]
                         })
                         csv = results.to_csv(index=False).encode('utf-8')
                         # Create PNGs for all 3 plots
@@ -1153,28 +1411,47 @@ if st.session_state.started:
                                 mime="image/png"
                             )
 
-            elif time_history_method == "Newmark-beta Method":
+            elif time_history_method in ("Newmark-beta Method", "Event-Driven Exact Method"):
+                event_driven = time_history_method == "Event-Driven Exact Method"
                 st.subheader(
                     "Provide System Parameters and Upload Ground Acceleration File")
                 m = st.number_input("Mass (kg)", value=1)
                 ζ = st.number_input("Damping Ratio (0-1)", value=0.05)
                 Tn = st.number_input("Natural Period (s)", value=1.00)
                 Ry = st.number_input("Response Modification Factor", value=4.00)
+                if not event_driven:
+                    model, model_params = hysteretic_model_inputs()
+                native = event_driven and st.checkbox(
+                    "Native Sampling (exact between samples, no upsampling)", value=True)
+                dt = st.number_input("Analysis Time Step (s)", min_value=0.0001, value=0.001, format="%.4f",
+                                     disabled=native)
+                pad = st.number_input("Free Vibration Tail (s)", min_value=0.0, value=20.0)
+                damage_params = damage_index_inputs()
 
                 time, accel = load_raw_ground_motion()
                 if time is not None and accel is not None:
-                    dt = 0.0001
-                    time_new = np.arange(time[0], time[-1], dt)
-                    interpolator = interp1d(time, accel, kind='linear')
-                    accel_new = interpolator(time_new)
+                    if native and is_uniform(time):
+                        # Yield and unload events are located inside each sample
+                        # interval, so the record keeps its own step
+                        dt = time[1] - time[0]
+                    time_new, accel_new = resample_record(accel, time, dt=dt, pad=pad)
+                    if event_driven:
+                        solver = epp_event_solver
+                    else:
+                        solver = partial(hysteretic_solver, scheme=Newmark(), model=model, **model_params)
+
+                    if event_driven and st.button("Run Convergence Report"):
+                        with st.spinner("Comparing the EPP solvers over the time step..."):
+                            report = epp_convergence_report(accel, time, ζ=ζ, Tn=Tn, Ry=Ry, pad=pad)
+                        st.dataframe(pd.DataFrame(report), use_container_width=True)
 
                     if st.button("Run Time History Simulation"):
                         with st.spinner("Running simulation..."):
                             lottie_placeholder = st.empty()
                             lottie_placeholder_lottie = st_lottie(
                                 lottie_eq, speed=1, height=300, loop=True, key="loading_anim")
-                            normalized_u_epp, normalized_f_s, time, ductility_demand, normalized_residual_deformation = epp_newmark_solver(
-                                m, ζ, Tn, Ry, accel_new, time_new)
+                            normalized_u_epp, normalized_f_s, time, ductility_demand, normalized_residual_deformation, energy = solver(
+                                m, ζ, Tn, Ry, accel_new, time_new, energy=True, **damage_params)
                         lottie_placeholder.empty()
                         st.success("Simulation completed!")
                         # Display ductility demand and residual deformation
@@ -1213,11 +1490,16 @@ if st.session_state.started:
                             template='plotly_dark'
                         )
                         st.plotly_chart(fig_z, use_container_width=True)
+                        show_energy_history(time, energy)
                         # --- DOWNLOAD SECTION ---
                         results = pd.DataFrame({
                             "Time (s)": time,
                             "Normalized Displacement (u/uy)": normalized_u_epp,
-                            "Normalized Restoring Force (f_s/Fy)": normalized_f_s
+                            "Normalized Restoring Force (f_s/Fy)": normalized_f_s,
+                            "Input Energy (E/(Fy uy))": energy["input"],
+                            "Kinetic Energy (E/(Fy uy))": energy["kinetic"],
+                            "Damping Energy (E/(Fy uy))": energy["damping"],
+                            "Hysteretic Energy (E/(Fy uy))": energy["hysteretic"]
                         })
                         csv = results.to_csv(index=False).encode('utf-8')
                         # Create PNGs for all 3 plots
@@ -1270,22 +1552,24 @@ if st.session_state.started:
                 ζ = st.number_input("Damping Ratio (0-1)", value=0.05)
                 Tn = st.number_input("Natural Period (s)", value=1.00)
                 Ry = st.number_input("Response Modification Factor", value=4.00)
+                model, model_params = hysteretic_model_inputs()
+                dt = st.number_input("Analysis Time Step (s)", min_value=0.0001, value=0.001, format="%.4f")
+                pad = st.number_input("Free Vibration Tail (s)", min_value=0.0, value=20.0)
                 rho = st.number_input("Rho (default 1)", value=1.0)
+                damage_params = damage_index_inputs()
 
                 time, accel = load_raw_ground_motion()
                 if time is not None and accel is not None:
-                    dt = 0.0001
-                    time_new = np.arange(time[0], time[-1], dt)
-                    interpolator = interp1d(time, accel, kind='linear')
-                    accel_new = interpolator(time_new)
+                    time_new, accel_new = resample_record(accel, time, dt=dt, pad=pad)
 
                     if st.button("Run Time History Simulation"):
                         with st.spinner("Running simulation..."):
                             lottie_placeholder = st.empty()
                             lottie_placeholder_lottie = st_lottie(
                                 lottie_eq, speed=1, height=300, loop=True, key="loading_anim")
-                            normalized_u_epp, normalized_f_s, time, ductility_demand, normalized_residual_deformation = epp_kr_alpha_solver(
-                                m, ζ, Tn, Ry, accel_new, time_new, rho)
+                            normalized_u_epp, normalized_f_s, time, ductility_demand, normalized_residual_deformation, energy = hysteretic_solver(
+                                m, ζ, Tn, Ry, accel_new, time_new, KRAlpha(rho), model, energy=True,
+                                **damage_params, **model_params)
                         lottie_placeholder.empty()
                         st.success("Simulation completed!")
                         # Display ductility demand and residual deformation
@@ -1324,11 +1608,16 @@ if st.session_state.started:
                             template='plotly_dark'
                         )
                         st.plotly_chart(fig_z, use_container_width=True)
+                        show_energy_history(time, energy)
                         # --- DOWNLOAD SECTION ---
                         results = pd.DataFrame({
                             "Time (s)": time,
                             "Normalized Displacement (u/uy)": normalized_u_epp,
-                            "Normalized Restoring Force (f_s/Fy)": normalized_f_s
+                            "Normalized Restoring Force (f_s/Fy)": normalized_f_s,
+                            "Input Energy (E/(Fy uy))": energy["input"],
+                            "Kinetic Energy (E/(Fy uy))": energy["kinetic"],
+                            "Damping Energy (E/(Fy uy))": energy["damping"],
+                            "Hysteretic Energy (E/(Fy uy))": energy["hysteretic"]
                         })
                         csv = results.to_csv(index=False).encode('utf-8')
                         # Create PNGs for all 3 plots
@@ -1373,3 +1662,235 @@ if st.session_state.started:
                                 file_name="displacement_vs_restoring_force_plot.png",
                                 mime="image/png"
                             )
+
+        elif lin_type == "Constant-Strength Inelastic Spectrum":
+            st.success("You selected Constant-Strength Inelastic Spectrum")
+            st.subheader(
+                "Provide System Parameters and Upload Ground Acceleration File")
+            ζ = st.number_input("Damping Ratio (0-1)", value=0.05)
+            Ry_text = st.text_input(
+                "Response Modification Factors (comma separated)", value="1, 2, 4, 8")
+            Tn_max = st.number_input("Maximum Natural Period (s)", value=3.00)
+            Tn_step = st.number_input("Period Step (s)", value=0.05)
+            dt = st.number_input("Analysis Time Step (s)", min_value=0.0001, value=0.001, format="%.4f")
+            pad = st.number_input("Free Vibration Tail (s)", min_value=0.0, value=20.0)
+
+            time, accel = load_raw_ground_motion()
+            if time is not None and accel is not None:
+                time_new, accel_new = resample_record(accel, time, dt=dt, pad=pad)
+                try:
+                    Ry_values = parse_float_list(Ry_text, valid_factor)
+                except ValueError:
+                    Ry_values = np.array([])
+                    st.error("Response modification factors must be positive numbers.")
+                Tn_values = np.arange(Tn_step, Tn_max + 1e-9, Tn_step)
+
+                if len(Ry_values) > 0 and st.button("Run Inelastic Spectrum Simulation"):
+                    with st.spinner("Running simulation..."):
+                        lottie_placeholder = st.empty()
+                        lottie_placeholder_lottie = st_lottie(
+                            lottie_eq, speed=1, height=300, loop=True, key="loading_anim")
+                        Tn_values, ductility_demand, normalized_residual_deformation = epp_newmark_spectrum_solver(
+                            ζ, Ry_values, accel_new, time_new, Tn_values=Tn_values)
+                    lottie_placeholder.empty()
+                    st.success("Simulation completed!")
+
+                    fig_mu = go.Figure()
+                    fig_res = go.Figure()
+                    for j, Ry in enumerate(Ry_values):
+                        fig_mu.add_trace(go.Scatter(
+                            x=Tn_values, y=ductility_demand[:, j], mode='lines', name=f'Ry = {Ry:g}'))
+                        fig_res.add_trace(go.Scatter(
+                            x=Tn_values, y=normalized_residual_deformation[:, j], mode='lines', name=f'Ry = {Ry:g}'))
+                    fig_mu.update_layout(
+                        title='Ductility Demand Spectrum',
+                        xaxis_title='Natural Period (s)',
+                        yaxis_title='Ductility Demand (μ)',
+                        template='plotly_dark'
+                    )
+                    st.plotly_chart(fig_mu, use_container_width=True)
+                    fig_res.update_layout(
+                        title='Normalized Residual Deformation Spectrum',
+                        xaxis_title='Natural Period (s)',
+                        yaxis_title='Normalized Residual Deformation (u_res/uy)',
+                        template='plotly_dark'
+                    )
+                    st.plotly_chart(fig_res, use_container_width=True)
+
+                    # --- DOWNLOAD SECTION ---
+                    results = pd.DataFrame({"Natural Period (s)": Tn_values})
+                    for j, Ry in enumerate(Ry_values):
+                        results[f"Ductility Demand (Ry={Ry:g})"] = ductility_demand[:, j]
+                        results[f"Normalized Residual Deformation (Ry={Ry:g})"] = normalized_residual_deformation[:, j]
+                    csv = results.to_csv(index=False).encode('utf-8')
+                    buffer_mu = fig_to_png_bytes(
+                        Tn_values, ductility_demand,
+                        "Ductility Demand Spectrum",
+                        "Natural Period (s)", "Ductility Demand (μ)"
+                    )
+                    with st.expander("📥 Download Spectrum Outputs"):
+                        st.download_button(
+                            label="📄 Download Spectrum Data as CSV",
+                            data=csv,
+                            file_name="inelastic_spectrum.csv",
+                            mime="text/csv"
+                        )
+                        st.download_button(
+                            label="📊 Download Ductility Spectrum Plot (PNG)",
+                            data=buffer_mu,
+                            file_name="ductility_spectrum_plot.png",
+                            mime="image/png"
+                        )
+
+        elif lin_type == "Constant-Ductility Inelastic Spectrum":
+            st.success("You selected Constant-Ductility Inelastic Spectrum")
+            st.subheader(
+                "Provide System Parameters and Upload Ground Acceleration File")
+            ζ = st.number_input("Damping Ratio (0-1)", value=0.05)
+            mu_text = st.text_input(
+                "Target Ductility Factors (comma separated)", value="1, 2, 4, 6, 8")
+            Tn_max = st.number_input("Maximum Natural Period (s)", value=3.00)
+            Tn_step = st.number_input("Period Step (s)", value=0.05)
+            dt = st.number_input("Analysis Time Step (s)", min_value=0.0001, value=0.001, format="%.4f")
+            pad = st.number_input("Free Vibration Tail (s)", min_value=0.0, value=20.0)
+
+            time, accel = load_raw_ground_motion()
+            if time is not None and accel is not None:
+                time_new, accel_new = resample_record(accel, time, dt=dt, pad=pad)
+                try:
+                    mu_values = parse_float_list(mu_text, valid_factor)
+                except ValueError:
+                    mu_values = np.array([])
+                    st.error("Target ductility factors must be positive numbers.")
+                Tn_values = np.arange(Tn_step, Tn_max + 1e-9, Tn_step)
+
+                if len(mu_values) > 0 and st.button("Run Inelastic Spectrum Simulation"):
+                    with st.spinner("Running simulation..."):
+                        lottie_placeholder = st.empty()
+                        lottie_placeholder_lottie = st_lottie(
+                            lottie_eq, speed=1, height=300, loop=True, key="loading_anim")
+                        Tn_values, Ry, Cy = constant_ductility_spectrum_solver(
+                            ζ, accel_new, time_new, mu_values, Tn_values=Tn_values)
+                    lottie_placeholder.empty()
+                    st.success("Simulation completed!")
+
+                    fig_cy = go.Figure()
+                    fig_ry = go.Figure()
+                    for j, mu in enumerate(mu_values):
+                        fig_cy.add_trace(go.Scatter(
+                            x=Tn_values, y=Cy[j], mode='lines', name=f'μ = {mu:g}'))
+                        fig_ry.add_trace(go.Scatter(
+                            x=Tn_values, y=Ry[j], mode='lines', name=f'μ = {mu:g}'))
+                    fig_cy.update_layout(
+                        title='Constant-Ductility Yield Strength Spectrum',
+                        xaxis_title='Natural Period (s)',
+                        yaxis_title='Yield Strength Coefficient (Cy = fy/mg)',
+                        template='plotly_dark'
+                    )
+                    st.plotly_chart(fig_cy, use_container_width=True)
+                    fig_ry.update_layout(
+                        title='Strength Reduction Factor Spectrum',
+                        xaxis_title='Natural Period (s)',
+                        yaxis_title='Response Modification Factor (Ry)',
+                        template='plotly_dark'
+                    )
+                    st.plotly_chart(fig_ry, use_container_width=True)
+
+                    # --- DOWNLOAD SECTION ---
+                    results = pd.DataFrame({"Natural Period (s)": Tn_values})
+                    for j, mu in enumerate(mu_values):
+                        results[f"Cy (mu={mu:g})"] = Cy[j]
+                        results[f"Ry (mu={mu:g})"] = Ry[j]
+                    csv = results.to_csv(index=False).encode('utf-8')
+                    buffer_cy = fig_to_png_bytes(
+                        Tn_values, Cy.T,
+                        "Constant-Ductility Yield Strength Spectrum",
+                        "Natural Period (s)", "Yield Strength Coefficient (Cy)"
+                    )
+                    with st.expander("📥 Download Spectrum Outputs"):
+                        st.download_button(
+                            label="📄 Download Spectrum Data as CSV",
+                            data=csv,
+                            file_name="constant_ductility_spectrum.csv",
+                            mime="text/csv"
+                        )
+                        st.download_button(
+                            label="📊 Download Yield Strength Spectrum Plot (PNG)",
+                            data=buffer_cy,
+                            file_name="constant_ductility_spectrum_plot.png",
+                            mime="image/png"
+                        )
+
+        elif lin_type == "Incremental Dynamic Analysis":
+            st.success("You selected Incremental Dynamic Analysis")
+            st.subheader("Provide System Parameters")
+            st.markdown("Every record of `GM_data/` is scaled up to collapse; the intensity measure is Sa(Tn, ζ).")
+            ζ = st.number_input("Damping Ratio (0-1)", value=0.05)
+            Tn = st.number_input("Natural Period (s)", value=1.00)
+            Cy = st.number_input("Yield Strength Coefficient (Cy = fy/mg)", min_value=0.001, value=0.20)
+            model, model_params = hysteretic_model_inputs()
+            mu_collapse = st.number_input("Collapse Ductility", min_value=1.0, value=20.0)
+            dt = st.number_input("Analysis Time Step (s)", min_value=0.0001, value=0.001, format="%.4f")
+            pad = st.number_input("Free Vibration Tail (s)", min_value=0.0, value=20.0)
+            n_workers = st.number_input(
+                "Worker Processes", min_value=1, value=os.cpu_count() or 1, step=1)
+
+            if st.button("Run Incremental Dynamic Analysis"):
+                with st.spinner("Running simulation..."):
+                    lottie_placeholder = st.empty()
+                    lottie_placeholder_lottie = st_lottie(
+                        lottie_eq, speed=1, height=300, loop=True, key="loading_anim")
+                    curves, summary = ida_suite(
+                        load_record_suite("GM_data"), dt=dt, pad=pad, n_workers=n_workers, Tn=Tn, ζ=ζ, Cy=Cy,
+                        model=model, mu_collapse=mu_collapse, **model_params)
+                lottie_placeholder.empty()
+                st.success("Simulation completed!")
+
+                fig_ida = go.Figure()
+                for name, curve in curves.items():
+                    standing = np.isfinite(curve["ductility"])
+                    fig_ida.add_trace(go.Scatter(
+                        x=curve["ductility"][standing], y=curve["im"][standing], mode='lines+markers',
+                        name=name, opacity=0.5))
+                for q, im_q in zip(summary["fractiles"], summary["im_fractiles"]):
+                    fig_ida.add_trace(go.Scatter(
+                        x=summary["dm"], y=im_q, mode='lines', name=f'{q:g}% Fractile', line=dict(width=4)))
+                fig_ida.update_layout(
+                    title='IDA Curves',
+                    xaxis_title='Ductility Demand (μ)',
+                    yaxis_title='Spectral Acceleration Sa(Tn) (g)',
+                    template='plotly_dark'
+                )
+                st.plotly_chart(fig_ida, use_container_width=True)
+
+                collapse = pd.DataFrame({
+                    "Record": list(curves),
+                    "Sa of Record (g)": [curve["sa_record"] for curve in curves.values()],
+                    "Collapse Sa (g)": [curve["collapse_im"] for curve in curves.values()],
+                    "Collapse Scale Factor": [curve["collapse_im"] / curve["sa_record"] for curve in curves.values()],
+                })
+                st.dataframe(collapse, use_container_width=True)
+                st.markdown(", ".join(
+                    f"**{q:g}% Collapse Sa:** " + (f"{im:.3f} g" if np.isfinite(im) else "no collapse")
+                    for q, im in zip(summary["fractiles"], summary["collapse_fractiles"])))
+
+                # --- DOWNLOAD SECTION ---
+                results = pd.DataFrame({"Ductility Demand (mu)": summary["dm"]})
+                for q, im_q in zip(summary["fractiles"], summary["im_fractiles"]):
+                    results[f"Sa {q:g}% Fractile (g)"] = im_q
+                for name, im in zip(curves, summary["im"]):
+                    results[f"Sa {name} (g)"] = im
+                csv = results.to_csv(index=False).encode('utf-8')
+                with st.expander("📥 Download IDA Outputs"):
+                    st.download_button(
+                        label="📄 Download IDA Curves as CSV",
+                        data=csv,
+                        file_name="ida_curves.csv",
+                        mime="text/csv"
+                    )
+                    st.download_button(
+                        label="📄 Download Collapse Capacities as CSV",
+                        data=collapse.to_csv(index=False).encode('utf-8'),
+                        file_name="ida_collapse.csv",
+                        mime="text/csv"
+                    )
@@ -0,0 +1,271 @@
+import numpy as np
+
+from solver.backend import jit
+from solver.elastic_peak import elastic_peak_displacement
+from solver.energy import energy_balance
+from solver.free_vibration import excitation_end, fill_free_vibration, settled
+
+# Relative accuracy of the elastic peak that sets the yield strength, checked
+# between the samples like the EPP response itself
+_PEAK_TOL = 1e-6
+
+# Most yield / unload events located inside one time step before the rest of
+# the step is taken on the current branch (guards against chattering at a
+# branch boundary)
+_MAX_EVENTS = 16
+
+
+@jit
+def _phi(z):
+    # phi_1, phi_2, phi_3 of z: (e^z - 1) / z, (e^z - 1 - z) / z², (e^z - 1 - z - z²/2) / z³
+    if abs(z) < 0.05:
+        phi1 = 1 + z / 2 + z**2 / 6 + z**3 / 24 + z**4 / 120 + z**5 / 720
+        phi2 = 1 / 2 + z / 6 + z**2 / 24 + z**3 / 120 + z**4 / 720 + z**5 / 5040
+        phi3 = 1 / 6 + z / 24 + z**2 / 120 + z**3 / 720 + z**4 / 5040 + z**5 / 40320
+    else:
+        e = np.exp(z)
+        phi1 = (e - 1) / z
+        phi2 = (e - 1 - z) / z**2
+        phi3 = (e - 1 - z - z**2 / 2) / z**3
+    return phi1, phi2, phi3
+
+
+@jit
+def _elastic_state(x0, v0, p0, slope, t, m, k, c):
+    # Exact x, v of m x'' + c x' + k x = p0 + slope t (x about the plastic offset)
+    wn = np.sqrt(k / m)
+    zeta = c / (2 * np.sqrt(k * m))
+    sigma = zeta * wn
+    wd = wn * np.sqrt(1 - zeta**2)
+    xp0 = p0 / k - c * slope / k**2
+    A = x0 - xp0
+    B = (v0 - slope / k + sigma * A) / wd
+    e = np.exp(-sigma * t)
+    cs = np.cos(wd * t)
+    sn = np.sin(wd * t)
+    x = xp0 + slope * t / k + e * (A * cs + B * sn)
+    v = slope / k + e * ((B * wd - sigma * A) * cs - (A * wd + sigma * B) * sn)
+    return x, v
+
+
+@jit
+def _plastic_state(u0, v0, p0, slope, s, t, m, c, Fy):
+    # Exact u, v of m u'' + c u' = p0 + slope t - s Fy (yielding in direction s)
+    lam = c / m
+    alpha = (p0 - s * Fy) / m
+    beta = slope / m
+    phi1, phi2, phi3 = _phi(-lam * t)
+    v = v0 * (1 - lam * t * phi1) + alpha * t * phi1 + beta * t**2 * phi2
+    u = u0 + v0 * t * phi1 + alpha * t**2 * phi2 + beta * t**3 * phi3
+    return u, v
+
+
+@jit
+def _event_residual(plastic, on_velocity, sgn, level, x0, v0, p0, slope, t, m, k, c, Fy, s):
+    # sgn * (displacement or velocity at t) - level, and its time derivative
+    if plastic:
+        x, v = _plastic_state(x0, v0, p0, slope, s, t, m, c, Fy)
+        a = (p0 + slope * t - s * Fy - c * v) / m
+    else:
+        x, v = _elastic_state(x0, v0, p0, slope, t, m, k, c)
+        a = (p0 + slope * t - c * v - k * x) / m
+    if on_velocity:
+        return sgn * v - level, sgn * a
+    return sgn * x - level, sgn * v
+
+
+@jit
+def _event_time(plastic, on_velocity, sgn, level, x0, v0, p0, slope, h, m, k, c, Fy, s):
+    # Time in (0, h] at which the residual, negative at 0 and non-negative at
+    # h, reaches zero: Newton iterations safeguarded by the bracket [lo, hi]
+    lo = 0.0
+    hi = h
+    t = h
+    for _ in range(100):
+        g, dg = _event_residual(plastic, on_velocity, sgn, level, x0, v0, p0, slope, t, m, k, c, Fy, s)
+        if g >= 0:
+            hi = t
+        else:
+            lo = t
+        t_new = t - g / dg if dg != 0 else -1.0
+        if not lo < t_new < hi:
+            t_new = 0.5 * (lo + hi)
+        if abs(t_new - t) <= 1e-13 * h:
+            return t_new
+        t = t_new
+    return hi
+
+
+@jit
+def _epp_event_loop(f, u, v, fs, m, k, c, Fy, dt, i_free, settle_uy, energy):
+    n = len(f)
+    uy = Fy / k
+    u_p = 0.0
+    state = 0  # 0 elastic, +1 / -1 yielding in that direction
+    top = 0.0  # peak |u|, including the extrema between samples
+    record = energy.shape[1] > 0
+    e_in = e_d = e_h = 0.0  # input, damping and dissipated (Fy times plastic) energy
+    for i in range(n - 1):
+        slope = (f[i + 1] - f[i]) / dt
+        ui = u[i]
+        vi = v[i]
+        t_done = 0.0
+        events = 0
+        while t_done < dt:
+            p0 = f[i] + slope * t_done
+            h = dt - t_done
+            if events >= _MAX_EVENTS:
+                # Finish the step on the current branch
+                if state == 0:
+                    x1, vi = _elastic_state(ui - u_p, vi, p0, slope, h, m, k, c)
+                    ui = u_p + x1
+                else:
+                    u1, vi = _plastic_state(ui, vi, p0, slope, state, h, m, c, Fy)
+                    e_h += Fy * abs(u1 - ui)
+                    ui = u1
+                break
+
+            if state == 0:
+                x0 = ui - u_p
+                x1, v1 = _elastic_state(x0, vi, p0, slope, h, m, k, c)
+                s = 0.0
+                t_ev = h
+                if abs(x1) > uy:
+                    s = np.sign(x1)
+                    t_ev = _event_time(False, False, s, uy, x0, vi, p0, slope, h, m, k, c, Fy, 0.0)
+                elif vi * v1 < 0:
+                    # Extremum inside the step: check that it stays below yield
+                    t_e = _event_time(False, True, -np.sign(vi), 0.0, x0, vi, p0, slope, h, m, k, c, Fy, 0.0)
+                    x_e, _ = _elastic_state(x0, vi, p0, slope, t_e, m, k, c)
+                    top = max(top, abs(u_p + x_e))
+                    if abs(x_e) > uy:
+                        s = np.sign(x_e)
+                        t_ev = _event_time(False, False, s, uy, x0, vi, p0, slope, t_e, m, k, c, Fy, 0.0)
+                if s == 0.0:
+                    ui = u_p + x1
+                    vi = v1
+                    break
+                # Yield: continue from the yield point with zero tangent stiffness
+                _, vi = _elastic_state(x0, vi, p0, slope, t_ev, m, k, c)
+                ui = u_p + s * uy
+                if s * vi > 0:
+                    state = int(s)
+            else:
+                u1, v1 = _plastic_state(ui, vi, p0, slope, state, h, m, c, Fy)
+                if state * v1 > 0:
+                    e_h += Fy * abs(u1 - ui)
+                    ui = u1
+                    vi = v1
+                    break
+                # Unload: the velocity reverses, continue elastically
+                t_ev = _event_time(True, True, -state, 0.0, ui, vi, p0, slope, h, m, k, c, Fy, state)
+                u1, _ = _plastic_state(ui, vi, p0, slope, state, t_ev, m, c, Fy)
+                e_h += Fy * abs(u1 - ui)
+                ui = u1
+                vi = 0.0
+                top = max(top, abs(ui))
+                u_p = ui - state * uy
+                state = 0
+            t_done += t_ev
+            events += 1
+
+        u[i + 1] = ui
+        v[i + 1] = vi
+        fs[i + 1] = k * (ui - u_p) if state == 0 else state * Fy
+        top = max(top, abs(ui))
+        if record:
+            # Input and damping energy by the trapezoidal rule over the
+            # sample interval, strain energy exact
+            du = ui - u[i]
+            e_in += 0.5 * (f[i] + f[i + 1]) * du
+            e_d += 0.5 * c * (v[i] + vi) * du
+            energy[0, i + 1] = e_in
+            energy[1, i + 1] = e_d
+            energy[2, i + 1] = e_h + fs[i + 1] ** 2 / (2 * k)
+        # Stop once the free vibration after the record can neither yield nor
+        # exceed the peak
+        if i + 1 >= i_free and state == 0 and abs(u_p) + settle_uy <= top and \
+                settled(ui - u_p, vi, m, k, settle_uy):
+            return i + 1, top
+    return n - 1, top
+
+
+def epp_event_solver(m, ζ, Tn, Ry, accel, time, settle_tol=0.5, energy=False, mu_u=10.0, beta_PA=0.15):
+    """
+    Elastic-Perfectly Plastic (EPP) response of SDOF system with event-driven
+    yield and unload detection.
+
+    Between two samples the excitation is linear, so on each branch of the
+    EPP law the response is known in closed form: elastic (stiffness k about
+    the plastic offset) or yielding (zero tangent stiffness, fs = ±Fy). The
+    time at which the response reaches ±uy, or at which the velocity reverses
+    on a yielding branch, is located inside the step and the step is split
+    there. No force is snapped to ±Fy after overshooting, so the result is
+    exact for the linearly interpolated record up to the event tolerance and
+    does not depend on the time step. The peaks (elastic and inelastic) are
+    also taken between the samples, so the record can be integrated at its own
+    sampling step (resample it with solver.preprocessing.resample_record only
+    to append the free-vibration tail or to get denser output).
+
+    Parameters:
+    - m: Mass (kg)
+    - ζ: Damping ratio (below 1)
+    - Tn: Natural period (s)
+    - Ry: Yield strength reduction factor
+    - accel: Ground acceleration array
+    - time: Uniform time array (in seconds)
+    - settle_tol: After the record, stop once the response is elastic with an
+      amplitude below settle_tol * uy and fill the rest of the tail in closed
+      form (None steps through the whole tail)
+    - energy: Also return the energy balance, accumulated in the time loop
+      (the dissipated energy exactly, the input and damping energy by the
+      trapezoidal rule between samples)
+    - mu_u, beta_PA: Ductility capacity and cyclic weight of the Park-Ang
+      damage index (see solver.energy.park_ang_index)
+
+    Returns:
+    - normalized_u: Normalized displacement (u / uy)
+    - normalized_fs: Normalized restoring force (fs / Fy)
+    - time: Time array (in seconds)
+    - ductility_demand
+    - normalized_residual_deformation
+    - energy (with energy only): Input, kinetic, damping and hysteretic
+      energy histories over Fy uy and the Park-Ang damage index (see
+      solver.energy.energy_balance)
+    """
+    time = np.asarray(time, dtype=float)
+    accel = np.asarray(accel, dtype=float)
+    dt = time[1] - time[0]
+    n = len(time)
+
+    m = float(m)
+    k = (2 * np.pi / Tn) ** 2 * m
+    c = 2 * ζ * np.sqrt(k * m)
+    f = -m * accel * 9.81
+
+    # Peak elastic force (the force carries the factor 9.81 on accel)
+    f0_max = k * 9.81 * elastic_peak_displacement(ζ, Tn, accel, time, peak_tol=_PEAK_TOL)
+    Fy = f0_max / Ry
+    uy = Fy / k
+
+    u = np.zeros(n)
+    v = np.zeros(n)
+    fs = np.zeros(n)
+
+    E = np.zeros((3, n if energy else 0))
+
+    settle_uy = 0.0 if settle_tol is None else settle_tol * uy
+    i_stop, u_max = _epp_event_loop(f, u, v, fs, m, k, c, Fy, dt, excitation_end(f), settle_uy, E)
+    if i_stop < n - 1:
+        fill_free_vibration(u, v, np.zeros(n), fs, i_stop, k, ζ, np.sqrt(k / m), dt)
+
+    normalized_u = u / uy
+    normalized_fs = fs / Fy
+    ductility_demand = u_max / uy
+    residual_deformation = abs(u[-1] - fs[-1] / k)
+    normalized_residual_deformation = residual_deformation / uy
+
+    if energy:
+        energy = energy_balance(E, v, fs, i_stop, m, k, Fy, uy, ductility_demand, mu_u, beta_PA)
+        return normalized_u, normalized_fs, time, ductility_demand, normalized_residual_deformation, energy
+    return normalized_u, normalized_fs, time, ductility_demand, normalized_residual_deformation
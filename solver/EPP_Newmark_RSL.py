@@ -0,0 +1,213 @@
+import numpy as np
+
+from solver.elastic_peak import elastic_peak_displacement
+from solver.free_vibration import excitation_end
+from solver.integrator import Newmark, integrate
+from solver.restoring_force import ElasticPerfectlyPlastic
+
+
+def _record_force(m, accel, time):
+    """
+    Base excitation force of a record integrated at its own step (resample
+    and pad it first with solver.preprocessing.resample_record, as for the
+    EPP time-history solvers).
+
+    Returns:
+    - f: Base excitation force
+    - dt: Time step (s)
+    """
+    time = np.asarray(time, dtype=float)
+    accel = np.asarray(accel, dtype=float)
+    return -m * accel * 9.81, time[1] - time[0]
+
+
+def _epp_response(f, m, k, c, Fy, dt, gamma, beta, settle_tol=0.5):
+    """
+    Advances an ensemble of EPP oscillators (arrays k, c, Fy) through the
+    force history. After the end of the excitation an oscillator stops once
+    it is elastic with an amplitude below settle_tol * uy (settle_tol < 1)
+    and |u_p| + settle_tol * uy is below its peak so far: it cannot yield
+    again nor exceed its peak, so both its peak and its residual deformation
+    are final (settle_tol=None steps through the whole history).
+
+    Returns:
+    - peak: Peak absolute displacement of every oscillator
+    - u_end, fs_end: Final displacement and restoring force
+    """
+    settle_uy = None
+    if settle_tol is not None:
+        settle_uy = np.where(c < 2 * np.sqrt(k * m), settle_tol * Fy / k, 0.0)
+
+    peaks, _, final, _, _ = integrate(Newmark(gamma, beta), ElasticPerfectlyPlastic(k, Fy), m, c, f, dt,
+                                      full_output=False, i_free=excitation_end(f), settle_uy=settle_uy)
+    return peaks[0], final[0], final[2]
+
+
+def epp_newmark_spectrum_solver(ζ, Ry_values, accel, time, gamma=0.5, beta=0.25, Tn_values=None,
+                                settle_tol=0.5):
+    """
+    Constant-strength inelastic spectra of elastic-perfectly plastic SDOF
+    systems, using the same Newmark scheme as epp_newmark_solver.
+
+    Every (ζ, Tn, Ry) oscillator of the grid is advanced together by
+    solver.integrator. The elastic peak that sets Fy = f0_max / Ry comes
+    from solver.elastic_peak, once per (ζ, Tn) and shared by all Ry.
+
+    Parameters:
+    - ζ: Damping ratio, scalar or array
+    - Ry_values: Yield strength reduction factors
+    - accel: Ground acceleration array (in m/s²)
+    - time: Uniform time array (in seconds), already padded with the free-vibration tail
+    - gamma, beta: Newmark integration parameters (default average acceleration method)
+    - Tn_values: Natural periods to evaluate (default 0.05 to 3s in 0.05s steps)
+    - settle_tol: After the record, stop an oscillator once it is elastic with an
+      amplitude below settle_tol * uy and can no longer reach a new peak; the
+      results are unchanged for any value below 1 (None steps through the whole tail)
+
+    Returns:
+    - Tn_values: Array of natural periods
+    - ductility_demand: Array of shape (n_periods, n_Ry), or
+      (n_damping, n_periods, n_Ry) when ζ is an array
+    - normalized_residual_deformation: Same shape as ductility_demand
+    """
+    m = 1.0
+    gamma = float(gamma)
+    beta = float(beta)
+    f, dt = _record_force(m, accel, time)
+
+    if Tn_values is None:
+        Tn_values = np.arange(0.05, 3.0 + 1e-9, 0.05)
+    Tn_values = np.atleast_1d(np.asarray(Tn_values, dtype=float))
+    Ry_values = np.atleast_1d(np.asarray(Ry_values, dtype=float))
+    ζ_values = np.atleast_1d(np.asarray(ζ, dtype=float))
+    shape = (len(ζ_values), len(Tn_values), len(Ry_values))
+
+    # Peak elastic force per (ζ, Tn), from the shared exact elastic run (the
+    # force carries the factor 9.81 on accel)
+    k_el = np.broadcast_to((2 * np.pi / Tn_values) ** 2 * m, shape[:2]).ravel()
+    c_el = (2 * ζ_values[:, None] * np.sqrt(k_el.reshape(shape[:2]) * m)).ravel()
+    u0_max = [elastic_peak_displacement(ζ_i, Tn_values, accel, time) for ζ_i in ζ_values]
+    f0_max = k_el * 9.81 * np.ravel(u0_max)
+
+    # Nonlinear ensemble over (ζ, Tn, Ry)
+    k = np.repeat(k_el, len(Ry_values))
+    c = np.repeat(c_el, len(Ry_values))
+    Fy = (f0_max[:, None] / Ry_values).ravel()
+    uy = Fy / k
+
+    peak, u_end, fs_end = _epp_response(f, m, k, c, Fy, dt, gamma, beta, settle_tol)
+
+    ductility_demand = (peak / uy).reshape(shape)
+    normalized_residual_deformation = (np.abs(u_end - fs_end / k) / uy).reshape(shape)
+
+    if np.ndim(ζ) == 0:
+        ductility_demand = ductility_demand[0]
+        normalized_residual_deformation = normalized_residual_deformation[0]
+
+    return Tn_values, ductility_demand, normalized_residual_deformation
+
+
+def constant_ductility_spectrum_solver(ζ, accel, time, mu_values=(1, 2, 4, 6, 8), gamma=0.5, beta=0.25,
+                                       Tn_values=None, n_scan=24, tol=1e-3, max_iter=30, settle_tol=0.5):
+    """
+    Constant-ductility inelastic spectra: for every period and target
+    ductility μ, the yield strength of the EPP system whose ductility demand
+    equals μ.
+
+    Ry(μ) is not unique, so the largest strength is reported (the usual
+    convention). The normalized strength η = 1/Ry is first scanned downward
+    from 1 for all periods at once; the first scan interval in which the
+    ductility demand reaches μ brackets the root. All (μ, Tn) brackets are
+    then refined together by the Illinois variant of regula falsi, only
+    re-running the oscillators that have not converged yet.
+
+    Parameters:
+    - ζ: Damping ratio
+    - accel: Ground acceleration array (in m/s²)
+    - time: Uniform time array (in seconds), already padded with the free-vibration tail
+    - mu_values: Target ductility factors (μ = 1 gives Ry = 1)
+    - gamma, beta: Newmark integration parameters (default average acceleration method)
+    - Tn_values: Natural periods to evaluate (default 0.05 to 3s in 0.05s steps)
+    - n_scan: Number of strengths in the bracketing scan
+    - tol: Relative tolerance on the ductility demand
+    - max_iter: Maximum number of refinement iterations
+    - settle_tol: After the record, stop an oscillator once it is elastic with an
+      amplitude below settle_tol * uy and can no longer reach a new peak; the
+      results are unchanged for any value below 1 (None steps through the whole tail)
+
+    Returns:
+    - Tn_values: Array of natural periods
+    - Ry: Yield strength reduction factors, shape (n_mu, n_periods);
+      NaN where μ is not reached within the scanned strengths
+    - Cy: Yield strength coefficients fy / (m g), same shape as Ry
+    """
+    m = 1.0
+    gamma = float(gamma)
+    beta = float(beta)
+    f, dt = _record_force(m, accel, time)
+
+    if Tn_values is None:
+        Tn_values = np.arange(0.05, 3.0 + 1e-9, 0.05)
+    Tn_values = np.atleast_1d(np.asarray(Tn_values, dtype=float))
+    mu_values = np.atleast_1d(np.asarray(mu_values, dtype=float))
+    n_T = len(Tn_values)
+
+    k_T = (2 * np.pi / Tn_values) ** 2 * m
+    c_T = 2 * ζ * np.sqrt(k_T * m)
+    f0_T = k_T * 9.81 * elastic_peak_displacement(ζ, Tn_values, accel, time)
+
+    def ductility(idx, η):
+        # Ductility demand of periods idx at normalized strengths η
+        Fy = η * f0_T[idx]
+        peak, _, _ = _epp_response(f, m, k_T[idx], c_T[idx], Fy, dt, gamma, beta, settle_tol)
+        return peak * k_T[idx] / Fy
+
+    # Bracketing scan: η from 1 (elastic strength) down to 1 / (4 max μ)
+    η_scan = np.geomspace(1.0, 1.0 / (4 * mu_values.max()), n_scan)
+    mu_scan = ductility(np.repeat(np.arange(n_T), n_scan), np.tile(η_scan, n_T)).reshape(n_T, n_scan)
+
+    η = np.full((len(mu_values), n_T), np.nan)
+    reached = mu_scan[None, :, :] >= mu_values[:, None, None] * (1 - tol)
+    first = np.argmax(reached, axis=2)
+    found = np.any(reached, axis=2)
+    η[found & (first == 0)] = 1.0
+    η[mu_values <= 1] = 1.0
+
+    # Regula falsi (Illinois) on g(η) = μ(η) - μ over the open brackets
+    i_mu, i_T = np.nonzero(found & (first > 0) & (mu_values[:, None] > 1))
+    target = mu_values[i_mu]
+    lo = η_scan[first[i_mu, i_T]]          # g(lo) >= 0 (weaker side)
+    hi = η_scan[first[i_mu, i_T] - 1]      # g(hi) < 0 (stronger side)
+    g_lo = mu_scan[i_T, first[i_mu, i_T]] - target
+    g_hi = mu_scan[i_T, first[i_mu, i_T] - 1] - target
+    side = np.zeros(len(target), dtype=int)
+    est = lo.copy()
+    active = np.ones(len(target), dtype=bool)
+
+    for _ in range(max_iter):
+        if not np.any(active):
+            break
+        a = np.nonzero(active)[0]
+        x = (lo[a] * g_hi[a] - hi[a] * g_lo[a]) / (g_hi[a] - g_lo[a])
+        g = ductility(i_T[a], x) - target[a]
+        est[a] = x
+
+        up = g >= 0
+        lo[a[up]], g_lo[a[up]] = x[up], g[up]
+        hi[a[~up]], g_hi[a[~up]] = x[~up], g[~up]
+        # Illinois step: halve the retained end point after a repeated side
+        g_hi[a[up & (side[a] == 1)]] *= 0.5
+        g_lo[a[~up & (side[a] == -1)]] *= 0.5
+        side[a] = np.where(up, 1, -1)
+
+        done = (np.abs(g) <= tol * target[a]) | (hi[a] - lo[a] <= tol * hi[a] * 1e-3)
+        active[a[done]] = False
+
+    η[i_mu, i_T] = est
+
+    Ry = 1 / η
+    # The solver force carries a factor 9.81 on accel, so f0 / (m 9.81) is in
+    # the units of accel; dividing once more by 9.81 gives multiples of g
+    Cy = η * f0_T / (m * 9.81) / 9.81
+
+    return Tn_values, Ry, Cy
@@ -0,0 +1,87 @@
+import numpy as np
+
+from solver.elastic_peak import elastic_peak_displacement
+from solver.energy import energy_balance
+from solver.free_vibration import excitation_end, fill_free_vibration
+from solver.integrator import integrate
+from solver.restoring_force import EPP, ElasticPerfectlyPlastic
+
+
+def hysteretic_solver(m, ζ, Tn, Ry, accel, time, scheme, model=ElasticPerfectlyPlastic, settle_tol=0.5,
+                      energy=False, mu_u=10.0, beta_PA=0.15, **model_params):
+    """
+    Inelastic response of SDOF system with any restoring-force model of
+    solver.restoring_force, integrated with any scheme of solver.integrator.
+
+    The yield strength is the peak elastic force divided by Ry, from the
+    shared exact elastic run (solver.elastic_peak), and the model is built
+    from the elastic stiffness and that strength. The record is integrated at
+    its own step; resample and pad it first with
+    solver.preprocessing.resample_record. For the elastic-perfectly plastic
+    model, stepping through the free-vibration tail stops once the response
+    is elastic with an amplitude below settle_tol * uy (below 1 it can no
+    longer yield), and the rest of the tail is filled in closed form about
+    the settled residual deformation (settle_tol=None steps through the whole
+    tail). The other models always step through the whole record.
+
+    Parameters:
+    - m: Mass (kg)
+    - ζ: Damping ratio
+    - Tn: Natural period (s)
+    - Ry: Yield strength reduction factor
+    - accel: Ground acceleration array
+    - time: Uniform time array (in seconds)
+    - scheme: CentralDifference(), Newmark(gamma, beta) or KRAlpha(rho)
+    - model: Restoring-force model class, called as model(k, Fy, **model_params)
+      (e.g. Bilinear, BilinearPDelta, Clough, Takeda, Pinching, BoucWen)
+    - settle_tol: Settle tolerance of the elastic-perfectly plastic model
+    - energy: Also return the energy balance, accumulated in the time loop
+    - mu_u, beta_PA: Ductility capacity and cyclic weight of the Park-Ang
+      damage index (see solver.energy.park_ang_index)
+
+    Returns:
+    - normalized_u: Normalized displacement (u / uy)
+    - normalized_fs: Normalized restoring force (fs / Fy)
+    - time: Time array (in seconds)
+    - ductility_demand
+    - normalized_residual_deformation
+    - energy (with energy only): Input, kinetic, damping and hysteretic
+      energy histories over Fy uy and the Park-Ang damage index (see
+      solver.energy.energy_balance)
+    """
+    time = np.asarray(time, dtype=float)
+    accel = np.asarray(accel, dtype=float)
+    dt = time[1] - time[0]
+    n = len(time)
+
+    m = float(m)
+    k = (2 * np.pi / Tn) ** 2 * m
+    c = 2 * ζ * np.sqrt(k * m)
+    f = -m * accel * 9.81
+
+    # Peak elastic force (the force carries the factor 9.81 on accel)
+    f0_max = k * 9.81 * elastic_peak_displacement(ζ, Tn, accel, time)
+    Fy = f0_max / Ry
+    uy = Fy / k
+    spring = model(k, Fy, **model_params)
+    # Unloading stiffness of the model (k reduced by P-Δ)
+    k_e = spring.stiffness[0]
+
+    settle = spring.kind == EPP and settle_tol is not None and ζ < 1
+    settle_uy = settle_tol * uy if settle else 0.0
+    _, _, _, i_stop, hist = integrate(scheme, spring, m, c, f, dt, history=True, full_output=False,
+                                      i_free=excitation_end(f), settle_uy=settle_uy, energy=energy)
+    u, v, a, fs = hist[:4, 0]
+    if i_stop[0] < n - 1:
+        fill_free_vibration(u, v, a, fs, i_stop[0], k_e, ζ, np.sqrt(k_e / m), dt)
+
+    normalized_u = u / uy
+    normalized_fs = fs / Fy
+    ductility_demand = np.max(np.abs(u)) / uy
+    residual_deformation = abs(u[-1] - fs[-1] / k_e)
+    normalized_residual_deformation = residual_deformation / uy
+
+    if energy:
+        energy = energy_balance(hist[4:, 0], v, fs, i_stop[0], m, k_e, Fy, uy, ductility_demand, mu_u, beta_PA)
+        return normalized_u, normalized_fs, time, ductility_demand, normalized_residual_deformation, energy
+    return normalized_u, normalized_fs, time, ductility_demand, normalized_residual_deformation
@@ -1,90 +1,157 @@
 import numpy as np
 
-def interpolation_response_spectrum_solver(ζ, accel, time):
+from solver.backend import jit, active_backend
+from solver.damping import damping_grid
+from solver.integrator import PiecewiseExact, integrate
+from solver.restoring_force import LinearElastic
+from solver.spectrum import track_free_vibration, spectrum_result
+from solver.Interpolation_Excitation_THL import _interpolation_coefficients
+
+
+@jit
+def _interpolation_substep_spectrum_loop(f, coeff, sub, n_sub, m, k, c, peaks, index, state):
+    n = len(f)
+    for j in range(coeff.shape[1]):
+        u = 0.0
+        v = 0.0
+        for i in range(n - 1):
+            # Exact states inside the step, where the excitation is linear
+            for s in range(1, n_sub[j]):
+                frac = s / n_sub[j]
+                f_s = f[i] + (f[i + 1] - f[i]) * frac
+                u_s = sub[0, j, s] * u + sub[1, j, s] * v + sub[2, j, s] * f[i] + sub[3, j, s] * f_s
+                v_s = sub[4, j, s] * u + sub[5, j, s] * v + sub[6, j, s] * f[i] + sub[7, j, s] * f_s
+                a_s = -(c[j] * v_s + k[j] * u_s) / m
+                if abs(u_s) > peaks[0, j]:
+                    peaks[0, j] = abs(u_s)
+                    index[0, j] = i + frac
+                if abs(v_s) > peaks[1, j]:
+                    peaks[1, j] = abs(v_s)
+                    index[1, j] = i + frac
+                if abs(a_s) > peaks[2, j]:
+                    peaks[2, j] = abs(a_s)
+                    index[2, j] = i + frac
+            u_next = coeff[0, j] * u + coeff[1, j] * v + coeff[2, j] * f[i] + coeff[3, j] * f[i + 1]
+            v = coeff[4, j] * u + coeff[5, j] * v + coeff[6, j] * f[i] + coeff[7, j] * f[i + 1]
+            u = u_next
+            a_abs = -(c[j] * v + k[j] * u) / m
+            if abs(u) > peaks[0, j]:
+                peaks[0, j] = abs(u)
+                index[0, j] = i + 1
+            if abs(v) > peaks[1, j]:
+                peaks[1, j] = abs(v)
+                index[1, j] = i + 1
+            if abs(a_abs) > peaks[2, j]:
+                peaks[2, j] = abs(a_abs)
+                index[2, j] = i + 1
+        state[0, j] = u
+        state[1, j] = v
+
+
+def _substep_peaks(f, coeff, sub, n_sub, m, k, c, peaks, index, state):
+    """
+    Vectorized counterpart of _interpolation_substep_spectrum_loop: the step
+    states of all oscillators are stored (the raw record is short), then each
+    substep is evaluated for all steps at once.
+    """
+    n = len(f)
+    U = np.zeros((coeff.shape[1], n))
+    V = np.zeros((coeff.shape[1], n))
+    for i in range(n - 1):
+        U[:, i + 1] = coeff[0] * U[:, i] + coeff[1] * V[:, i] + coeff[2] * f[i] + coeff[3] * f[i + 1]
+        V[:, i + 1] = coeff[4] * U[:, i] + coeff[5] * V[:, i] + coeff[6] * f[i] + coeff[7] * f[i + 1]
+    rows = np.arange(len(k))
+    for j, x in enumerate((U, V, -(c[:, None] * V + k[:, None] * U) / m)):
+        index[j] = np.argmax(np.abs(x), axis=1)
+        peaks[j] = np.abs(x[rows, index[j].astype(int)])
+    state[0], state[1] = U[:, -1], V[:, -1]
+
+    for s in range(1, n_sub.max()):
+        rows = np.nonzero(n_sub > s)[0]
+        frac = (s / n_sub[rows])[:, None]
+        f_s = f[:-1] + (f[1:] - f[:-1]) * frac
+        u, v = U[rows, :-1], V[rows, :-1]
+        u_s = sub[0, rows, s, None] * u + sub[1, rows, s, None] * v + sub[2, rows, s, None] * f[:-1] + sub[3, rows, s, None] * f_s
+        v_s = sub[4, rows, s, None] * u + sub[5, rows, s, None] * v + sub[6, rows, s, None] * f[:-1] + sub[7, rows, s, None] * f_s
+        for j, x in enumerate((u_s, v_s, -(c[rows, None] * v_s + k[rows, None] * u_s) / m)):
+            i = np.argmax(np.abs(x), axis=1)
+            peak = np.abs(x[np.arange(len(rows)), i])
+            new = peak > peaks[j, rows]
+            peaks[j, rows[new]] = peak[new]
+            index[j, rows[new]] = i[new] + frac[new, 0]
+
+
+def interpolation_response_spectrum_solver(ζ, accel, time, Tn_values=None, full_output=False, peak_tol=None,
+                                           free_vibration=True):
     """
     Computes the Displacement Response Spectrum using Interpolation Excitation Method.
 
+    All oscillators of the period grid are advanced together by
+    solver.integrator, so the record is walked only once (the peak_tol
+    substeps have their own compiled and vectorized loops).
+
     Parameters:
-    - ζ: Damping ratio (e.g. 0.02 for 2%)
+    - ζ: Damping ratio (e.g. 0.02 for 2%), scalar or array of ratios
     - accel: Ground acceleration array (in m/s²)
     - time: Time array (in seconds)
+    - Tn_values: Natural periods to evaluate (default 0.01 to 3s in 0.01s steps)
+    - full_output: Also track the peaks of relative velocity and absolute
+      acceleration, and the time of every peak, in the same pass
+    - peak_tol: Run on the raw samples and also check the exact response
+      inside each sample interval, at enough points that a sampled peak is
+      off by at most peak_tol (relative). The method is exact for the
+      linearly interpolated record, so this replaces upsampling the record
+    - free_vibration: Also take the peaks of the free vibration after the
+      record ends, in closed form from the final state
 
     Returns:
     - Tn_values: Array of natural periods
-    - max_disp: Array of max displacements for each Tn (in meters)
+    - max_disp: Array of max displacements for each Tn (in meters), of shape
+      (n_damping, n_periods) when ζ is an array
+    - spectrum (instead of max_disp with full_output): Dictionary with the
+      SD, SV, SA, PSV and PSA spectra and the peak times t_SD, t_SV, t_SA
     """
-    
-    time = np.array(time)
-    accel = np.array(accel)
+
+    time = np.array(time, dtype=float)
+    accel = np.array(accel, dtype=float)
     dt = time[1] - time[0]
     m = 1.0  # Mass in kg
     f = -m * accel  # base excitation force
     n = len(time)
 
-    Tn_values = np.arange(0.01, 3.0, 0.01)  # periods from 0.01 to 3s
-    max_disp = np.zeros(len(Tn_values))
-
-    for idx, Tn in enumerate(Tn_values):
-        wn = 2 * np.pi / Tn
-        wd = wn * np.sqrt(1 - ζ**2)
-        k = wn**2 * m
-        c = 2 * ζ * np.sqrt(k * m)
-
-        u = np.zeros(n)
-        v = np.zeros(n)
-        
-
-        # Initial conditions
-        u[0] = 0
-        v[0] = 0
-       
-
-       # Pre compute constants
-
-        exp_term = np.exp(-ζ * wn * dt)
-        A = exp_term * (np.cos(wd * dt) + (ζ / np.sqrt(1 - ζ**2)) * np.sin(wd * dt))
-        B = exp_term * (np.sin(wd * dt) / wd)
-
-        C = (1 / k) * (
-            (2 * ζ / (wn * dt)) +
-            exp_term * (
-                ((1 - 2 * ζ**2) / (wd * dt) - (ζ / np.sqrt(1 - ζ**2))) * np.sin(wd * dt) -
-                (1 + (2 * ζ) / (wn * dt)) * np.cos(wd * dt)
-            )
-        )
-
-        D = (1 / k) * (
-            1 - (2 * ζ) / (wn * dt) +
-            exp_term * (
-                ((2 * ζ**2 - 1) / (wd * dt)) * np.sin(wd * dt) +
-                (2 * ζ / (wn * dt)) * np.cos(wd * dt)
-            )
-        )
-
-        A_dash = -exp_term * ((wn / np.sqrt(1 - ζ**2)) * np.sin(wd * dt))
-
-        B_dash = exp_term * (
-            np.cos(wd * dt) - (ζ / np.sqrt(1 - ζ**2)) * np.sin(wd * dt)
-        )
-
-        C_dash = (1 / k) * (
-            -1 / dt +
-            exp_term * (
-                ((wn / np.sqrt(1 - ζ**2)) + (ζ / (dt * np.sqrt(1 - ζ**2)))) * np.sin(wd * dt) +
-                (1 / dt) * np.cos(wd * dt)
-            )
-        )
-
-        D_dash = (1 / (k * dt)) * (
-            1 - exp_term * (
-                (ζ / np.sqrt(1 - ζ**2)) * np.sin(wd * dt) +
-                np.cos(wd * dt)
-            )
-        )
-        for i in range(n - 1):
-            u[i + 1] = A * u[i] + B * v[i] + C * f[i] + D * f[i + 1]
-            v[i + 1] = A_dash * u[i] + B_dash * v[i] + C_dash * f[i] + D_dash * f[i + 1]
-        max_disp[idx] = np.max(np.abs(u))
-    return Tn_values, max_disp
-
-
+    if Tn_values is None:
+        Tn_values = np.arange(0.01, 3.0, 0.01)  # periods from 0.01 to 3s
+    Tn_values = np.atleast_1d(np.asarray(Tn_values, dtype=float))
+    ζ, Tn_grid, shape = damping_grid(ζ, Tn_values)
+
+    wn = 2 * np.pi / Tn_grid
+    wd = wn * np.sqrt(1 - ζ**2)
+    k = wn**2 * m
+
+    c = 2 * ζ * wn * m
+
+    if peak_tol is not None:
+        peaks = np.zeros((3, len(Tn_grid)))
+        index = np.zeros((3, len(Tn_grid)))
+        state = np.zeros((2, len(Tn_grid)))
+        # A sampled sinusoid misses its peak by at most (π h / Tn)² / 2
+        n_sub = np.maximum(np.ceil(np.pi * dt / (Tn_grid * np.sqrt(2 * peak_tol))), 1).astype(np.int64)
+        coeff = np.array(_interpolation_coefficients(ζ, wn, k, dt))
+        sub = np.zeros((8, len(Tn_grid), n_sub.max()))
+        for s in range(1, n_sub.max()):
+            rows = n_sub > s
+            sub[:, rows, s] = _interpolation_coefficients(ζ[rows], wn[rows], k[rows], dt * s / n_sub[rows])
+        if active_backend() == "numba":
+            _interpolation_substep_spectrum_loop(f, coeff, sub, n_sub, m, k, c, peaks, index, state)
+        else:
+            _substep_peaks(f, coeff, sub, n_sub, m, k, c, peaks, index, state)
+    else:
+        peaks, index, state, _, _ = integrate(PiecewiseExact(), LinearElastic(k), m, c, f, dt,
+                                              full_output=full_output)
+
+    if free_vibration:
+        track_free_vibration(peaks, index, state[0], state[1], ζ, wn, n - 1)
+
+    if full_output:
+        return Tn_values, spectrum_result(Tn_grid, peaks, index, dt, time[0], shape)
+    return Tn_values, peaks[0].reshape(shape)
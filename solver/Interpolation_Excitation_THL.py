@@ -1,41 +1,21 @@
 import numpy as np
 
-def interpolation_excitation_solver(m, ζ, Tn, accel, time):
-    """
-    Interpolation Excitation Method for SDOF system response to base excitation (acceleration input).
+from solver.backend import active_backend
+from solver.integrator import PiecewiseExact, integrate
+from solver.restoring_force import LinearElastic
+from solver.state_space import interpolation_state_space, filter_response, chunked_filter_response
 
-    Parameters:
-    - m: Mass (kg)
-    - ζ: Damping ratio (unitless)
-    - Tn: Natural period (s)
-    - accel: Ground acceleration array (in m/s^2)
-    - time: Time array (same length as accel)
+
+def _interpolation_coefficients(ζ, wn, k, dt):
+    """
+    Recurrence coefficients of the Interpolation Excitation Method over a step dt
+    (scalars or arrays of oscillators).
 
     Returns:
-    - u: Displacement (m)
-    - v: Velocity (m/s)
-    - a: Acceleration (m/s^2)
-    - t: Time array (s)
+    - A, B, C, D, A_dash, B_dash, C_dash, D_dash: u and v at the end of the step are
+      A u + B v + C f_start + D f_end and A' u + B' v + C' f_start + D' f_end
     """
-    accel = np.array(accel)
-    time = np.array(time)
-    dt = time[1] - time[0]
-    n = len(time)
-    
-    
-    k = (2 * np.pi / Tn)**2 * m  # Convert Time period to stiffness
-    wn = 2 * np.pi / Tn  # Natural frequency (rad/s)
     wd = wn * np.sqrt(1 - ζ**2)  # Damped natural frequency (rad/s)
-    c = 2 * ζ * m * wn  # Damping coefficient from damping ratio
-    f = -m * accel  # base excitation force
-
-    u = np.zeros(n)
-    v = np.zeros(n)
-    
-    
-    
-
-
     exp_term = np.exp(-ζ * wn * dt)
 
     A = exp_term * (np.cos(wd * dt) + (ζ / np.sqrt(1 - ζ**2)) * np.sin(wd * dt))
@@ -78,15 +58,88 @@ def interpolation_excitation_solver(m, ζ, Tn, accel, time):
         )
     )
 
+    return A, B, C, D, A_dash, B_dash, C_dash, D_dash
 
-    u[0] = 0
-    v[0] = 0
-    
 
+def _dense_output(u, v, f, ζ, wn, k, dt, t0, substeps):
+    """
+    Reconstructs the response at substeps points per step from the step states.
 
-    for i in range(n-1):
-        u[i+1] = A * u[i] + B * v[i] + C * f[i] + D * f[i+1]
-        v[i+1] = A_dash * u[i] + B_dash * v[i] + C_dash * f[i] + D_dash * f[i+1]
+    The excitation is linear inside every step, so the state a fraction s/substeps
+    into a step follows exactly from the same recurrence over the shorter step,
+    applied to all steps at once.
 
-    return u,v,time    
-        
\ No newline at end of file
+    Returns:
+    - u, v, t: Dense displacement, velocity and time arrays
+    """
+    n = len(u)
+    u_dense = np.empty((n - 1) * substeps + 1)
+    v_dense = np.empty((n - 1) * substeps + 1)
+    u_dense[::substeps] = u
+    v_dense[::substeps] = v
+    for s in range(1, substeps):
+        A, B, C, D, A_dash, B_dash, C_dash, D_dash = _interpolation_coefficients(ζ, wn, k, dt * s / substeps)
+        f_s = f[:-1] + (f[1:] - f[:-1]) * s / substeps
+        u_dense[s::substeps] = A * u[:-1] + B * v[:-1] + C * f[:-1] + D * f_s
+        v_dense[s::substeps] = A_dash * u[:-1] + B_dash * v[:-1] + C_dash * f[:-1] + D_dash * f_s
+    t_dense = t0 + np.arange(len(u_dense)) * dt / substeps
+    return u_dense, v_dense, t_dense
+
+
+def interpolation_excitation_solver(m, ζ, Tn, accel, time, mode=None, n_workers=None, substeps=1):
+    """
+    Interpolation Excitation Method for SDOF system response to base excitation (acceleration input).
+
+    Parameters:
+    - m: Mass (kg)
+    - ζ: Damping ratio (unitless)
+    - Tn: Natural period (s)
+    - accel: Ground acceleration array (in m/s^2)
+    - time: Time array (same length as accel)
+    - mode: "filter" evaluates the recurrence as an IIR filter (no Python
+      loop), "loop" steps through time explicitly (compiled when the Numba
+      backend is active), "chunked" splits the record into chunks solved
+      concurrently and joined by superposition (for very long records);
+      default is "loop" with Numba and "filter" without
+    - n_workers: Number of chunks / threads for mode="chunked" (default os.cpu_count())
+    - substeps: Output points per sample interval. The method is exact for
+      the linearly interpolated record, so it can run on the raw samples;
+      the response in between is reconstructed exactly from the step states
+      instead of upsampling the record first
+
+    Returns:
+    - u: Displacement (m)
+    - v: Velocity (m/s)
+    - t: Time array (s), with substeps points per sample interval
+    """
+    accel = np.array(accel, dtype=float)
+    time = np.array(time, dtype=float)
+    dt = time[1] - time[0]
+
+    k = (2 * np.pi / Tn)**2 * m  # Convert Time period to stiffness
+    wn = 2 * np.pi / Tn  # Natural frequency (rad/s)
+    c = 2 * ζ * m * wn  # Damping coefficient from damping ratio
+    f = -m * accel  # base excitation force
+    x0 = [0.0, 0.0]  # u and v, starting at rest
+
+    if mode is None:
+        mode = "loop" if active_backend() == "numba" else "filter"
+
+    x = None
+    if mode == "filter":
+        A_mat, B0, B1 = interpolation_state_space(m, ζ, Tn, dt)
+        x = filter_response(A_mat, B0, B1, f, x0)
+    elif mode == "chunked":
+        A_mat, B0, B1 = interpolation_state_space(m, ζ, Tn, dt)
+        x = chunked_filter_response(A_mat, B0, B1, f, x0, n_chunks=n_workers)
+    elif mode != "loop":
+        raise ValueError(f"Unknown mode: {mode}")
+
+    if x is not None:
+        u, v = x[:, 0], x[:, 1]
+    else:
+        u, v = integrate(PiecewiseExact(), LinearElastic(k), m, c, f, dt, history=True)[4][:2, 0]
+
+    if substeps > 1:
+        return _dense_output(u, v, f, ζ, wn, k, dt, time[0], substeps)
+    return u, v, time
@@ -1,76 +1,59 @@
 import numpy as np
 
+from solver.damping import damping_grid
+from solver.integrator import KRAlpha, integrate
+from solver.restoring_force import LinearElastic
+from solver.spectrum import track_free_vibration, spectrum_result
 
-def kr_alpha_response_spectrum_solver( ζ, accel, time, rho=1.0):
+
+def kr_alpha_response_spectrum_solver(ζ, accel, time, rho=1.0, Tn_values=None, full_output=False,
+                                      free_vibration=True):
     """
     KR-alpha Method for SDOF system response to base excitation (acceleration input).
 
+    All oscillators of the period grid are advanced together by
+    solver.integrator, so the record is walked only once.
+
     Parameters:
-    - m: Mass (kg)
-    - ζ: Damping ratio (unitless)
-    - Tn: Natural period of the system (s)
+    - ζ: Damping ratio (unitless), scalar or array of ratios
     - accel: Ground acceleration array (in m/s²)
     - time: Time array (same length as accel)
     - rho: KR-alpha parameter, default is 1.0
+    - Tn_values: Natural periods to evaluate (default 0.01 to 3s in 0.01s steps)
+    - full_output: Also track the peaks of relative velocity and absolute
+      acceleration, and the time of every peak, in the same pass
+    - free_vibration: Also take the peaks of the free vibration after the
+      record ends, in closed form from the final state
 
     Returns:
     - Tn_values: Array of natural periods
-    - max_disp: Array of max displacements for each Tn (in meters)
+    - max_disp: Array of max displacements for each Tn (in meters), of shape
+      (n_damping, n_periods) when ζ is an array
+    - spectrum (instead of max_disp with full_output): Dictionary with the
+      SD, SV, SA, PSV and PSA spectra and the peak times t_SD, t_SV, t_SA
     """
 
-    time = np.array(time)
-    accel = np.array(accel)
+    time = np.array(time, dtype=float)
+    accel = np.array(accel, dtype=float)
     dt = time[1] - time[0]
     m = 1.0  # Mass in kg
     f = -m * accel  # base excitation force
     n = len(time)
 
-    Tn_values = np.arange(0.01, 3.0, 0.01)  # periods from 0.01 to 3s
-    max_disp = np.zeros(len(Tn_values))
-
-    for idx, Tn in enumerate(Tn_values):
-        ωn = 2 * np.pi / Tn
-        k = ωn**2 * m
-        c = 2 * ζ * np.sqrt(k * m)
-
-        u = np.zeros(n)
-        v = np.zeros(n)
-        a = np.zeros(n)
-
-        # Initial conditions
-        u[0] = 0
-        v[0] = 0
-        a[0] = (f[0] - c * v[0] - k * u[0]) / m
-        a_hat = np.zeros(n)
-
-        # KR-alpha parameters
-        alpha_m = (2 * rho - 1) / (rho + 1)
-        alpha_f = rho / (rho + 1)
-        gamma = 0.5 - alpha_m + alpha_f
-        beta = 0.25 * (1 - alpha_m + alpha_f) ** 2
-
-        # Constants for the method
-        alpha = m + gamma * dt * c + beta * dt ** 2 * k
-        alpha1 = m / alpha
-        alpha2 = ((0.5 + gamma) * m) / alpha
-        alpha3 = (alpha_m * m + alpha_f * gamma * dt * c +
-                  alpha_f * beta * dt ** 2 * k) / alpha
-        for i in range(n - 1):
-            # Predict next velocity and displacement
-            v[i + 1] = v[i] + dt * alpha1 * a[i]
-            u[i + 1] = u[i] + dt * v[i] + dt ** 2 * alpha2 * a[i]
+    if Tn_values is None:
+        Tn_values = np.arange(0.01, 3.0, 0.01)  # periods from 0.01 to 3s
+    Tn_values = np.atleast_1d(np.asarray(Tn_values, dtype=float))
+    ζ, Tn_grid, shape = damping_grid(ζ, Tn_values)
 
-            # State determination
-            fs_ip1 = k * u[i + 1]
+    ωn = 2 * np.pi / Tn_grid
+    k = ωn**2 * m
+    c = 2 * ζ * np.sqrt(k * m)
 
-            v_alpha = (1 - alpha_f) * v[i + 1] + alpha_f * v[i]
-            fs_alpha = (1 - alpha_f) * fs_ip1 + alpha_f * k * u[i]
-            p_alpha = (1 - alpha_f) * f[i + 1] + alpha_f * f[i]
+    peaks, index, state, _, _ = integrate(KRAlpha(rho), LinearElastic(k), m, c, f, dt, full_output=full_output)
 
-            # 2.4 Compute predicted acceleration (a_hat)
-            a_hat[i + 1] = (p_alpha - c * v_alpha - fs_alpha) / m
+    if free_vibration:
+        track_free_vibration(peaks, index, state[0], state[1], ζ, ωn, n - 1)
 
-            # 2.5 Final acceleration update
-            a[i + 1] = (a_hat[i + 1] - alpha3 * a[i]) / (1 - alpha3)
-        max_disp[idx] = np.max(np.abs(u))
-    return Tn_values, max_disp
+    if full_output:
+        return Tn_values, spectrum_result(Tn_grid, peaks, index, dt, time[0], shape)
+    return Tn_values, peaks[0].reshape(shape)
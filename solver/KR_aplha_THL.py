@@ -1,6 +1,12 @@
 import numpy as np
 
-def kr_alpha_linear_solver(m, ζ, Tn, accel, time, rho):
+from solver.backend import active_backend
+from solver.integrator import KRAlpha, integrate
+from solver.restoring_force import LinearElastic
+from solver.state_space import kr_alpha_state_space, filter_response
+
+
+def kr_alpha_linear_solver(m, ζ, Tn, accel, time, rho, mode=None):
     """
     KR-alpha Method for SDOF system response to base excitation (acceleration input).
 
@@ -10,6 +16,10 @@ def kr_alpha_linear_solver(m, ζ, Tn, accel, time, rho):
     - Tn: Natural period of the system (s)
     - accel: Ground acceleration array (in m/s^2)
     - time: Time array (same length as accel)
+    - rho: KR-alpha parameter
+    - mode: "filter" evaluates the recurrence as an IIR filter (no Python
+      loop), "loop" steps through time explicitly (compiled when the Numba
+      backend is active); default is "loop" with Numba and "filter" without
 
     Returns:
     - u: Displacement (m)
@@ -17,8 +27,8 @@ def kr_alpha_linear_solver(m, ζ, Tn, accel, time, rho):
     - a: Acceleration (m/s^2)
     - t: Time array (s)
     """
-    accel = np.array(accel)
-    time = np.array(time)
+    accel = np.array(accel, dtype=float)
+    time = np.array(time, dtype=float)
     dt = time[1] - time[0]
     n = len(time)
   
@@ -30,40 +40,21 @@ def kr_alpha_linear_solver(m, ζ, Tn, accel, time, rho):
     u = np.zeros(n)
     v = np.zeros(n)
     a_resp = np.zeros(n)
-    a_hat = np.zeros(n)
     u[0] = 0
     v[0] = 0
     a_resp[0] = (f[0] - c * v[0] - k * u[0]) / m
 
-    # KR-alpha parameters
-    alpha_m = (2 * rho - 1) / (rho + 1)
-    alpha_f = rho / (rho + 1)
-    gamma = 0.5 - alpha_m + alpha_f
-    beta = 0.25 * (1 - alpha_m + alpha_f) ** 2
-
-
-    # Constants for the method
-    alpha = m + gamma * dt * c + beta * dt ** 2 * k
-    alpha1 = m / alpha
-    alpha2 = ((0.5 + gamma) * m) / alpha
-    alpha3 = (alpha_m * m + alpha_f * gamma * dt * c + alpha_f * beta * dt ** 2 * k) / alpha
-
-    for i in range(n - 1):
-        # Predict next velocity and displacement
-        v[i + 1] = v[i] + dt * alpha1 * a_resp[i]
-        u[i + 1] = u[i] + dt * v[i] + dt ** 2 * alpha2 * a_resp[i]
-
-        # State determination
-        fs_ip1 = k * u[i + 1]
-
-        v_alpha = (1 - alpha_f) * v[i + 1] + alpha_f * v[i]
-        fs_alpha = (1 - alpha_f) * fs_ip1 + alpha_f * k * u[i]
-        p_alpha = (1 - alpha_f) * f[i + 1] + alpha_f * f[i]
+    if mode is None:
+        mode = "loop" if active_backend() == "numba" else "filter"
 
-        # 2.4 Compute predicted acceleration (a_hat)
-        a_hat[i + 1] = (p_alpha - c * v_alpha - fs_alpha) / m
+    if mode == "filter":
+        A, B0, B1 = kr_alpha_state_space(m, k, c, dt, rho)
+        x = filter_response(A, B0, B1, f, [u[0], v[0], a_resp[0]])
+        if x is not None:
+            return x[:, 0], x[:, 1], x[:, 2], time
+    elif mode != "loop":
+        raise ValueError(f"Unknown mode: {mode}")
 
-        # 2.5 Final acceleration update
-        a_resp[i + 1] = (a_hat[i + 1] - alpha3 * a_resp[i]) / (1 - alpha3)
+    u, v, a_resp, _ = integrate(KRAlpha(rho), LinearElastic(k), m, c, f, dt, history=True)[4][:, 0]
 
     return u, v, a_resp, time
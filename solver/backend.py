@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+
+# The compiled backend is optional: when Numba is missing (or the
+# SEISMIC_SOLVER_BACKEND environment variable is set to "python") every
+# kernel below runs as the plain Python/NumPy code it is written in.
+try:
+    if os.environ.get("SEISMIC_SOLVER_BACKEND", "").lower() == "python":
+        raise ImportError("compiled backend disabled")
+    import numba
+except ImportError:
+    numba = None
+
+_precompiled = False
+
+
+def jit(func):
+    """
+    Compiles a solver kernel with Numba (nopython mode, cached on disk) when
+    the compiled backend is active; otherwise returns it unchanged.
+    """
+    if numba is None:
+        return func
+    return numba.njit(cache=True)(func)
+
+
+def inline_jit(func):
+    """
+    Like jit, for helpers called at every step of a kernel: Numba inlines
+    them into the calling kernel instead of compiling a function call.
+    """
+    if numba is None:
+        return func
+    return numba.njit(cache=True, inline="always")(func)
+
+
+def active_backend():
+    """
+    Returns the name of the backend executing the solver loops: "numba" or "python".
+    """
+    return "python" if numba is None else "numba"
+
+
+def precompile():
+    """
+    Compiles every solver kernel by running each solver once on a tiny
+    record, so the first real analysis does not pay the compilation cost.
+    Does nothing for the Python backend or when already done.
+    """
+    global _precompiled
+    if numba is None or _precompiled:
+        return
+
+    from solver.central_difference_THL import central_difference_solver
+    from solver.newmark_method_THL import newmark_solver
+    from solver.KR_aplha_THL import kr_alpha_linear_solver
+    from solver.Interpolation_Excitation_THL import interpolation_excitation_solver
+    from solver.central_difference_RSL import cd_response_spectrum_solver
+    from solver.newmark_method_RSL import newmark_response_spectrum_solver
+    from solver.KR_alpha_RSL import kr_alpha_response_spectrum_solver
+    from solver.Interpolation_Excitation_RSL import interpolation_response_spectrum_solver
+    from solver.EPP_CDM_THL import epp_time_history_solver
+    from solver.EPP_Newmark_THL import epp_newmark_solver
+    from solver.EPP_KR_THL import epp_kr_alpha_solver
+    from solver.EPP_Event_THL import epp_event_solver
+    from solver.EPP_Newmark_RSL import epp_newmark_spectrum_solver
+    from solver.Hysteretic_THL import hysteretic_solver
+    from solver.integrator import Newmark
+    from solver.restoring_force import Bilinear, Clough, BoucWen
+    from solver.rainflow import rainflow
+
+    time = np.arange(8) * 0.01
+    accel = np.sin(time)
+    Tn_values = np.array([0.5, 1.0])
+
+    central_difference_solver(1.0, 0.05, 1.0, accel, time, mode="loop")
+    newmark_solver(1.0, 0.05, 1.0, accel, time, 0.5, 0.25, mode="loop")
+    kr_alpha_linear_solver(1.0, 0.05, 1.0, accel, time, 1.0, mode="loop")
+    interpolation_excitation_solver(1.0, 0.05, 1.0, accel, time, mode="loop")
+    cd_response_spectrum_solver(0.05, accel, time, Tn_values=Tn_values)
+    newmark_response_spectrum_solver(0.05, accel, time, 0.5, 0.25, Tn_values=Tn_values)
+    kr_alpha_response_spectrum_solver(0.05, accel, time, 1.0, Tn_values=Tn_values)
+    interpolation_response_spectrum_solver(0.05, accel, time, Tn_values=Tn_values)
+    interpolation_response_spectrum_solver(0.05, accel, time, Tn_values=Tn_values, peak_tol=1e-3)
+    epp_time_history_solver(1.0, 0.05, 1.0, 4.0, accel, time)
+    epp_newmark_solver(1.0, 0.05, 1.0, 4.0, accel, time)
+    epp_kr_alpha_solver(1.0, 0.05, 1.0, 4.0, accel, time)
+    epp_event_solver(1.0, 0.05, 1.0, 4.0, accel, time)
+    epp_newmark_spectrum_solver(0.05, [4.0], accel, time, Tn_values=Tn_values)
+    # One kernel per kind of restoring-force model (Clough stands for every
+    # peak-oriented model)
+    for model in (Bilinear, Clough, BoucWen):
+        hysteretic_solver(1.0, 0.05, 1.0, 4.0, accel, time, Newmark(), model)
+    rainflow(accel, gate=0.1)
+
+    _precompiled = True
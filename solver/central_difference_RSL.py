@@ -1,28 +1,39 @@
 import numpy as np
-from scipy.interpolate import interp1d
 
+from solver.damping import damping_grid
+from solver.integrator import CentralDifference, integrate
+from solver.restoring_force import LinearElastic
+from solver.spectrum import track_free_vibration, spectrum_result
 
-def cd_response_spectrum_solver(ζ, accel, time):
+
+def cd_response_spectrum_solver(ζ, accel, time, Tn_values=None, full_output=False, free_vibration=True):
     """
     Computes the Displacement Response Spectrum using Central Difference Method (CDM).
 
+    All stable oscillators of the period grid are advanced together by
+    solver.integrator, so the record is walked only once.
+
     Parameters:
+    - ζ: Damping ratio (e.g. 0.02 for 2%), scalar or array of ratios
     - accel: Ground acceleration array (in m/s²)
-    - time: Time array (in seconds)
-    - damping_ratio: ζ (default 2%)
-    - m: Mass of the system (default 1.0 kg)
-    - dt: Time step to interpolate signal (default 0.001s)
-    - Tn_max: Maximum Time Period for RS (default 3s)
-    - Tn_step: Resolution of Time Periods (default 0.01s)
+    - time: Time array (in seconds), uniformly spaced
+    - Tn_values: Natural periods to evaluate (default 0.01 to 3s in 0.01s steps)
+    - full_output: Also track the peaks of relative velocity and absolute
+      acceleration, and the time of every peak, in the same pass
+    - free_vibration: Also take the peaks of the free vibration after the
+      record ends, in closed form from the final state
 
     Returns:
     - Tn_values: Array of natural periods
-    - max_disp: Array of max displacements for each Tn (in inches)
+    - max_disp: Array of max displacements for each Tn (in meters), of shape
+      (n_damping, n_periods) when ζ is an array
+    - spectrum (instead of max_disp with full_output): Dictionary with the
+      SD, SV, SA, PSV and PSA spectra and the peak times t_SD, t_SV, t_SA
     """
 
     # Resample time and interpolate acceleration
-    time_new = np.array(time)
-    accel_new = np.array(accel)
+    time_new = np.array(time, dtype=float)
+    accel_new = np.array(accel, dtype=float)
     dt = time_new[1] - time_new[0]  # Time step
     m = 1.0  # Mass in kg
     damping_ratio = ζ  # Damping ratio
@@ -30,43 +41,34 @@ def cd_response_spectrum_solver(ζ, accel, time):
     n = len(time_new)  # number of time steps
     f = -m * accel_new  # force in N
 
-    Tn_values = np.arange(0.01, 3, 0.01)
-    max_disp = np.zeros(len(Tn_values))
-
-    for Tn in Tn_values:
-
-        # ➤ Central Difference Method Stability Check
-        ωn = 2 * np.pi / Tn
-        if dt >= 2 / ωn:
-            max_disp[Tn_values == Tn] = np.nan
-            continue
+    if Tn_values is None:
+        Tn_values = np.arange(0.01, 3, 0.01)
+    Tn_values = np.atleast_1d(np.asarray(Tn_values, dtype=float))
+    ζ, Tn_grid, shape = damping_grid(ζ, Tn_values)
+    peaks = np.full((3, len(Tn_grid)), np.nan)
+    index = np.zeros((3, len(Tn_grid)))
 
-        k = (2 * np.pi / Tn) ** 2 * m  # spring constant in N/m
-        c = 2 * ζ * np.sqrt(k * m)  # damping coefficient in Ns/m
+    # ➤ Central Difference Method Stability Check
+    ωn = 2 * np.pi / Tn_grid
+    stable = dt < 2 / ωn
+    if not np.any(stable):
+        if full_output:
+            return Tn_values, spectrum_result(Tn_grid, peaks, index, dt, time_new[0], shape)
+        return Tn_values, peaks[0].reshape(shape)
 
-        u = np.zeros(n)  # displacement in m
-        v = np.zeros(n)  # velocity in m/s
-        a = np.zeros(n)  # acceleration in m/s^2
-        u[0] = 0  # initial displacement
-        v[0] = 0  # initial velocity
-        a[0] = (f[0] - c * v[0] - k * u[0]) / m  # initial acceleration
-        u_minus_1 = u[0] - dt * v[0] + (dt**2/2)*a[0]  # Displacement at t-1
+    k = ωn[stable] ** 2 * m  # spring constant in N/m
+    c = 2 * ζ[stable] * np.sqrt(k * m)  # damping coefficient in Ns/m
 
-        k_hat = m/dt**2 + c/(2*dt)
-        a1 = m/dt**2 - c/(2*dt)
-        b = k - 2*m/dt**2
+    # Velocity and acceleration lag one step behind the displacement
+    peaks_stable, index_stable, state, _, _ = integrate(CentralDifference(), LinearElastic(k), m, c, f, dt,
+                                                        full_output=full_output)
 
-        # main loop for displacement, velocity, and acceleration
-        for i in range(n-1):
-            if i == 0:
-                u[i+1] = (f[i] - a1*u_minus_1 - b*u[i]) / k_hat
-                v[i+1] = (u[i+1]-u_minus_1) / (2*dt)
-                a[i+1] = (u[i+1] - 2*u[i] + u_minus_1) / (dt**2)
-            else:
-                u[i+1] = (f[i] - a1*u[i-1] - b*u[i]) / k_hat
-                v[i+1] = (u[i+1]-u[i-1]) / (2*dt)
-                a[i+1] = (u[i+1] - 2*u[i] + u[i-1]) / (dt**2)
+    if free_vibration:
+        track_free_vibration(peaks_stable, index_stable, state[0], state[1], ζ[stable], ωn[stable], n - 1)
 
-        max_disp[Tn_values == Tn] = np.max(u)
+    peaks[:, stable] = peaks_stable
+    index[:, stable] = index_stable
 
-    return Tn_values, max_disp
+    if full_output:
+        return Tn_values, spectrum_result(Tn_grid, peaks, index, dt, time_new[0], shape)
+    return Tn_values, peaks[0].reshape(shape)
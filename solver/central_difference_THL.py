@@ -1,7 +1,12 @@
 import numpy as np
 
+from solver.backend import active_backend
+from solver.integrator import CentralDifference, integrate
+from solver.restoring_force import LinearElastic
+from solver.state_space import central_difference_state_space, filter_response
 
-def central_difference_solver(m, ζ, Tn, accel, time):
+
+def central_difference_solver(m, ζ, Tn, accel, time, mode=None):
     """
     Central Difference Method for SDOF system response to base excitation (acceleration input).
 
@@ -11,6 +16,9 @@ def central_difference_solver(m, ζ, Tn, accel, time):
     - k: Stiffness (N/m)
     - accel: Ground acceleration array (in m/s^2)
     - time: Time array (same length as accel)
+    - mode: "filter" evaluates the recurrence as an IIR filter (no Python
+      loop), "loop" steps through time explicitly (compiled when the Numba
+      backend is active); default is "loop" with Numba and "filter" without
 
     Returns:
     - u: Displacement (m)
@@ -18,8 +26,8 @@ def central_difference_solver(m, ζ, Tn, accel, time):
     - a: Acceleration (m/s^2)
     - t: Time array (s)
     """
-    accel = np.array(accel)
-    time = np.array(time)
+    accel = np.array(accel, dtype=float)
+    time = np.array(time, dtype=float)
     dt = time[1] - time[0]
     n = len(time)
     k = (2 * np.pi / Tn)**2 * m  # Convert Time period to stiffness
@@ -34,18 +42,25 @@ def central_difference_solver(m, ζ, Tn, accel, time):
     a_resp[0] = (f[0] - c * v[0] - k * u[0]) / m
     u_minus_1 = u[0] - dt * v[0] + (dt**2 / 2) * a_resp[0]
 
-    k_hat = m / dt**2 + c / (2 * dt)
-    a1 = m / dt**2 - c / (2 * dt)
-    b = k - 2 * m / dt**2
-
-    for i in range(n - 1):
-        if i == 0:
-            u[i+1] = (f[i] - a1*u_minus_1 - b*u[i]) / k_hat
-            v[i+1] = (u[i+1]-u_minus_1) / (2*dt)
-            a_resp[i+1] = (u[i+1] - 2*u[i] + u_minus_1) / (dt**2)
-        else:
-            u[i+1] = (f[i] - a1*u[i-1] - b*u[i]) / k_hat
-            v[i+1] = (u[i+1]-u[i-1]) / (2*dt)
-            a_resp[i+1] = (u[i+1] - 2*u[i] + u[i-1]) / (dt**2)
+    if mode is None:
+        mode = "loop" if active_backend() == "numba" else "filter"
+
+    if mode == "filter":
+        A, B0, B1 = central_difference_state_space(m, k, c, dt)
+        x = filter_response(A, B0, B1, f, [u[0], u_minus_1])
+        if x is not None:
+            u = x[:, 0]
+            u_prev = np.concatenate(([u_minus_1], u[:-1]))
+            v[1:] = (u[1:] - u_prev[:-1]) / (2 * dt)
+            a_resp[1:] = (u[1:] - 2 * u[:-1] + u_prev[:-1]) / (dt**2)
+            return u, v, a_resp, time
+    elif mode != "loop":
+        raise ValueError(f"Unknown mode: {mode}")
+
+    # The velocity and acceleration of step i are stored at i + 1, as above
+    hist = integrate(CentralDifference(), LinearElastic(k), m, c, f, dt, history=True)[4][:, 0]
+    u = hist[0]
+    v[1:] = hist[1, :-1]
+    a_resp[1:] = hist[2, :-1]
 
     return u, v, a_resp, time
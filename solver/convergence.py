@@ -0,0 +1,66 @@
+from time import perf_counter
+
+import numpy as np
+
+from solver.backend import precompile
+from solver.EPP_CDM_THL import epp_time_history_solver
+from solver.EPP_Event_THL import epp_event_solver
+from solver.EPP_KR_THL import epp_kr_alpha_solver
+from solver.EPP_Newmark_THL import epp_newmark_solver
+from solver.preprocessing import resample_record
+
+# EPP time-history solvers compared by the report, by display name
+EPP_SOLVERS = {
+    "Central Difference": epp_time_history_solver,
+    "Newmark-beta": epp_newmark_solver,
+    "K R-Alpha": epp_kr_alpha_solver,
+    "Event-Driven Exact": epp_event_solver,
+}
+
+
+def epp_convergence_report(accel, time, ζ=0.05, Tn=1.0, Ry=4.0, dt_values=(0.02, 0.01, 0.005, 0.002, 0.001),
+                           pad=20.0, reference_dt=0.0001):
+    """
+    Convergence of the EPP time-history solvers with the time step on one
+    record (e.g. GM_data/ElCentro.txt).
+
+    Every solver runs on the record resampled at every dt (with the same
+    free-vibration tail), and its ductility demand and residual deformation
+    are compared with the event-driven solver at reference_dt.
+
+    Parameters:
+    - accel: Ground acceleration array
+    - time: Time array (in seconds)
+    - ζ, Tn, Ry: Damping ratio, natural period (s) and strength reduction factor
+    - dt_values: Time steps to compare (s)
+    - pad: Free-vibration tail appended to the record (s)
+    - reference_dt: Time step of the reference run (s)
+
+    Returns:
+    - rows: One dictionary per (solver, dt) with the ductility demand, the
+      normalized residual deformation, their errors against the reference
+      (relative for the ductility, in units of uy for the residual) and the
+      run time
+    """
+    precompile()
+    time_ref, accel_ref = resample_record(accel, time, dt=reference_dt, pad=pad)
+    _, _, _, mu_ref, res_ref = epp_event_solver(1.0, ζ, Tn, Ry, accel_ref, time_ref)
+
+    rows = []
+    for name, solver in EPP_SOLVERS.items():
+        for dt in dt_values:
+            time_dt, accel_dt = resample_record(accel, time, dt=dt, pad=pad)
+            start = perf_counter()
+            with np.errstate(all="ignore"):
+                _, _, _, mu, res = solver(1.0, ζ, Tn, Ry, accel_dt, time_dt)
+            run_time = perf_counter() - start
+            rows.append({
+                "Method": name,
+                "dt (s)": dt,
+                "Ductility Demand": mu,
+                "Ductility Error (%)": 100 * abs(mu - mu_ref) / mu_ref,
+                "Residual Deformation (u/uy)": res,
+                "Residual Error (uy)": abs(res - res_ref),
+                "Run Time (s)": run_time,
+            })
+    return rows
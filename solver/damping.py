@@ -0,0 +1,57 @@
+import numpy as np
+
+
+def damping_grid(ζ, Tn_values):
+    """
+    Flattens the (ζ × Tn) grid of a multi-damping spectrum so that every
+    oscillator can be advanced as one entry of a vector.
+
+    Parameters:
+    - ζ: Damping ratio, scalar or array
+    - Tn_values: Array of natural periods
+
+    Returns:
+    - ζ_grid: Damping ratio of every oscillator, damping-major order
+    - Tn_grid: Natural period of every oscillator
+    - shape: Shape of the result, (n_damping, n_periods), or (n_periods,)
+      when ζ is a scalar
+    """
+    ζ_values = np.atleast_1d(np.asarray(ζ, dtype=float))
+    ζ_grid = np.repeat(ζ_values, len(Tn_values))
+    Tn_grid = np.tile(Tn_values, len(ζ_values))
+    if np.ndim(ζ) == 0:
+        return ζ_grid, Tn_grid, (len(Tn_values),)
+    return ζ_grid, Tn_grid, (len(ζ_values), len(Tn_values))
+
+
+def damping_modification_factor(ζ_values, spectra, ζ_ref=0.05):
+    """
+    Damping modification factors B(ζ, Tn) = S(ζ, Tn) / S(ζ_ref, Tn) of a
+    multi-damping spectrum.
+
+    When ζ_ref is not one of the computed damping ratios the reference
+    spectrum is interpolated linearly between its neighbours.
+
+    Parameters:
+    - ζ_values: Damping ratios of the rows of spectra
+    - spectra: Spectral ordinates of shape (n_damping, n_periods)
+    - ζ_ref: Reference damping ratio (default 5%)
+
+    Returns:
+    - factors: Array of shape (n_damping, n_periods)
+    """
+    ζ_values = np.atleast_1d(np.asarray(ζ_values, dtype=float))
+    spectra = np.asarray(spectra, dtype=float)
+    if not ζ_values.min() <= ζ_ref <= ζ_values.max():
+        raise ValueError(f"Reference damping {ζ_ref} outside the computed range")
+
+    order = np.argsort(ζ_values)
+    ζ_sorted = ζ_values[order]
+    j = min(np.searchsorted(ζ_sorted, ζ_ref), len(ζ_sorted) - 1)
+    if ζ_sorted[j] == ζ_ref:
+        reference = spectra[order[j]]
+    else:
+        w = (ζ_ref - ζ_sorted[j - 1]) / (ζ_sorted[j] - ζ_sorted[j - 1])
+        reference = (1 - w) * spectra[order[j - 1]] + w * spectra[order[j]]
+
+    return spectra / reference
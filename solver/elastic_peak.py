@@ -0,0 +1,52 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from solver.free_vibration import excitation_end
+from solver.Interpolation_Excitation_RSL import interpolation_response_spectrum_solver
+from solver.preprocessing import record_digest
+
+# Elastic peak displacements already computed, keyed by (record digest, ζ, peak_tol),
+# each entry mapping a natural period to its peak
+_cache = OrderedDict()
+_CACHE_SIZE = 16
+
+
+def elastic_peak_displacement(ζ, Tn_values, accel, time, peak_tol=None):
+    """
+    Peak displacement max|u| of linear elastic SDOF systems under a ground
+    motion record: the elastic run that sets the yield strength of the EPP
+    solvers (Fy = k max|u| / Ry).
+
+    The response is computed with the exact recurrence of the Interpolation
+    of Excitation method up to the end of the excitation, and the peak of the
+    free vibration that follows is taken in closed form. Peaks are memoized
+    per (record, ζ, Tn), so an Ry sweep at a period, or rerunning an analysis
+    on the same record, integrates the elastic system only once.
+
+    Parameters:
+    - ζ: Damping ratio (scalar)
+    - Tn_values: Natural periods (s), scalar or array
+    - accel: Ground acceleration array
+    - time: Uniform time array (in seconds)
+    - peak_tol: Also check the exact response between the samples, to a
+      relative accuracy of peak_tol (None takes the peaks at the samples)
+
+    Returns:
+    - peak: Peak displacements for accel, same shape as Tn_values
+    """
+    Tn_values = np.asarray(Tn_values, dtype=float)
+    key = (record_digest(accel, time), float(ζ), peak_tol)
+    known = _cache.setdefault(key, {})
+    _cache.move_to_end(key)
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+
+    missing = np.unique([Tn for Tn in Tn_values.ravel() if Tn not in known])
+    if len(missing) > 0:
+        n = max(excitation_end(np.asarray(accel)) + 1, 2)
+        _, peak = interpolation_response_spectrum_solver(ζ, accel[:n], time[:n], Tn_values=missing,
+                                                         peak_tol=peak_tol)
+        known.update(zip(missing.tolist(), peak.tolist()))
+
+    return np.array([known[Tn] for Tn in Tn_values.ravel()]).reshape(Tn_values.shape)
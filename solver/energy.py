@@ -0,0 +1,59 @@
+import numpy as np
+
+
+def park_ang_index(ductility_demand, hysteretic_energy, mu_u=10.0, beta_PA=0.15):
+    """
+    Park-Ang damage index of an SDOF system,
+    DI = (um + beta_PA EH / Fy) / uu = (μ + beta_PA EH / (Fy uy)) / μu.
+
+    Parameters:
+    - ductility_demand: Peak displacement over the yield displacement μ
+    - hysteretic_energy: Dissipated hysteretic energy over Fy uy
+    - mu_u: Ductility capacity under monotonic loading μu
+    - beta_PA: Weight of the cyclic loading (about 0.05 to 0.15)
+
+    Returns:
+    - Damage index (0 undamaged, about 1 collapse)
+    """
+    return (ductility_demand + beta_PA * hysteretic_energy) / mu_u
+
+
+def energy_balance(energy, v, fs, i_stop, m, k, Fy, uy, ductility_demand, mu_u=10.0, beta_PA=0.15):
+    """
+    Energy time histories of an inelastic run from the running sums of
+    solver.integrator.integrate (energy=True), in units of Fy uy.
+
+    After i_stop the run is the elastic free vibration filled in closed form
+    (solver.free_vibration.fill_free_vibration): no energy comes in, the
+    strain energy changes by the elastic energy fs² / 2k and damping
+    dissipates the rest.
+
+    Parameters:
+    - energy: Array of shape (3, n) with the input, damping and strain
+      energy, up to i_stop (N m)
+    - v, fs: Velocity and restoring force histories (complete)
+    - i_stop: Last step integrated
+    - m, k: Mass (kg) and elastic unloading stiffness (N/m)
+    - Fy, uy: Yield strength (N) and displacement (m)
+    - ductility_demand, mu_u, beta_PA: See park_ang_index
+
+    Returns:
+    - Dictionary with the input, kinetic, damping and hysteretic (strain
+      energy less the recoverable fs² / 2k) energy histories, and the
+      Park-Ang damage index
+    """
+    E_input, E_damping, E_strain = np.array(energy)
+    E_input[i_stop + 1:] = E_input[i_stop]
+    E_strain[i_stop + 1:] = E_strain[i_stop] + (fs[i_stop + 1:]**2 - fs[i_stop]**2) / (2 * k)
+    E_kinetic = 0.5 * m * v**2
+    E_damping[i_stop + 1:] = E_input[i_stop + 1:] - E_kinetic[i_stop + 1:] - E_strain[i_stop + 1:]
+    E_hysteretic = E_strain - fs**2 / (2 * k)
+
+    scale = Fy * uy
+    return {
+        "input": E_input / scale,
+        "kinetic": E_kinetic / scale,
+        "damping": E_damping / scale,
+        "hysteretic": E_hysteretic / scale,
+        "park_ang": park_ang_index(ductility_demand, E_hysteretic[-1] / scale, mu_u, beta_PA),
+    }
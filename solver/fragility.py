@@ -0,0 +1,292 @@
+import os
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+from scipy.optimize import minimize
+from scipy.stats import norm
+
+from solver.free_vibration import excitation_end
+from solver.integrator import Newmark, PiecewiseExact, integrate
+from solver.preprocessing import resample_record
+from solver.restoring_force import EPP, ElasticPerfectlyPlastic, LinearElastic
+
+# Working memory of one sample in a batch (model parameters, state, peaks and
+# the temporaries of the vectorized Python backend), in bytes
+_BYTES_PER_SAMPLE = 1024
+# Default samples per batch: the batches, and so the samples drawn, must not
+# depend on the host (number of workers), only on the seed
+_BATCH_SIZE = 1000
+
+# Resampled records of this process, set by _init_records
+_records = []
+
+
+def _init_records(records, dt, pad):
+    """
+    Worker initializer: resamples the record set once per process.
+    """
+    global _records
+    _records = [resample_record(accel, time, dt=dt, pad=pad) for time, accel in records]
+
+
+def _sample(distribution, n, rng):
+    # Frozen scipy.stats distribution, or a constant
+    if hasattr(distribution, "rvs"):
+        return np.asarray(distribution.rvs(size=n, random_state=rng), dtype=float)
+    return np.full(n, float(distribution))
+
+
+def _batch_stats(values, bins, n_bins):
+    """
+    Count, mean and sum of squared deviations of values per bin.
+    """
+    count = np.bincount(bins, minlength=n_bins).astype(float)
+    total = np.bincount(bins, weights=values, minlength=n_bins)
+    mean = np.divide(total, count, out=np.zeros(n_bins), where=count > 0)
+    m2 = np.bincount(bins, weights=(values - mean[bins]) ** 2, minlength=n_bins)
+    return count, mean, m2
+
+
+def _merge_stats(a, b):
+    """
+    Merges two (count, mean, m2) running statistics (Welford's update in
+    the pairwise form of Chan et al.), element-wise.
+    """
+    n_a, mean_a, m2_a = a
+    n_b, mean_b, m2_b = b
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    w = np.divide(n_b, n, out=np.zeros_like(n), where=n > 0)
+    return n, mean_a + delta * w, m2_a + m2_b + delta**2 * n_a * w
+
+
+def _evaluate_batch(seed, n, distributions, model, model_params, mu_limits, im, im_bins, settle_tol):
+    """
+    Worker task: draws one batch of systems and records from its own seeded
+    generator, runs them as ensembles (one per record) and returns the
+    statistics of the batch, not the samples.
+    """
+    rng = np.random.default_rng(seed)
+    Tn = _sample(distributions["Tn"], n, rng)
+    ζ = _sample(distributions["ζ"], n, rng)
+    if im == "Sa":
+        # The record is scaled to the drawn Sa and the strength is Cy: as in
+        # solver.ida, the scaled run equals the unscaled one with
+        # Fy = f0_max Cy / Sa, i.e. Ry = Sa / Cy
+        Cy = _sample(distributions["Cy"], n, rng)
+        im_values = _sample(distributions["Sa"], n, rng)
+        Ry = im_values / Cy
+    else:
+        Ry = _sample(distributions["Ry"], n, rng)
+        im_values = Ry
+    record = rng.integers(len(_records), size=n)
+
+    m = 1.0
+    k = (2 * np.pi / Tn) ** 2 * m
+    c = 2 * ζ * np.sqrt(k * m)
+    ductility = np.zeros(n)
+    for r in np.unique(record):
+        idx = np.flatnonzero(record == r)
+        time, accel = _records[r]
+        f = -m * accel * 9.81
+        dt = time[1] - time[0]
+
+        # Elastic peak (exact for the interpolated record) sets Fy = f0_max / Ry
+        peaks, _, _, _, _ = integrate(PiecewiseExact(), LinearElastic(k[idx]), m, c[idx], f, dt, full_output=False)
+        f0_max = k[idx] * peaks[0]
+        Fy = f0_max / Ry[idx]
+        uy = Fy / k[idx]
+
+        spring = model(k[idx], Fy, **model_params)
+        settle_uy = None
+        if spring.kind == EPP and settle_tol is not None:
+            settle_uy = np.where(ζ[idx] < 1, settle_tol * uy, 0.0)
+        with np.errstate(all="ignore"):
+            peaks, _, _, _, _ = integrate(Newmark(), spring, m, c[idx], f, dt, full_output=False,
+                                          i_free=excitation_end(f), settle_uy=settle_uy)
+        ductility[idx] = peaks[0] / uy
+
+    # Samples outside the intensity bins only enter the overall statistics;
+    # diverging runs (dynamic instability) exceed every limit but stay out of
+    # the mean and variance
+    n_bins = len(im_bins) - 1
+    ductility[~np.isfinite(ductility)] = np.inf
+    b = np.searchsorted(im_bins, im_values, side="right") - 1
+    inside = (b >= 0) & (b < n_bins)
+    finite = np.isfinite(ductility)
+    exceed = np.stack([np.bincount(b[inside], weights=(ductility[inside] > mu), minlength=n_bins)
+                       for mu in mu_limits])
+    return {
+        "samples": np.bincount(b[inside], minlength=n_bins),
+        "overall": _batch_stats(ductility[finite], np.zeros(np.sum(finite), dtype=np.int64), 1),
+        "binned": _batch_stats(ductility[inside & finite], b[inside & finite], n_bins),
+        "exceed": exceed,
+    }
+
+
+def fit_lognormal_fragility(im, counts, exceedances):
+    """
+    Maximum-likelihood lognormal fragility P(exceedance | IM) = Φ(ln(IM / θ) / β)
+    from exceedance counts at intensity levels (binomial likelihood).
+
+    Parameters:
+    - im: Intensity of every level (e.g. the bin centres)
+    - counts: Number of samples per level
+    - exceedances: Number of exceedances per level
+
+    Returns:
+    - theta: Median intensity, within the range of im (NaN when the counts
+      cannot define it, e.g. without exceedances, or when the fit fails or
+      runs into the bounds of the median or the upper bound of beta)
+    - beta: Logarithmic standard deviation, between 0.05 and 3 (NaN with theta)
+    """
+    im = np.asarray(im, dtype=float)
+    counts = np.asarray(counts, dtype=float)
+    exceedances = np.asarray(exceedances, dtype=float)
+    used = counts > 0
+    im, counts, exceedances = im[used], counts[used], exceedances[used]
+    if len(im) < 2 or exceedances.sum() == 0 or exceedances.sum() == counts.sum():
+        return np.nan, np.nan
+
+    ln_im = np.log(im)
+
+    def negative_log_likelihood(x):
+        z = (ln_im - x[0]) / np.exp(x[1])
+        return -np.sum(exceedances * norm.logcdf(z) + (counts - exceedances) * norm.logsf(z))
+
+    # Start from the intensity with the exceedance fraction closest to 1/2;
+    # ln θ stays within the intensities and ln β within [ln 0.05, ln 3]
+    x0 = [ln_im[np.argmin(np.abs(exceedances / counts - 0.5))], np.log(0.4)]
+    bounds = [(ln_im.min(), ln_im.max()), (np.log(0.05), np.log(3.0))]
+    res = minimize(negative_log_likelihood, x0, method="L-BFGS-B", bounds=bounds)
+    # A median on the edge of the intensities, or the flattest curve allowed,
+    # means the counts do not follow a lognormal fragility
+    if (not res.success or not np.all(np.isfinite(res.x)) or np.isclose(res.x[0], bounds[0]).any()
+            or np.isclose(res.x[1], bounds[1][1])):
+        return np.nan, np.nan
+    return np.exp(res.x[0]), np.exp(res.x[1])
+
+
+def monte_carlo_fragility(distributions, records, n_samples=10000, mu_limits=(1.0, 2.0, 4.0, 6.0), im="Ry",
+                          im_bins=None, model=ElasticPerfectlyPlastic, seed=0, batch_size=None, memory_budget=2**28,
+                          dt=0.001, pad=20.0, n_workers=None, settle_tol=0.5, **model_params):
+    """
+    Monte Carlo fragility of SDOF systems for ductility exceedance, with the
+    natural period, damping ratio and strength (reduction factor, or yield
+    strength coefficient and record intensity) drawn from distributions and
+    the record drawn from a record set.
+
+    The samples are drawn and evaluated in fixed-size batches, each from its
+    own generator seeded from one SeedSequence(seed); the workers pull the
+    batches and the statistics are merged in batch order, so the result is
+    reproducible for a given seed and batch size, whatever the number of
+    workers. A batch runs as one ensemble per record through
+    solver.integrator: the exact elastic run that sets Fy = f0_max / Ry, then
+    the nonlinear run (Newmark average acceleration). Only statistics are
+    kept: per intensity bin the sample count, the exceedance count of every
+    ductility limit and the running mean and variance of the ductility demand
+    (Welford), merged batch by batch; the lognormal fragility is fitted to
+    the counts at the end.
+
+    Parameters:
+    - distributions: Dictionary with "Tn", "ζ" and "Ry" (im="Ry") or "Cy"
+      and "Sa" (im="Sa"), each a frozen scipy.stats distribution (e.g.
+      scipy.stats.uniform(0.2, 2.8)) or a constant
+    - records: Sequence of raw records (time, accel), e.g. the values of
+      solver.preprocessing.load_record_suite("GM_data")
+    - n_samples: Number of samples
+    - mu_limits: Ductility limits (limit states)
+    - im: Intensity measure of the fragility: "Ry", or "Sa" (Sa(Tn, ζ) in g,
+      as in solver.ida): every record is scaled to the drawn Sa and the
+      system has the drawn yield strength coefficient Cy = fy / (m g)
+    - im_bins: Edges of the intensity bins (default 40 geometric bins, over
+      0.5 to 20 for Ry and 0.01 to 5 g for Sa)
+    - model: Restoring-force model class (solver.restoring_force), called as
+      model(k, Fy, **model_params)
+    - seed: Seed of the sample generators
+    - batch_size: Samples per batch (default 1000, fewer if memory_budget
+      requires)
+    - memory_budget: Working memory of one batch (bytes)
+    - dt, pad: Time step and free-vibration tail of the resampled records
+    - n_workers: Number of worker processes (default os.cpu_count(); 1 runs serially)
+    - settle_tol: Settle tolerance of the elastic-perfectly plastic model
+      (see solver.Hysteretic_THL.hysteretic_solver)
+
+    Returns:
+    - Dictionary with the intensity bins and their centres, the sample
+      counts, the exceedance counts and fractions (one row per limit), the
+      ductility mean and variance per bin and overall (of the runs that did
+      not diverge), and the fitted
+      fragility medians theta and dispersions beta (one per limit)
+    """
+    if im not in ("Ry", "Sa"):
+        raise ValueError("im must be 'Ry' or 'Sa'")
+    if im_bins is None:
+        im_bins = np.geomspace(0.5, 20.0, 41) if im == "Ry" else np.geomspace(0.01, 5.0, 41)
+    im_bins = np.asarray(im_bins, dtype=float)
+    mu_limits = np.atleast_1d(np.asarray(mu_limits, dtype=float))
+    records = [(np.asarray(time, dtype=float), np.asarray(accel, dtype=float)) for time, accel in records]
+
+    if batch_size is None:
+        batch_size = min(int(memory_budget // _BYTES_PER_SAMPLE), _BATCH_SIZE)
+    batch_size = max(1, int(batch_size))
+    sizes = [batch_size] * (n_samples // batch_size)
+    if n_samples % batch_size:
+        sizes.append(n_samples % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    task = partial(_evaluate_batch, distributions=distributions, model=model, model_params=model_params,
+                   mu_limits=mu_limits, im=im, im_bins=im_bins, settle_tol=settle_tol)
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(int(n_workers), len(sizes)))
+
+    n_bins = len(im_bins) - 1
+
+    def merge(batches):
+        # Streams the batch statistics into the totals, in batch order
+        totals = {"samples": np.zeros(n_bins), "exceed": np.zeros((len(mu_limits), n_bins)),
+                  "overall": (np.zeros(1), np.zeros(1), np.zeros(1)),
+                  "binned": (np.zeros(n_bins), np.zeros(n_bins), np.zeros(n_bins))}
+        for batch in batches:
+            totals["samples"] = totals["samples"] + batch["samples"]
+            totals["exceed"] = totals["exceed"] + batch["exceed"]
+            totals["overall"] = _merge_stats(totals["overall"], batch["overall"])
+            totals["binned"] = _merge_stats(totals["binned"], batch["binned"])
+        return totals
+
+    totals = None
+    if n_workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_records,
+                                     initargs=(records, dt, pad)) as pool:
+                totals = merge(pool.map(task, seeds, sizes))
+        except (OSError, BrokenProcessPool):
+            # No usable process pool (sandboxed host, fork disabled, ...)
+            totals = None
+    if totals is None:
+        _init_records(records, dt, pad)
+        totals = merge(task(s, n) for s, n in zip(seeds, sizes))
+
+    counts = totals["samples"]
+    exceed = totals["exceed"]
+    n_finite, mean, m2 = totals["binned"]
+    overall = totals["overall"]
+    centres = np.sqrt(im_bins[:-1] * im_bins[1:])
+    fits = [fit_lognormal_fragility(centres, counts, e) for e in exceed]
+    return {
+        "im_bins": im_bins,
+        "im": centres,
+        "counts": counts,
+        "mu_limits": mu_limits,
+        "exceedances": exceed,
+        "probability": np.divide(exceed, counts, out=np.full_like(exceed, np.nan), where=counts > 0),
+        "ductility_mean": np.where(n_finite > 0, mean, np.nan),
+        "ductility_var": np.divide(m2, n_finite - 1, out=np.full(n_bins, np.nan), where=n_finite > 1),
+        "mean": overall[1][0],
+        "var": overall[2][0] / (overall[0][0] - 1) if overall[0][0] > 1 else np.nan,
+        "theta": np.array([fit[0] for fit in fits]),
+        "beta": np.array([fit[1] for fit in fits]),
+    }
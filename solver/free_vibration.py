@@ -0,0 +1,109 @@
+import numpy as np
+
+from solver.backend import jit
+
+
+def _derivative(A, B, σ, ωd):
+    # d/dt of exp(-σ t) (A cos ωd t + B sin ωd t), in the same form
+    return B * ωd - σ * A, -A * ωd - σ * B
+
+
+def _free_vibration_terms(u0, v0, ζ, ωn):
+    """
+    Coefficients (A, B) of u, v and a = ü written as exp(-σ t) (A cos ωd t + B sin ωd t).
+    """
+    σ = ζ * ωn
+    ωd = ωn * np.sqrt(1 - ζ**2)
+    terms = [(u0, (v0 + σ * u0) / ωd)]
+    terms.append(_derivative(*terms[0], σ, ωd))
+    terms.append(_derivative(*terms[1], σ, ωd))
+    return terms, σ, ωd
+
+
+def free_vibration(u0, v0, ζ, ωn, t):
+    """
+    Closed-form damped free vibration of a linear SDOF system (ζ < 1).
+
+    Parameters:
+    - u0, v0: Displacement and velocity at t = 0
+    - ζ: Damping ratio
+    - ωn: Natural frequency (rad/s)
+    - t: Times after the start of the free vibration (s)
+
+    Returns:
+    - u, v, a: Displacement, velocity and acceleration at t. Without ground
+      motion the acceleration is also the absolute acceleration
+    """
+    terms, σ, ωd = _free_vibration_terms(u0, v0, ζ, ωn)
+    decay = np.exp(-σ * t)
+    return tuple(decay * (A * np.cos(ωd * t) + B * np.sin(ωd * t)) for A, B in terms)
+
+
+def free_vibration_peaks(u0, v0, ζ, ωn):
+    """
+    Peaks of |u|, |v| and |a| over the whole damped free vibration, without
+    time stepping.
+
+    Each quantity is a decaying sinusoid whose successive extrema shrink by
+    exp(-ζ π / sqrt(1 - ζ²)), so its largest value for t >= 0 is either the
+    starting value or the first extremum after t = 0.
+
+    Parameters:
+    - u0, v0: Displacement and velocity at t = 0 (scalars or arrays)
+    - ζ: Damping ratio
+    - ωn: Natural frequency (rad/s)
+
+    Returns:
+    - peaks: Array of shape (3, ...) with the peaks of |u|, |v| and |a|
+    - t_peak: Times of the peaks after the start of the free vibration (s)
+    """
+    terms, σ, ωd = _free_vibration_terms(u0, v0, ζ, ωn)
+    peaks = []
+    t_peak = []
+    for A, B in terms:
+        dA, dB = _derivative(A, B, σ, ωd)
+        # First root of dA cos θ + dB sin θ = 0 in (0, π]
+        θ = np.mod(np.arctan2(-dA, dB), np.pi)
+        θ = np.where(θ > 0, θ, np.pi)
+        extremum = np.abs(np.exp(-σ * θ / ωd) * (A * np.cos(θ) + B * np.sin(θ)))
+        later = extremum > np.abs(A)
+        peaks.append(np.where(later, extremum, np.abs(A)))
+        t_peak.append(np.where(later, θ / ωd, 0.0))
+    return np.array(peaks), np.array(t_peak)
+
+
+def excitation_end(f):
+    """
+    Index from which the force history stays zero (the start of the
+    free-vibration tail appended by solver.preprocessing.resample_record),
+    or the last index when the record has no such tail.
+    """
+    nonzero = np.flatnonzero(f)
+    if len(nonzero) == 0:
+        return 0
+    return min(nonzero[-1] + 1, len(f) - 1)
+
+
+def fill_free_vibration(u, v, a, fs, i, k, ζ, ωn, dt):
+    """
+    Fills the time-history arrays after step i with the elastic free
+    vibration about the current plastic offset u - fs / k, in place (used
+    once an EPP run has settled, see settled).
+    """
+    x0 = fs[i] / k
+    offset = u[i] - x0
+    t = np.arange(1, len(u) - i) * dt
+    x, v[i + 1:], a[i + 1:] = free_vibration(x0, v[i], ζ, ωn, t)
+    u[i + 1:] = offset + x
+    fs[i + 1:] = k * x
+
+
+@jit
+def settled(x, v, m, k, settle_uy):
+    """
+    True once an elastic oscillator in free vibration can no longer yield and
+    its residual deformation is fixed: the amplitude sqrt(x² + m v² / k) of
+    its elastic displacement x about the plastic offset, which damping can
+    only reduce, is below settle_uy (a fraction of the yield displacement).
+    """
+    return x * x + m * v * v / k < settle_uy * settle_uy
@@ -0,0 +1,63 @@
+import numpy as np
+
+from solver.damping import damping_grid
+from solver.spectrum import spectrum_result
+from solver.frequency_domain_THL import frequency_domain_response
+
+
+def frequency_domain_response_spectrum_solver(ζ, accel, time, pad=20.0, batch_size=16, Tn_values=None,
+                                              full_output=False):
+    """
+    Computes the Displacement Response Spectrum using the Frequency Domain (FFT) Method.
+
+    The record is transformed once per batch of periods and every batch is
+    solved as one 2-D array, so the cost is O(n log n) per oscillator.
+
+    Parameters:
+    - ζ: Damping ratio (e.g. 0.02 for 2%), scalar or array of ratios
+    - accel: Ground acceleration array (in m/s²)
+    - time: Time array (in seconds)
+    - pad: Length of the free-vibration tail searched for peaks after the record (s)
+    - batch_size: Number of periods solved together (bounds memory use)
+    - Tn_values: Natural periods to evaluate (default 0.01 to 3s in 0.01s steps)
+    - full_output: Also track the peaks of relative velocity and absolute
+      acceleration, and the time of every peak, in the same pass
+
+    Returns:
+    - Tn_values: Array of natural periods
+    - max_disp: Array of max displacements for each Tn (in meters), of shape
+      (n_damping, n_periods) when ζ is an array
+    - spectrum (instead of max_disp with full_output): Dictionary with the
+      SD, SV, SA, PSV and PSA spectra and the peak times t_SD, t_SV, t_SA
+    """
+
+    time = np.array(time)
+    accel = np.array(accel)
+    dt = time[1] - time[0]
+    n = len(time)
+    n_out = n + int(round(pad / dt))
+
+    if Tn_values is None:
+        Tn_values = np.arange(0.01, 3.0, 0.01)  # periods from 0.01 to 3s
+    Tn_values = np.atleast_1d(np.asarray(Tn_values, dtype=float))
+    ζ, Tn_grid, shape = damping_grid(ζ, Tn_values)
+    peaks = np.zeros((3, len(Tn_grid)))
+    index = np.zeros((3, len(Tn_grid)), dtype=np.int64)
+
+    for start in range(0, len(Tn_grid), batch_size):
+        batch = slice(start, start + batch_size)
+        if full_output:
+            u, v, _ = frequency_domain_response(ζ[batch], Tn_grid[batch], accel, dt, n_out)
+            ωn = (2 * np.pi / Tn_grid[batch])[:, None]
+            a_abs = -(2 * ζ[batch, None] * ωn * v + ωn**2 * u)
+            histories = (u, v, a_abs)
+        else:
+            histories = (frequency_domain_response(ζ[batch], Tn_grid[batch], accel, dt, n_out,
+                                                   displacement_only=True),)
+        for j, x in enumerate(histories):
+            index[j, batch] = np.argmax(np.abs(x), axis=1)
+            peaks[j, batch] = np.abs(np.take_along_axis(x, index[j, batch, None], axis=1))[:, 0]
+
+    if full_output:
+        return Tn_values, spectrum_result(Tn_grid, peaks, index, dt, time[0], shape)
+    return Tn_values, peaks[0].reshape(shape)
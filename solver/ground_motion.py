@@ -0,0 +1,140 @@
+import os
+
+import numpy as np
+from scipy.fft import irfft, next_fast_len, rfft, rfftfreq
+
+
+def clough_penzien_psd(ω, S0=1.0, ωg=5 * np.pi, ζg=0.6, ωf=0.5 * np.pi, ζf=0.6):
+    """
+    Clough-Penzien power spectral density of ground acceleration: white noise
+    S0 filtered by the Kanai-Tajimi soil filter (ωg, ζg) and by a high-pass
+    filter (ωf, ζf) that removes the unbounded long-period displacements of
+    the Kanai-Tajimi model (ωf = 0 gives the Kanai-Tajimi spectrum).
+
+    Parameters:
+    - ω: Circular frequencies (rad/s)
+    - S0: Intensity of the bedrock white noise (m²/s³)
+    - ωg, ζg: Frequency (rad/s) and damping ratio of the soil filter
+    - ωf, ζf: Frequency (rad/s) and damping ratio of the high-pass filter
+
+    Returns:
+    - PSD at ω (m²/s³)
+    """
+    return S0 * np.abs(_filter(np.asarray(ω, dtype=float), ωg, ζg, ωf, ζf)) ** 2
+
+
+def _filter(ω, ωg, ζg, ωf, ζf):
+    # Frequency response of the Kanai-Tajimi and high-pass filters in series
+    kanai_tajimi = (ωg**2 + 2j * ζg * ωg * ω) / (ωg**2 - ω**2 + 2j * ζg * ωg * ω)
+    if ωf == 0:
+        return kanai_tajimi
+    return kanai_tajimi * ω**2 / (ωf**2 - ω**2 + 2j * ζf * ωf * ω)
+
+
+def jennings_envelope(time, t1=2.0, t2=10.0, decay=0.25):
+    """
+    Time-modulating envelope of Jennings et al. (1968): a parabolic rise up
+    to t1, a plateau up to t2 and an exponential decay.
+
+    Parameters:
+    - time: Time array (in seconds)
+    - t1, t2: End of the rise and of the plateau (s)
+    - decay: Decay rate after t2 (1/s)
+
+    Returns:
+    - Envelope at time (between 0 and 1)
+    """
+    time = np.asarray(time, dtype=float)
+    return np.where(time < t1, (time / t1) ** 2, np.exp(-decay * np.maximum(time - t2, 0.0)))
+
+
+def synthetic_ground_motions(n_records, duration=20.0, dt=0.01, seed=0, S0=0.01, pga=None, t1=2.0, t2=10.0,
+                             decay=0.25, ωg=5 * np.pi, ζg=0.6, ωf=0.5 * np.pi, ζf=0.6):
+    """
+    Batch of synthetic ground motions: Gaussian white noise shaped in the
+    frequency domain by the Clough-Penzien filter (clough_penzien_psd) and
+    modulated by the Jennings envelope (jennings_envelope).
+
+    All records are generated at once as a 2D array: one FFT of the noise
+    along the time axis, the filter applied to every row, one inverse FFT.
+    Record i is drawn from the i-th generator spawned from
+    SeedSequence(seed), so it is the same for any n_records.
+
+    Parameters:
+    - n_records: Number of records
+    - duration: Length of every record (s)
+    - dt: Time step (s)
+    - seed: Seed of the record generators
+    - S0: Intensity of the bedrock white noise (m²/s³)
+    - pga: Peak ground acceleration of every record (g), instead of S0 (None
+      keeps the intensity S0)
+    - t1, t2, decay: Envelope parameters (see jennings_envelope)
+    - ωg, ζg, ωf, ζf: Filter parameters (see clough_penzien_psd)
+
+    Returns:
+    - time: Time array (in seconds), from 0
+    - accel: Ground acceleration array (in m/s², as loaded by the app) of
+      shape (n_records, n_steps); each row is ready for the solvers, and
+      write_records stores them in the format of GM_data/
+    """
+    n = int(round(duration / dt)) + 1
+    time = np.arange(n) * dt
+    # Padded FFT length, so the circular filtering wraps around the padding
+    # rather than onto the start of the record
+    n_fft = next_fast_len(n + int(round(5.0 / dt)))
+
+    # Two-sided white noise of intensity S0: variance 2π S0 / dt per sample
+    noise = np.empty((n_records, n_fft))
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(n_records)):
+        noise[i] = np.random.default_rng(child).standard_normal(n_fft)
+    noise *= np.sqrt(2 * np.pi * S0 / dt)
+
+    ω = 2 * np.pi * rfftfreq(n_fft, dt)
+    accel = irfft(rfft(noise, axis=1) * _filter(ω, ωg, ζg, ωf, ζf), n_fft, axis=1)[:, :n]
+    accel *= jennings_envelope(time, t1, t2, decay)
+
+    if pga is not None:
+        accel *= pga * 9.81 / np.max(np.abs(accel), axis=1, keepdims=True)
+    return time, accel
+
+
+def synthetic_record_suite(n_records, prefix="Synthetic", **kwargs):
+    """
+    Synthetic ground motions as a record set, like
+    solver.preprocessing.load_record_suite (e.g. for solver.ida.ida_suite or
+    solver.fragility.monte_carlo_fragility).
+
+    Parameters:
+    - n_records: Number of records
+    - prefix: Name prefix of the records
+    - **kwargs: Parameters of synthetic_ground_motions
+
+    Returns:
+    - Dictionary mapping the record names to (time, accel)
+    """
+    time, accel = synthetic_ground_motions(n_records, **kwargs)
+    return {f"{prefix}_{i:04d}": (time, row) for i, row in enumerate(accel)}
+
+
+def write_records(folder, time, accel, prefix="Synthetic"):
+    """
+    Writes records in the two-column format of GM_data/: time (s) and
+    acceleration (g), readable by solver.preprocessing.load_record and the
+    upload of the app.
+
+    Parameters:
+    - folder: Output folder (created if missing)
+    - time: Time array (in seconds)
+    - accel: Ground acceleration (in m/s²), one record or one row per record
+    - prefix: File name prefix; the files are prefix_0000.txt, ...
+
+    Returns:
+    - paths: Paths of the files written
+    """
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for i, row in enumerate(np.atleast_2d(accel)):
+        path = os.path.join(folder, f"{prefix}_{i:04d}.txt")
+        np.savetxt(path, np.column_stack((time, row / 9.81)), fmt="%.5e", delimiter="\t")
+        paths.append(path)
+    return paths
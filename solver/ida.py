@@ -0,0 +1,242 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from solver.elastic_peak import elastic_peak_displacement
+from solver.free_vibration import excitation_end
+from solver.integrator import Newmark, integrate
+from solver.preprocessing import resample_record
+from solver.restoring_force import EPP, ElasticPerfectlyPlastic
+
+
+def _ductility(scale, f, m, k, c, Fy, dt, scheme, model, model_params, settle_tol):
+    """
+    Ductility demand of the system under the record scaled by every factor,
+    as one ensemble. The restoring-force models are positively homogeneous
+    (fs(λ u; λ Fy) = λ fs(u; Fy)), so the response to λ f equals λ times the
+    response to f of the system with strength Fy / λ: every scale factor runs
+    on the same force history, with its own strength.
+    """
+    Fy_scaled = Fy / scale
+    spring = model(k, Fy_scaled, **model_params)
+    uy = Fy_scaled / k
+
+    settle_uy = None
+    if spring.kind == EPP and settle_tol is not None and c < 2 * np.sqrt(k * m):
+        settle_uy = settle_tol * uy
+    with np.errstate(all="ignore"):
+        peaks, _, _, _, _ = integrate(scheme, spring, m, c, f, dt, full_output=False,
+                                      i_free=excitation_end(f), settle_uy=settle_uy)
+    return peaks[0] / uy
+
+
+def ida_record(accel, time, Tn=1.0, ζ=0.05, Cy=0.2, model=ElasticPerfectlyPlastic, scheme=None, mu_collapse=20.0,
+               n_hunt=16, n_fill=4, tol=0.01, max_rounds=10, settle_tol=0.5, **model_params):
+    """
+    Incremental dynamic analysis of an SDOF system under one record: the
+    ductility demand against the intensity measure Sa(Tn, ζ), up to the
+    flatline (collapse).
+
+    The intensity levels are placed by hunt and fill, every stage running its
+    levels as one vectorized ensemble. The hunt runs a geometric ladder of
+    levels, moving on to the next ladder until a level collapses; the fill
+    then places n_fill levels at a time inside the bracket between the last
+    level standing and the first collapse, until the bracket is narrower than
+    tol. A level collapses when the ductility demand reaches mu_collapse or
+    the response diverges (dynamic instability, e.g. with BilinearPDelta).
+
+    Parameters:
+    - accel: Ground acceleration array (in m/s²), already resampled and padded
+      (solver.preprocessing.resample_record)
+    - time: Uniform time array (in seconds)
+    - Tn, ζ: Natural period (s) and damping ratio
+    - Cy: Yield strength coefficient fy / (m g) of the system
+    - model: Restoring-force model class (solver.restoring_force), called as
+      model(k, Fy, **model_params)
+    - scheme: Integration scheme (default Newmark average acceleration)
+    - mu_collapse: Ductility demand taken as collapse
+    - n_hunt: Levels per hunt ladder
+    - n_fill: Levels per fill round
+    - tol: Relative width of the final flatline bracket
+    - max_rounds: Maximum number of hunt ladders and of fill rounds
+    - settle_tol: Settle tolerance of the elastic-perfectly plastic model
+      (see solver.Hysteretic_THL.hysteretic_solver)
+
+    Returns:
+    - Dictionary with the intensity levels "im" (Sa in g, increasing), their
+      scale factors, the ductility demand (inf for the collapsed levels), the
+      flatline intensity "collapse_im" (the last level standing before the
+      first collapse, inf if none collapsed) and the Sa of the unscaled record
+    """
+    time = np.asarray(time, dtype=float)
+    accel = np.asarray(accel, dtype=float)
+    dt = time[1] - time[0]
+    scheme = Newmark() if scheme is None else scheme
+
+    m = 1.0
+    k = (2 * np.pi / Tn) ** 2 * m
+    c = 2 * ζ * np.sqrt(k * m)
+    f = -m * accel * 9.81
+    # Same units as Cy (see constant_ductility_spectrum_solver): the force
+    # carries the factor 9.81 on accel, and Sa is in multiples of g
+    Fy = Cy * m * 9.81 * 9.81
+    sa_record = k * elastic_peak_displacement(ζ, Tn, accel, time) / 9.81
+
+    im = np.zeros(0)
+    mu = np.zeros(0)
+
+    def run(levels):
+        nonlocal im, mu
+        demand = _ductility(levels / sa_record, f, m, k, c, Fy, dt, scheme, model, model_params, settle_tol)
+        demand[~(demand < mu_collapse)] = np.inf
+        im = np.concatenate((im, levels))
+        mu = np.concatenate((mu, demand))
+        order = np.argsort(im)
+        im, mu = im[order], mu[order]
+
+    def bracket():
+        # Last level standing before the first collapse, and that collapse
+        collapsed = np.isinf(mu)
+        if not np.any(collapsed):
+            return im[-1], np.inf
+        first = np.argmax(collapsed)
+        return (im[first - 1] if first > 0 else 0.0), im[first]
+
+    # Hunt: geometric ladders from a quarter of the yield intensity (Sa = Cy
+    # at first yield)
+    ladder = np.geomspace(0.25 * Cy, 2 * mu_collapse * Cy, n_hunt)
+    ratio = ladder[1] / ladder[0]
+    run(ladder)
+    for _ in range(max_rounds - 1):
+        if np.isfinite(bracket()[1]):
+            break
+        ladder = ladder * ratio ** n_hunt
+        run(ladder)
+
+    # Fill: refine the flatline bracket
+    for _ in range(max_rounds):
+        lo, hi = bracket()
+        if not np.isfinite(hi) or hi - lo <= tol * hi:
+            break
+        run(np.linspace(lo, hi, n_fill + 2)[1:-1])
+
+    lo, hi = bracket()
+    return {
+        "im": im,
+        "scale": im / sa_record,
+        "ductility": mu,
+        "collapse_im": lo if np.isfinite(hi) else np.inf,
+        "sa_record": sa_record,
+    }
+
+
+def _censored_percentile(values, q):
+    """
+    Percentiles of intensities that may be inf (records that never
+    collapsed, right-censored): a fractile that reaches them is inf, the
+    others interpolate between finite values only.
+    """
+    values = np.asarray(values, dtype=float)
+    finite = np.isfinite(values)
+    ceiling = values[finite].max() if np.any(finite) else 0.0
+    p = np.percentile(np.where(finite, values, ceiling), q)
+    return np.where(np.isinf(np.percentile(values, q, method="higher")), np.inf, p)
+
+
+def ida_fractiles(curves, dm_values, fractiles=(16, 50, 84)):
+    """
+    Summarizes IDA curves of many records by the fractiles of the intensity
+    reached at given ductility demands (IM given DM).
+
+    Each curve is followed up to its first collapse, with the ductility
+    demand made non-decreasing, and interpolated at dm_values; beyond its
+    last level standing the curve stays on its flatline. A record that never
+    collapsed stays at its highest level instead (a lower bound of its
+    intensity there), and counts as collapse intensity inf.
+
+    Parameters:
+    - curves: IDA curves of ida_record
+    - dm_values: Ductility demands at which to summarize
+    - fractiles: Percentiles across the records
+
+    Returns:
+    - Dictionary with the ductility demands, the intensity of every record at
+      every demand (one row per record), the intensity fractiles (one row per
+      fractile) and the fractiles of the collapse intensity (inf where a
+      fractile falls on records that never collapsed)
+    """
+    dm_values = np.asarray(dm_values, dtype=float)
+    im_at_dm = np.zeros((len(curves), len(dm_values)))
+    for i, curve in enumerate(curves):
+        standing = np.isfinite(curve["ductility"])
+        n = np.argmin(standing) if not np.all(standing) else len(standing)
+        dm = np.concatenate(([0.0], np.maximum.accumulate(curve["ductility"][:n])))
+        im = np.concatenate(([0.0], curve["im"][:n]))
+        im_at_dm[i] = np.interp(dm_values, dm, im)
+        flatline = curve["collapse_im"] if np.isfinite(curve["collapse_im"]) else im[-1]
+        im_at_dm[i, dm_values > dm[-1]] = flatline
+
+    collapse_im = np.array([curve["collapse_im"] for curve in curves])
+    return {
+        "dm": dm_values,
+        "im": im_at_dm,
+        "fractiles": np.asarray(fractiles),
+        "im_fractiles": np.percentile(im_at_dm, fractiles, axis=0),
+        "collapse_fractiles": _censored_percentile(collapse_im, fractiles),
+    }
+
+
+def _ida_task(accel, time, dt, pad, kwargs):
+    """
+    Worker task: resamples one record and traces its IDA curve.
+    """
+    time_new, accel_new = resample_record(accel, time, dt=dt, pad=pad)
+    return ida_record(accel_new, time_new, **kwargs)
+
+
+def ida_suite(records, dm_values=None, dt=0.001, pad=20.0, n_workers=None, fractiles=(16, 50, 84), **kwargs):
+    """
+    Incremental dynamic analysis of one system under a suite of records (e.g.
+    solver.preprocessing.load_record_suite("GM_data")), the records running
+    in parallel in a process pool.
+
+    Parameters:
+    - records: Dictionary mapping the record names to (time, accel), raw
+      records (accel in m/s²)
+    - dm_values: Ductility demands of the fractile summary (default 0.5 to
+      mu_collapse)
+    - dt, pad: Time step and free-vibration tail of the resampled records
+      (solver.preprocessing.resample_record)
+    - n_workers: Number of worker processes (default os.cpu_count(); 1 runs serially)
+    - fractiles: Percentiles across the records
+    - **kwargs: System and stepping parameters of ida_record (Tn, ζ, Cy,
+      model, ...)
+
+    Returns:
+    - curves: Dictionary mapping the record names to their IDA curves (see
+      ida_record)
+    - summary: Fractiles across the records (see ida_fractiles)
+    """
+    names = list(records)
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(int(n_workers), len(names)))
+
+    tasks = [(records[name][1], records[name][0], dt, pad, kwargs) for name in names]
+    results = None
+    if n_workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                results = list(pool.map(_ida_task, *zip(*tasks)))
+        except (OSError, BrokenProcessPool):
+            # No usable process pool (sandboxed host, fork disabled, ...)
+            results = None
+    if results is None:
+        results = [_ida_task(*task) for task in tasks]
+    curves = dict(zip(names, results))
+
+    if dm_values is None:
+        dm_values = np.linspace(0.5, kwargs.get("mu_collapse", 20.0), 40)
+    return curves, ida_fractiles(results, dm_values, fractiles)
@@ -0,0 +1,415 @@
+from functools import lru_cache
+
+import numpy as np
+
+from solver.backend import jit, inline_jit, active_backend
+from solver.free_vibration import settled
+from solver.restoring_force import LINEAR, trial_force, commit_state
+from solver.spectrum import track_peaks
+
+# Integration schemes understood by the kernels below
+CENTRAL_DIFFERENCE = 0
+NEWMARK = 1
+KR_ALPHA = 2
+PIECEWISE_EXACT = 3
+
+# Steps between the settle checks of the vectorized path
+_SETTLE_CHECK = 50
+
+
+class CentralDifference:
+    """
+    Central difference method (explicit, stable for dt < Tn / π). The
+    velocity and acceleration at a step are only known one step later.
+    """
+    code = CENTRAL_DIFFERENCE
+
+    def constants(self, m, k, c, dt):
+        k_hat = m / dt**2 + c / (2 * dt)
+        a1 = m / dt**2 - c / (2 * dt)
+        return np.array([1 / k_hat, a1, np.full_like(k_hat, 2 * m / dt**2)])
+
+
+class Newmark:
+    """
+    Newmark-beta method. A nonlinear spring is linearized once per step about
+    the predictor, with its tangent stiffness in the effective mass.
+
+    Parameters:
+    - gamma, beta: Newmark integration parameters (default average acceleration method)
+    """
+    code = NEWMARK
+
+    def __init__(self, gamma=0.5, beta=0.25):
+        self.gamma = float(gamma)
+        self.beta = float(beta)
+
+    def constants(self, m, k, c, dt):
+        # The inverse effective mass with the initial stiffness saves a
+        # division on elastic steps
+        m_eff = m + self.gamma * dt * c + self.beta * dt ** 2 * k
+        return np.array([np.full_like(k, self.gamma), np.full_like(k, self.beta), 1 / m_eff])
+
+
+class KRAlpha:
+    """
+    KR-alpha method (explicit, unconditionally stable for linear systems), its
+    constants set from the initial stiffness.
+
+    Parameters:
+    - rho: Spectral radius at infinite frequency (default 1.0)
+    """
+    code = KR_ALPHA
+
+    def __init__(self, rho=1.0):
+        self.rho = float(rho)
+
+    def constants(self, m, k, c, dt):
+        alpha_m = (2 * self.rho - 1) / (self.rho + 1)
+        alpha_f = self.rho / (self.rho + 1)
+        gamma = 0.5 - alpha_m + alpha_f
+        beta = 0.25 * (1 - alpha_m + alpha_f) ** 2
+
+        alpha = m + gamma * dt * c + beta * dt ** 2 * k
+        alpha1 = m / alpha
+        alpha2 = ((0.5 + gamma) * m) / alpha
+        alpha3 = (alpha_m * m + alpha_f * gamma * dt * c + alpha_f * beta * dt ** 2 * k) / alpha
+        return np.array([np.full_like(k, alpha_f), alpha1, alpha2, alpha3, 1 / (1 - alpha3)])
+
+
+class PiecewiseExact:
+    """
+    Interpolation of Excitation: exact for the linearly interpolated record
+    (linear elastic springs only, see solver.EPP_Event_THL for the
+    elastic-perfectly plastic counterpart).
+    """
+    code = PIECEWISE_EXACT
+
+    def constants(self, m, k, c, dt):
+        from solver.Interpolation_Excitation_THL import _interpolation_coefficients
+
+        wn = np.sqrt(k / m)
+        ζ = c / (2 * np.sqrt(k * m))
+        return np.array(_interpolation_coefficients(ζ, wn, k, dt))
+
+
+@inline_jit
+def _step(scheme, sc, kind, params, state, f0, f1, dt, m, c, u, v, a, fs, u_prev):
+    # One step from t_i to t_i+1 for one oscillator (scalars) or a batch
+    # (arrays). Returns u, fs at t_i+1 and v, a at t_i+1 (for the central
+    # difference method v, a at t_i), u_prev and the new model state
+    if scheme == CENTRAL_DIFFERENCE:
+        u_next = (f0 - sc[1] * u_prev - fs + sc[2] * u) * sc[0]
+        v_next = (u_next - u_prev) / (2 * dt)
+        a_next = (u_next - 2 * u + u_prev) / dt**2
+        fs_next, _ = trial_force(kind, params, state, u_next)
+        u_prev = u
+    elif scheme == NEWMARK:
+        gamma = sc[0]
+        beta = sc[1]
+        u_pred = u + dt * v + dt ** 2 * (0.5 - beta) * a
+        v_pred = v + dt * (1 - gamma) * a
+        fs_pred, kt = trial_force(kind, params, state, u_pred)
+        if np.all(kt == params[0]):
+            a_next = (f1 - c * v_pred - fs_pred) * sc[2]
+        else:
+            a_next = (f1 - c * v_pred - fs_pred) / (m + gamma * dt * c + beta * dt ** 2 * kt)
+        u_next = u_pred + beta * dt ** 2 * a_next
+        v_next = v_pred + gamma * dt * a_next
+        fs_next, _ = trial_force(kind, params, state, u_next)
+    elif scheme == KR_ALPHA:
+        alpha_f = sc[0]
+        v_next = v + dt * sc[1] * a
+        u_next = u + dt * v + dt ** 2 * sc[2] * a
+        fs_next, _ = trial_force(kind, params, state, u_next)
+        v_alpha = (1 - alpha_f) * v_next + alpha_f * v
+        fs_alpha = (1 - alpha_f) * fs_next + alpha_f * fs
+        p_alpha = (1 - alpha_f) * f1 + alpha_f * f0
+        a_hat = (p_alpha - c * v_alpha - fs_alpha) / m
+        a_next = (a_hat - sc[3] * a) * sc[4]
+    else:
+        u_next = sc[0] * u + sc[1] * v + sc[2] * f0 + sc[3] * f1
+        v_next = sc[4] * u + sc[5] * v + sc[6] * f0 + sc[7] * f1
+        fs_next, _ = trial_force(kind, params, state, u_next)
+        a_next = (f1 - c * v_next - fs_next) / m
+    state = commit_state(kind, params, state, u_next, fs_next)
+    return u_next, v_next, a_next, fs_next, u_prev, state
+
+
+@inline_jit
+def _energy_step(energy, f0, f1, c, u0, v0, fs0, u1, v1, fs1):
+    # Input, damping and strain energy after a step from (u0, v0, fs0) to
+    # (u1, v1, fs1), integrated over du with the trapezoidal rule
+    du = u1 - u0
+    return (energy[0] + 0.5 * (f0 + f1) * du, energy[1] + 0.5 * c * (v0 + v1) * du,
+            energy[2] + 0.5 * (fs0 + fs1) * du)
+
+
+@lru_cache(maxsize=None)
+def _integrate_loop(kind):
+    """
+    Compiled kernel of integrate() for one model kind. The kind is a
+    constant of the kernel, so the branches of the other models are
+    compiled out and their state does not cost registers; every kind is
+    compiled (and cached on disk) the first time it is used.
+    """
+    @jit
+    def loop(scheme, sc, params, state, f, dt, m, c, hist, peaks, index, final, i_stop, i_free, settle_uy,
+             full_output, energy):
+        n = len(f)
+        lag = 1 if scheme == CENTRAL_DIFFERENCE else 0
+        record = hist.shape[2] > 0
+        for j in range(len(c)):
+            sc_j = (sc[0, j], sc[1, j], sc[2, j], sc[3, j], sc[4, j], sc[5, j], sc[6, j], sc[7, j])
+            params_j = params[:, j]
+            state_j = (state[0, j], state[1, j], state[2, j], state[3, j], state[4, j])
+            k0 = params_j[0]
+            c_j = c[j]
+            u = 0.0
+            v = 0.0
+            fs, _ = trial_force(kind, params_j, state_j, u)
+            state_j = commit_state(kind, params_j, state_j, u, fs)
+            a = (f[0] - c_j * v - fs) / m
+            u_prev = u - dt * v + 0.5 * dt**2 * a
+            if record:
+                hist[0, j, 0] = u
+                hist[1, j, 0] = v
+                hist[2, j, 0] = a
+                hist[3, j, 0] = fs
+            top_u = top_v = top_a = 0.0
+            i_u = i_v = i_a = 0
+            i_end = n - 1
+            e = (0.0, 0.0, 0.0)
+            u_e = u
+            v_e = v
+            fs_e = fs
+            for i in range(n - 1):
+                u_old = u
+                fs_old = fs
+                u, v, a, fs, u_prev, state_j = _step(scheme, sc_j, kind, params_j, state_j, f[i], f[i + 1], dt, m,
+                                                     c_j, u, v, a, fs, u_prev)
+                iv = i + 1 - lag
+                u_iv = u_old if lag else u
+                fs_iv = fs_old if lag else fs
+                if abs(u) > top_u:
+                    top_u = abs(u)
+                    i_u = i + 1
+                if full_output:
+                    a_abs = -(c_j * v + fs_iv) / m
+                    if abs(v) > top_v:
+                        top_v = abs(v)
+                        i_v = iv
+                    if abs(a_abs) > top_a:
+                        top_a = abs(a_abs)
+                        i_a = iv
+                if record:
+                    hist[0, j, i + 1] = u
+                    hist[1, j, iv] = v
+                    hist[2, j, iv] = a
+                    hist[3, j, i + 1] = fs
+                if energy:
+                    e = _energy_step(e, f[max(iv - 1, 0)], f[iv], c_j, u_e, v_e, fs_e, u_iv, v, fs_iv)
+                    u_e = u_iv
+                    v_e = v
+                    fs_e = fs_iv
+                    if record:
+                        hist[4, j, iv] = e[0]
+                        hist[5, j, iv] = e[1]
+                        hist[6, j, iv] = e[2]
+                # Stop once the free vibration after the record can neither
+                # leave the elastic range nor exceed the peak
+                if settle_uy[j] > 0 and iv >= i_free and abs(u_iv - fs_iv / k0) + settle_uy[j] <= top_u and \
+                        settled(fs_iv / k0, v, m, k0, settle_uy[j]):
+                    u = u_iv
+                    fs = fs_iv
+                    i_end = iv
+                    break
+            if lag and i_end == n - 1:
+                # Velocity and acceleration at the last step
+                _, v, a, _, _, _ = _step(scheme, sc_j, kind, params_j, state_j, f[n - 1], f[n - 1], dt, m, c_j,
+                                         u, v, a, fs, u_prev)
+                if record:
+                    hist[1, j, n - 1] = v
+                    hist[2, j, n - 1] = a
+                if energy:
+                    e = _energy_step(e, f[n - 2], f[n - 1], c_j, u_e, v_e, fs_e, u, v, fs)
+                    if record:
+                        hist[4, j, n - 1] = e[0]
+                        hist[5, j, n - 1] = e[1]
+                        hist[6, j, n - 1] = e[2]
+            peaks[0, j] = top_u
+            peaks[1, j] = top_v
+            peaks[2, j] = top_a
+            index[0, j] = i_u
+            index[1, j] = i_v
+            index[2, j] = i_a
+            final[0, j] = u
+            final[1, j] = v
+            final[2, j] = fs
+            final[3, j] = e[0]
+            final[4, j] = e[1]
+            final[5, j] = e[2]
+            i_stop[j] = i_end
+
+    return loop
+
+
+def _integrate_vectorized(scheme, sc, kind, params, state, f, dt, m, c, hist, peaks, index, final, i_stop,
+                          i_free, settle_uy, full_output, energy):
+    """
+    Vectorized counterpart of _integrate_loop: the same _step advances all
+    oscillators together. Settled oscillators are dropped from the state
+    vectors, checking every _SETTLE_CHECK steps.
+    """
+    n = len(f)
+    lag = 1 if scheme == CENTRAL_DIFFERENCE else 0
+    record = hist.shape[2] > 0
+    check = np.any(settle_uy > 0)
+    live = np.arange(len(c))
+    top = np.zeros((3, len(c)))
+    idx = np.zeros((3, len(c)))
+    i_stop[:] = n - 1
+
+    u = np.zeros(len(c))
+    v = np.zeros(len(c))
+    state = tuple(state)
+    fs, _ = trial_force(kind, params, state, u)
+    state = commit_state(kind, params, state, u, fs)
+    a = (f[0] - c * v - fs) / m
+    u_prev = u - dt * v + 0.5 * dt**2 * a
+    if record:
+        hist[:4, :, 0] = u, v, a, fs
+    e = (np.zeros(len(c)),) * 3
+    u_e, v_e, fs_e = u, v, fs
+
+    for i in range(n - 1):
+        u_old = u
+        fs_old = fs
+        u, v, a, fs, u_prev, state = _step(scheme, sc, kind, params, state, f[i], f[i + 1], dt, m, c, u, v, a, fs,
+                                           u_prev)
+        iv = i + 1 - lag
+        u_iv = u_old if lag else u
+        fs_iv = fs_old if lag else fs
+        if full_output:
+            track_peaks(top[:1], idx[:1], i + 1, u)
+            track_peaks(top[1:], idx[1:], iv, v, -(c * v + fs_iv) / m)
+        else:
+            np.maximum(top[0], np.abs(u), out=top[0])
+        if record:
+            hist[0, live, i + 1] = u
+            hist[1, live, iv] = v
+            hist[2, live, iv] = a
+            hist[3, live, i + 1] = fs
+        if energy:
+            e = _energy_step(e, f[max(iv - 1, 0)], f[iv], c, u_e, v_e, fs_e, u_iv, v, fs_iv)
+            u_e, v_e, fs_e = u_iv, v, fs_iv
+            if record:
+                hist[4:, live, iv] = e
+        if check and iv >= i_free and (iv - i_free) % _SETTLE_CHECK == 0:
+            k0 = params[0]
+            x = fs_iv / k0
+            done = (settle_uy > 0) & (np.abs(u_iv - x) + settle_uy <= top[0]) & settled(x, v, m, k0, settle_uy)
+            if np.any(done):
+                final[:, live[done]] = (u_iv[done], v[done], fs_iv[done]) + tuple(x[done] for x in e)
+                peaks[:, live[done]] = top[:, done]
+                index[:, live[done]] = idx[:, done]
+                i_stop[live[done]] = iv
+                keep = ~done
+                live, sc, params, c, settle_uy = live[keep], sc[:, keep], params[:, keep], c[keep], settle_uy[keep]
+                state = tuple(x[keep] for x in state)
+                e = tuple(x[keep] for x in e)
+                u_e, v_e, fs_e = u_e[keep], v_e[keep], fs_e[keep]
+                u, v, a, fs, u_prev, top, idx = u[keep], v[keep], a[keep], fs[keep], u_prev[keep], \
+                    top[:, keep], idx[:, keep]
+                if len(live) == 0:
+                    return
+
+    if lag:
+        # Velocity and acceleration at the last step
+        _, v, a, _, _, _ = _step(scheme, sc, kind, params, state, f[n - 1], f[n - 1], dt, m, c, u, v, a, fs, u_prev)
+        if record:
+            hist[1, live, n - 1] = v
+            hist[2, live, n - 1] = a
+        if energy:
+            e = _energy_step(e, f[n - 2], f[n - 1], c, u_e, v_e, fs_e, u, v, fs)
+            if record:
+                hist[4:, live, n - 1] = e
+    final[:, live] = (u, v, fs) + e
+    peaks[:, live] = top
+    index[:, live] = idx
+
+
+def integrate(scheme, model, m, c, f, dt, history=False, full_output=True, i_free=None, settle_uy=None,
+              energy=False):
+    """
+    Advances a batch of SDOF oscillators m ü + c u̇ + fs(u) = f, starting at
+    rest, through one force history.
+
+    Every linear and nonlinear time-history and spectrum solver runs through
+    this function: the scheme and the restoring-force model are independent,
+    so one compiled kernel (or, with the Python backend, one vectorized pass
+    over the whole batch) serves every combination.
+
+    Parameters:
+    - scheme: CentralDifference(), Newmark(gamma, beta), KRAlpha(rho) or PiecewiseExact()
+    - model: Restoring-force model with one set of parameters per oscillator
+      (solver.restoring_force)
+    - m: Mass (kg)
+    - c: Damping coefficient of every oscillator (Ns/m)
+    - f: Force history (N)
+    - dt: Time step (s)
+    - history: Also return the time histories of every oscillator
+    - full_output: Also track the peaks of the relative velocity and of the
+      absolute acceleration -(c u̇ + fs) / m
+    - i_free: Step from which the force stays zero (see
+      solver.free_vibration.excitation_end)
+    - settle_uy: Per oscillator, stop after i_free once the elastic
+      amplitude about the current offset u - fs / k is below settle_uy
+      (smaller than the elastic range) and can no longer reach a new peak
+      (see solver.free_vibration.settled); 0 or None steps through the whole
+      history
+    - energy: Also accumulate the input energy ∫ f du, the damping energy
+      ∫ c u̇ du and the strain energy ∫ fs du as running sums in the same
+      loop (see solver.energy)
+
+    Returns:
+    - peaks: Array of shape (3, n_oscillators) with the peaks of |u|, |v| and |a_abs|
+    - index: Steps at which the peaks occur
+    - final: Array of shape (6, n_oscillators) with u, v, fs and, with
+      energy, the input, damping and strain energy at the last step taken
+    - i_stop: Last step taken by every oscillator
+    - hist: With history, array of shape (4, n_oscillators, n) with u, v,
+      a = ü and fs, and with energy 3 more rows with the input, damping and
+      strain energy (after i_stop left as zeros); otherwise None
+    """
+    f = np.asarray(f, dtype=float)
+    m = float(m)
+    dt = float(dt)
+    n_osc = len(model)
+    c = np.broadcast_to(np.asarray(c, dtype=float), (n_osc,)).copy()
+    if scheme.code == PIECEWISE_EXACT and model.kind != LINEAR:
+        raise ValueError("Piecewise-exact integration needs a linear elastic model")
+
+    sc = np.zeros((8, n_osc))
+    constants = scheme.constants(m, model.stiffness, c, dt)
+    sc[:len(constants)] = constants
+    params = np.ascontiguousarray(model.params)
+    state = model.initial_state()
+    hist = np.zeros((7 if energy else 4, n_osc, len(f) if history else 0))
+    peaks = np.zeros((3, n_osc))
+    index = np.zeros((3, n_osc))
+    final = np.zeros((6, n_osc))
+    i_stop = np.zeros(n_osc, dtype=np.int64)
+    if settle_uy is None or i_free is None:
+        i_free = len(f)
+        settle_uy = np.zeros(n_osc)
+    settle_uy = np.broadcast_to(np.asarray(settle_uy, dtype=float), (n_osc,)).copy()
+
+    if active_backend() == "numba" or n_osc == 1:
+        _integrate_loop(model.kind)(scheme.code, sc, params, state, f, dt, m, c, hist, peaks, index, final, i_stop,
+                                    int(i_free), settle_uy, full_output, energy)
+    else:
+        _integrate_vectorized(scheme.code, sc, model.kind, params, state, f, dt, m, c, hist, peaks, index, final,
+                              i_stop, int(i_free), settle_uy, full_output, energy)
+
+    return peaks, index, final, i_stop, hist if history else None
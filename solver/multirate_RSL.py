@@ -0,0 +1,189 @@
+from functools import partial
+from inspect import signature
+
+import numpy as np
+from scipy.signal import resample_poly
+
+from solver.central_difference_RSL import cd_response_spectrum_solver
+from solver.frequency_domain_RSL import frequency_domain_response_spectrum_solver
+from solver.Interpolation_Excitation_RSL import interpolation_response_spectrum_solver
+from solver.newmark_method_RSL import newmark_response_spectrum_solver
+from solver.KR_alpha_RSL import kr_alpha_response_spectrum_solver
+from solver.state_space import central_difference_state_space, newmark_state_space, kr_alpha_state_space
+
+# Undamped recurrence (m = k = 1) of every time-stepping scheme over the
+# step ωn dt, from the scheme parameters of its solver
+SCHEME_STATE_SPACE = {
+    newmark_response_spectrum_solver: lambda Ω, p: newmark_state_space(1.0, 1.0, 0.0, Ω, p["gamma"], p["beta"]),
+    kr_alpha_response_spectrum_solver: lambda Ω, p: kr_alpha_state_space(1.0, 1.0, 0.0, Ω, p["rho"]),
+    cd_response_spectrum_solver: lambda Ω, p: central_difference_state_space(1.0, 1.0, 0.0, Ω),
+}
+# Solvers that are exact for the sampled input: only limited by how well the
+# samples resolve the peak
+EXACT_SOLVERS = (interpolation_response_spectrum_solver, frequency_domain_response_spectrum_solver)
+# The period error accumulates over the cycles of the record, so the step
+# bound keeps it this many times below the tolerance on the peaks
+PHASE_SAFETY = 10
+
+
+def _unwrap(solver, args):
+    """
+    Base solver behind functools.partial wrappers, with all its arguments
+    other than ζ, accel and time (defaults filled in).
+    """
+    head, keywords = (), {}
+    while isinstance(solver, partial):
+        head = solver.args + head
+        keywords = {**solver.keywords, **keywords}
+        solver = solver.func
+    if solver not in SCHEME_STATE_SPACE and solver not in EXACT_SOLVERS:
+        raise ValueError(f"Unknown response spectrum solver for multirate stepping: {solver!r}")
+    # The wrapped solver is called as solver(*head, ζ, accel, time, *args)
+    bound = signature(solver).bind_partial(*head, None, None, None, *args, **keywords)
+    bound.apply_defaults()
+    return solver, bound.arguments
+
+
+def _spectral_radius(solver, params, Ω):
+    return np.max(np.abs(np.linalg.eigvals(SCHEME_STATE_SPACE[solver](Ω, params)[0])))
+
+
+def period_error(solver, *args, Ω=1e-2):
+    """
+    Leading period-error constant C of the scheme of a solver,
+    |ΔT / T| ≈ C (ωn dt)², from the phase of the principal eigenvalue of its
+    undamped recurrence (solver.state_space) at a small step ωn dt = Ω.
+
+    Parameters:
+    - solver: *_response_spectrum_solver, or a functools.partial of one
+    - *args: Extra solver arguments (e.g. gamma, beta or rho)
+
+    Returns:
+    - C (0 for the solvers that are exact for the sampled input)
+    """
+    solver, params = _unwrap(solver, args)
+    return 0.0 if solver in EXACT_SOLVERS else _period_error(solver, params, Ω)
+
+
+def _period_error(solver, params, Ω=1e-2):
+    lam = np.linalg.eigvals(SCHEME_STATE_SPACE[solver](Ω, params)[0])
+    # The principal roots are the complex pair; the spurious roots are real
+    Ω_num = abs(np.angle(lam[np.argmax(np.abs(lam.imag))]))
+    return abs(Ω / Ω_num - 1) / Ω**2
+
+
+def multirate_levels(solver, Tn_values, dt, *args, tol=1e-3, max_upsample=16):
+    """
+    Chooses the time step of every oscillator as dt * 2**level.
+
+    The step is the largest power-of-two multiple (or fraction) of dt that
+    keeps the relative error of the spectral peaks near tol: the period error
+    of the scheme (period_error) stays below tol / PHASE_SAFETY, a sampled
+    sinusoid misses its peak by at most (π dt / Tn)² / 2 <= tol, and, for the
+    conditionally stable schemes (Central Difference Method, Newmark with
+    2 beta < gamma), the step stays inside the stability limit with a 10%
+    margin.
+
+    Parameters:
+    - solver: *_response_spectrum_solver the levels are chosen for, or a
+      functools.partial of one
+    - Tn_values: Array of natural periods
+    - dt: Time step of the record (s)
+    - *args: Extra solver arguments (e.g. gamma, beta or rho)
+    - tol: Relative accuracy of the spectral ordinates
+    - max_upsample: Largest refinement of the record step
+
+    Returns:
+    - levels: Integer array, negative for refined and positive for decimated steps
+    """
+    solver, params = _unwrap(solver, args)
+    Tn_values = np.asarray(Tn_values, dtype=float)
+    ωn = 2 * np.pi / Tn_values
+    dt_max = Tn_values * np.sqrt(2 * tol) / np.pi
+    C = 0.0 if solver in EXACT_SOLVERS else _period_error(solver, params)
+    if C > 0:
+        dt_max = np.minimum(dt_max, np.sqrt(tol / (PHASE_SAFETY * C)) / ωn)
+    levels = np.floor(np.log2(dt_max / dt)).astype(int)
+    levels = np.maximum(levels, -int(np.log2(max_upsample)))
+
+    if solver not in EXACT_SOLVERS:
+        # Refine the steps that are unstable with a 10% margin
+        for i in range(len(levels)):
+            while (levels[i] > -int(np.log2(max_upsample)) and
+                   _spectral_radius(solver, params, 1.1 * ωn[i] * dt * 2.0**levels[i]) > 1 + 1e-9):
+                levels[i] -= 1
+    return levels
+
+
+def multirate_response_spectrum(solver, ζ, accel, time, *args, Tn_values=None, full_output=False,
+                                tol=1e-3, max_upsample=16):
+    """
+    Computes a response spectrum with a per-period time step.
+
+    Periods are grouped into bands that share a step dt * 2**level (see
+    multirate_levels). Long-period bands run on anti-alias filtered,
+    decimated copies of the record (polyphase FIR, one halving per level).
+    Short-period bands run on linearly refined copies, so the Central
+    Difference Method stays stable down to the shortest periods. Each band is
+    one call of the underlying solver.
+
+    Parameters:
+    - solver: Any *_response_spectrum_solver accepting a Tn_values keyword, or
+      a functools.partial of one (see multirate_levels)
+    - ζ: Damping ratio, scalar or array of ratios
+    - accel: Ground acceleration array (in m/s²)
+    - time: Time array (in seconds), uniformly spaced
+    - *args: Extra solver arguments (e.g. gamma, beta or rho)
+    - Tn_values: Natural periods to evaluate (default 0.01 to 3s in 0.01s steps)
+    - full_output: Return the structured spectrum (see the solvers)
+    - tol, max_upsample: Step selection (see multirate_levels)
+
+    Returns:
+    - Tn_values: Array of natural periods
+    - max_disp: Same result as the underlying solver
+    """
+    time = np.asarray(time, dtype=float)
+    accel = np.asarray(accel, dtype=float)
+    dt = time[1] - time[0]
+
+    if Tn_values is None:
+        Tn_values = np.arange(0.01, 3.0, 0.01)  # periods from 0.01 to 3s
+    Tn_values = np.atleast_1d(np.asarray(Tn_values, dtype=float))
+    levels = multirate_levels(solver, Tn_values, dt, *args, tol=tol, max_upsample=max_upsample)
+    # Decimating below a few samples would leave nothing to integrate
+    levels = np.minimum(levels, max(int(np.log2(len(time) / 8)), 0))
+
+    result = None
+    record = accel
+    decimated = 0  # halvings applied to record so far
+    for level in range(levels.min(), levels.max() + 1):
+        if level <= 0:
+            time_level = time[0] + np.arange((len(time) - 1) * 2**-level + 1) * dt * 2.0**level
+            record_level = np.interp(time_level, time, accel)
+        else:
+            # Decimate cumulatively from the original record, also when the
+            # first band is above level 1
+            while decimated < level:
+                record = resample_poly(record, 1, 2)
+                decimated += 1
+            record_level = record
+            time_level = time[0] + np.arange(len(record)) * dt * 2**level
+
+        band = np.nonzero(levels == level)[0]
+        if len(band) == 0:
+            continue
+        _, part = solver(ζ, record_level, time_level, *args, Tn_values=Tn_values[band],
+                         full_output=full_output)
+
+        if result is None:
+            if isinstance(part, dict):
+                result = {key: np.full(part[key].shape[:-1] + (len(Tn_values),), np.nan) for key in part}
+            else:
+                result = np.full(part.shape[:-1] + (len(Tn_values),), np.nan)
+        if isinstance(part, dict):
+            for key in part:
+                result[key][..., band] = part[key]
+        else:
+            result[..., band] = part
+
+    return Tn_values, result
@@ -1,58 +1,60 @@
 import numpy as np
 
-def newmark_response_spectrum_solver(ζ, accel, time, gamma, beta):
+from solver.damping import damping_grid
+from solver.integrator import Newmark, integrate
+from solver.restoring_force import LinearElastic
+from solver.spectrum import track_free_vibration, spectrum_result
+
+
+def newmark_response_spectrum_solver(ζ, accel, time, gamma, beta, Tn_values=None, full_output=False,
+                                     free_vibration=True):
     """
     Computes the Displacement Response Spectrum using Newmark-beta Method.
 
+    All oscillators of the period grid are advanced together by
+    solver.integrator, so the record is walked only once.
+
     Parameters:
-    - ζ: Damping ratio (e.g. 0.02 for 2%)
+    - ζ: Damping ratio (e.g. 0.02 for 2%), scalar or array of ratios
     - accel: Ground acceleration array (in m/s²)
     - time: Time array (in seconds)
     - gamma, beta: Newmark integration parameters (default average acceleration method)
+    - Tn_values: Natural periods to evaluate (default 0.01 to 3s in 0.01s steps)
+    - full_output: Also track the peaks of relative velocity and absolute
+      acceleration, and the time of every peak, in the same pass
+    - free_vibration: Also take the peaks of the free vibration after the
+      record ends, in closed form from the final state
 
     Returns:
     - Tn_values: Array of natural periods
-    - max_disp: Array of max displacements for each Tn (in meters)
+    - max_disp: Array of max displacements for each Tn (in meters), of shape
+      (n_damping, n_periods) when ζ is an array
+    - spectrum (instead of max_disp with full_output): Dictionary with the
+      SD, SV, SA, PSV and PSA spectra and the peak times t_SD, t_SV, t_SA
     """
 
-    time = np.array(time)
-    accel = np.array(accel)
+    time = np.array(time, dtype=float)
+    accel = np.array(accel, dtype=float)
     dt = time[1] - time[0]
     m = 1.0  # Mass in kg
     f = -m * accel  # base excitation force
     n = len(time)
 
-    Tn_values = np.arange(0.01, 3.0, 0.01)  # periods from 0.01 to 3s
-    max_disp = np.zeros(len(Tn_values))
-
-    for idx, Tn in enumerate(Tn_values):
-        ωn = 2 * np.pi / Tn
-        k = ωn**2 * m
-        c = 2 * ζ * np.sqrt(k * m)
-
-        u = np.zeros(n)
-        v = np.zeros(n)
-        a = np.zeros(n)
-
-        # Initial conditions
-        u[0] = 0
-        v[0] = 0
-        a[0] = (f[0] - c * v[0] - k * u[0]) / m
+    if Tn_values is None:
+        Tn_values = np.arange(0.01, 3.0, 0.01)  # periods from 0.01 to 3s
+    Tn_values = np.atleast_1d(np.asarray(Tn_values, dtype=float))
+    ζ, Tn_grid, shape = damping_grid(ζ, Tn_values)
 
-        # Precompute constants
-        a1 = m / (beta * dt**2) + c * gamma / (beta * dt)
-        a2 = m / (beta * dt) + c * (gamma / beta - 1)
-        a3 = m * (1 / (2 * beta) - 1) + c * dt * (gamma / (2 * beta) - 1)
-        k_eff = k + a1
+    ωn = 2 * np.pi / Tn_grid
+    k = ωn**2 * m
+    c = 2 * ζ * np.sqrt(k * m)
 
-        for i in range(n - 1):
-            rhs = f[i+1] + a1 * u[i] + a2 * v[i] + a3 * a[i]
-            u[i+1] = rhs / k_eff
-            v[i+1] = gamma / (beta * dt) * (u[i+1] - u[i]) + \
-                     (1 - gamma / beta) * v[i] + dt * (1 - gamma / (2 * beta)) * a[i]
-            a[i+1] = (u[i+1] - u[i]) / (beta * dt**2) - \
-                     v[i] / (beta * dt) - (1 / (2 * beta) - 1) * a[i]
+    peaks, index, state, _, _ = integrate(Newmark(gamma, beta), LinearElastic(k), m, c, f, dt,
+                                          full_output=full_output)
 
-        max_disp[idx] = np.max(np.abs(u))
+    if free_vibration:
+        track_free_vibration(peaks, index, state[0], state[1], ζ, ωn, n - 1)
 
-    return Tn_values, max_disp
+    if full_output:
+        return Tn_values, spectrum_result(Tn_grid, peaks, index, dt, time[0], shape)
+    return Tn_values, peaks[0].reshape(shape)
@@ -1,6 +1,12 @@
 import numpy as np
 
-def newmark_solver(m, ζ, Tn, accel, time, gamma, beta):
+from solver.backend import active_backend
+from solver.integrator import Newmark, integrate
+from solver.restoring_force import LinearElastic
+from solver.state_space import newmark_state_space, filter_response, chunked_filter_response
+
+
+def newmark_solver(m, ζ, Tn, accel, time, gamma, beta, mode=None, n_workers=None):
     """
     Newmark-beta Method for SDOF system response to base excitation.
 
@@ -12,6 +18,12 @@ def newmark_solver(m, ζ, Tn, accel, time, gamma, beta):
     - time: Time array (same length as accel)
     - gamma: Newmark parameter 
     - beta: Newmark parameter 
+    - mode: "filter" evaluates the recurrence as an IIR filter (no Python
+      loop), "loop" steps through time explicitly (compiled when the Numba
+      backend is active), "chunked" splits the record into chunks solved
+      concurrently and joined by superposition (for very long records);
+      default is "loop" with Numba and "filter" without
+    - n_workers: Number of chunks / threads for mode="chunked" (default os.cpu_count())
 
     Returns:
     - u: Displacement (m)
@@ -19,8 +31,8 @@ def newmark_solver(m, ζ, Tn, accel, time, gamma, beta):
     - a: Acceleration (m/s^2)
     - t: Time array (s)
     """
-    accel = np.array(accel)
-    time = np.array(time)
+    accel = np.array(accel, dtype=float)
+    time = np.array(time, dtype=float)
     dt = time[1] - time[0]
     n = len(time)
 
@@ -37,16 +49,22 @@ def newmark_solver(m, ζ, Tn, accel, time, gamma, beta):
     v[0] = 0
     a[0] = (f[0] - c * v[0] - k * u[0]) / m
 
-    # Newmark constants
-    a1 = m / (beta * dt**2) + c * gamma / (beta * dt)
-    a2 = m / (beta * dt) + c * (gamma / beta - 1)
-    a3 = m / (2 * beta) - m + dt * c * (gamma / (2 * beta) - 1)
-    k_hat = k + a1
-
-    for i in range(n - 1):
-        rhs = f[i+1] + a1 * u[i] + a2 * v[i] + a3 * a[i]
-        u[i+1] = rhs / k_hat
-        v[i+1] = gamma / (beta * dt) * (u[i+1] - u[i]) + (1 - gamma / beta) * v[i] + dt * (1 - gamma / (2 * beta)) * a[i]
-        a[i+1] = (u[i+1] - u[i]) / (beta * dt**2) - v[i] / (beta * dt) - (1 / (2 * beta) - 1) * a[i]
+    if mode is None:
+        mode = "loop" if active_backend() == "numba" else "filter"
+
+    if mode == "filter":
+        A, B0, B1 = newmark_state_space(m, k, c, dt, gamma, beta)
+        x = filter_response(A, B0, B1, f, [u[0], v[0], a[0]])
+        if x is not None:
+            return x[:, 0], x[:, 1], x[:, 2], time
+    elif mode == "chunked":
+        A, B0, B1 = newmark_state_space(m, k, c, dt, gamma, beta)
+        x = chunked_filter_response(A, B0, B1, f, [u[0], v[0], a[0]], n_chunks=n_workers)
+        if x is not None:
+            return x[:, 0], x[:, 1], x[:, 2], time
+    elif mode != "loop":
+        raise ValueError(f"Unknown mode: {mode}")
+
+    u, v, a, _ = integrate(Newmark(gamma, beta), LinearElastic(k), m, c, f, dt, history=True)[4][:, 0]
 
     return u, v, a, time
@@ -0,0 +1,132 @@
+import numpy as np
+
+from solver.parallel_RSL import parallel_response_spectrum
+
+
+def log_period_grid(Tn_min=0.01, Tn_max=3.0, n_points=25):
+    """
+    Log-spaced grid of natural periods.
+
+    Parameters:
+    - Tn_min, Tn_max: Period range (s)
+    - n_points: Number of periods
+
+    Returns:
+    - Tn_values: Array of natural periods
+    """
+    return np.geomspace(Tn_min, Tn_max, n_points)
+
+
+def refinement_flags(Tn_values, values, tol, min_step=1e-3):
+    """
+    Marks the period intervals of a spectrum that need a midpoint.
+
+    An interval is refined when the curvature of the spectrum (second divided
+    difference in log T) predicts a linear-interpolation error above
+    tol * max(values) at its midpoint, or when it borders a local peak or
+    trough whose height relative to its neighbours is not yet resolved to
+    that tolerance. Intervals narrower than min_step in log T are kept.
+
+    Parameters:
+    - Tn_values: Sorted natural periods
+    - values: Spectral ordinates, shape (n_periods,) or (n_damping, n_periods)
+    - tol: Relative tolerance
+    - min_step: Smallest interval, as a relative period step
+
+    Returns:
+    - flags: Boolean array with one entry per interval
+    """
+    x = np.log(Tn_values)
+    y = np.nan_to_num(np.atleast_2d(values))
+    threshold = tol * np.max(np.abs(y), axis=1, keepdims=True)
+    h = np.diff(x)
+    flags = np.zeros(len(h), dtype=bool)
+    if len(h) < 2:
+        return h > min_step
+
+    slope = np.diff(y, axis=1) / h
+    d2 = np.abs(np.diff(slope, axis=1)) / (x[2:] - x[:-2])
+    # A quadratic through three points misses linear interpolation by
+    # d2 * h² / 4 at the midpoint of an interval of width h; spectra are
+    # rougher than that model, so the estimate is taken four times larger
+    flags[:-1] |= np.any(d2 * h[:-1] ** 2 > threshold, axis=0)
+    flags[1:] |= np.any(d2 * h[1:] ** 2 > threshold, axis=0)
+
+    mid = y[:, 1:-1]
+    extremum = ((mid >= y[:, :-2]) & (mid >= y[:, 2:])) | ((mid <= y[:, :-2]) & (mid <= y[:, 2:]))
+    unresolved = np.maximum(np.abs(mid - y[:, :-2]), np.abs(mid - y[:, 2:])) > threshold
+    peak = np.any(extremum & unresolved, axis=0)
+    flags[:-1] |= peak
+    flags[1:] |= peak
+
+    return flags & (h > min_step)
+
+
+def _merge(Tn_values, result, Tn_new, new):
+    """
+    Inserts newly evaluated periods (and their spectral ordinates) into the grid.
+    """
+    Tn_values = np.concatenate((Tn_values, Tn_new))
+    order = np.argsort(Tn_values)
+    if isinstance(result, dict):
+        result = {key: np.concatenate((result[key], new[key]), axis=-1)[..., order] for key in result}
+    else:
+        result = np.concatenate((result, new), axis=-1)[..., order]
+    return Tn_values[order], result
+
+
+def adaptive_response_spectrum(solver, ζ, accel, time, *args, Tn_min=0.01, Tn_max=3.0, n_initial=40,
+                               tol=0.005, min_step=1e-3, max_passes=12, n_workers=1, callback=None, **kwargs):
+    """
+    Computes a response spectrum on an adaptively refined period grid.
+
+    The spectrum is first evaluated on a coarse log-spaced grid. Each pass
+    then inserts the log-midpoint of every interval flagged by
+    refinement_flags and evaluates all new periods with one solver call,
+    until no interval is flagged. Periods end up concentrated around the
+    sharp short-period peaks instead of the smooth long-period tail.
+
+    Every pass is a complete spectrum on a coarser grid, so a callback can
+    draw it while the next pass runs; an exception raised by the callback
+    stops the remaining passes.
+
+    Parameters:
+    - solver: Any *_response_spectrum_solver accepting a Tn_values keyword
+    - ζ: Damping ratio, scalar or array of ratios
+    - accel: Ground acceleration array (in m/s²)
+    - time: Time array (in seconds)
+    - *args: Extra solver arguments (e.g. gamma, beta or rho)
+    - Tn_min, Tn_max: Period range (s)
+    - n_initial: Number of periods of the coarse grid
+    - tol: Refinement tolerance, relative to the spectral peak
+    - min_step: Smallest period interval, as a relative step
+    - max_passes: Maximum number of refinement passes
+    - n_workers: Worker processes per solver call (see parallel_response_spectrum)
+    - callback: Optional function called as callback(Tn_values, max_disp, n_pass)
+      after the coarse grid (n_pass = 0) and after every refinement pass
+    - **kwargs: Extra solver keywords (e.g. full_output=True); with
+      full_output the grid is refined on SD
+
+    Returns:
+    - Tn_values: Array of natural periods (sorted, non-uniform)
+    - max_disp: Solver result on that grid (array or spectrum dictionary)
+    """
+    Tn_values = log_period_grid(Tn_min, Tn_max, n_initial)
+    _, result = parallel_response_spectrum(solver, ζ, accel, time, *args, Tn_values=Tn_values,
+                                           n_workers=n_workers, **kwargs)
+    if callback is not None:
+        callback(Tn_values, result, 0)
+
+    for n_pass in range(1, max_passes + 1):
+        values = result["SD"] if isinstance(result, dict) else result
+        flags = refinement_flags(Tn_values, values, tol, min_step)
+        if not np.any(flags):
+            break
+        Tn_new = np.sqrt(Tn_values[:-1][flags] * Tn_values[1:][flags])
+        _, new = parallel_response_spectrum(solver, ζ, accel, time, *args, Tn_values=Tn_new,
+                                            n_workers=n_workers, **kwargs)
+        Tn_values, result = _merge(Tn_values, result, Tn_new, new)
+        if callback is not None:
+            callback(Tn_values, result, n_pass)
+
+    return Tn_values, result
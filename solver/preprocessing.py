@@ -0,0 +1,103 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+# Resampled records kept for reuse, keyed by (record digest, dt, pad)
+_cache = OrderedDict()
+_CACHE_SIZE = 8
+
+
+def record_digest(accel, time):
+    """
+    Content hash of a ground motion record, used as the cache key of the
+    results computed from it.
+    """
+    time = np.ascontiguousarray(time, dtype=float)
+    accel = np.ascontiguousarray(accel, dtype=float)
+    digest = hashlib.blake2b(time.tobytes(), digest_size=16)
+    digest.update(accel.tobytes())
+    return digest.hexdigest()
+
+
+def _record_key(accel, time, dt, pad):
+    return record_digest(accel, time), float(dt), float(pad)
+
+
+def resample_record(accel, time, dt=0.001, pad=0.0):
+    """
+    Resamples a ground motion record to a uniform time step and appends a
+    free-vibration tail of zero acceleration.
+
+    This is the single preprocessing stage of the solvers: they integrate the
+    record they are given at its own step. Results are memoized per (record,
+    dt, pad), so the reruns of the app and repeated analyses of the same
+    record do not interpolate again. The returned arrays are shared between
+    callers and therefore read-only.
+
+    Parameters:
+    - accel: Ground acceleration array
+    - time: Time array (in seconds), same length as accel
+    - dt: Time step of the resampled record (s)
+    - pad: Length of the zero tail appended after the record (s)
+
+    Returns:
+    - time: Uniform time array, from time[0] up to the end of the tail
+    - accel: Linearly interpolated acceleration, zero in the tail
+    """
+    time = np.ascontiguousarray(time, dtype=float)
+    accel = np.ascontiguousarray(accel, dtype=float)
+    key = _record_key(accel, time, dt, pad)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    time_new = np.arange(time[0], time[-1], dt)
+    accel_new = np.interp(time_new, time, accel)
+    if pad > 0:
+        time_pad = np.arange(time_new[-1] + dt, time_new[-1] + pad + dt, dt)
+        time_new = np.concatenate((time_new, time_pad))
+        accel_new = np.concatenate((accel_new, np.zeros(len(time_pad))))
+
+    time_new.flags.writeable = False
+    accel_new.flags.writeable = False
+    _cache[key] = (time_new, accel_new)
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return time_new, accel_new
+
+
+def load_record(path):
+    """
+    Reads a ground motion file with two columns, time (s) and acceleration
+    (g), as the files of GM_data/.
+
+    Parameters:
+    - path: Path of the file
+
+    Returns:
+    - time: Time array (in seconds)
+    - accel: Ground acceleration array (in m/s², as loaded by the app)
+    """
+    data = np.loadtxt(path, ndmin=2)
+    return data[:, 0], data[:, 1] * 9.81
+
+
+def load_record_suite(folder="GM_data"):
+    """
+    Reads every ground motion file of a folder (see load_record).
+
+    Parameters:
+    - folder: Folder of .txt or .csv files
+
+    Returns:
+    - Dictionary mapping the file name (without extension) to (time, accel),
+      sorted by name
+    """
+    records = {}
+    for name in sorted(os.listdir(folder)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() in (".txt", ".csv"):
+            records[stem] = load_record(os.path.join(folder, name))
+    return records
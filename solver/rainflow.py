@@ -0,0 +1,207 @@
+import numpy as np
+
+from solver.backend import jit
+
+
+@jit
+def _gate(tp, gate):
+    # Hysteresis filter: reversals smaller than gate are dropped, and the
+    # excursion they interrupted carries on to the next turning point
+    out = np.empty(len(tp))
+    out[0] = tp[0]
+    k = 1
+    for i in range(1, len(tp)):
+        p = tp[i]
+        if k >= 2 and (p - out[k - 1]) * (out[k - 1] - out[k - 2]) > 0:
+            out[k - 1] = p
+        elif abs(p - out[k - 1]) >= gate:
+            out[k] = p
+            k += 1
+    return out[:k]
+
+
+def turning_points(x, gate=0.0):
+    """
+    Reduces a history to its turning points (peaks and valleys), keeping the
+    first and last values. Flat stretches count once, so a constant history
+    is a single point (no cycles).
+
+    Parameters:
+    - x: History (e.g. normalized_u from the EPP solvers)
+    - gate: Smallest reversal kept (0 keeps every reversal)
+
+    Returns:
+    - Turning-point values, in order
+    """
+    x = np.asarray(x, dtype=float)
+    if len(x) < 2:
+        return x.copy()
+    d = np.diff(x)
+    moving = np.flatnonzero(d)
+    if len(moving) == 0:
+        return x[:1]
+    # A reversal starts wherever the direction changes between two
+    # consecutive moving steps; the value there is the peak or valley
+    slope = np.sign(d[moving])
+    reversal = moving[1:][slope[1:] != slope[:-1]]
+    tp = np.concatenate((x[:1], x[reversal], x[-1:]))
+    return _gate(tp, gate) if gate > 0 else tp
+
+
+@jit
+def _rainflow_count(tp, offsets, ranges, means, counts, runs):
+    # Three-point rainflow counting of ASTM E1049 (with its treatment of the
+    # starting point as half cycles) over the turning points of every run;
+    # returns the number of cycles stored
+    stack = np.empty(len(tp))
+    n_out = 0
+    for r in range(len(offsets) - 1):
+        top = 0
+        for i in range(offsets[r], offsets[r + 1]):
+            stack[top] = tp[i]
+            top += 1
+            while top >= 3:
+                X = abs(stack[top - 1] - stack[top - 2])
+                Y = abs(stack[top - 2] - stack[top - 3])
+                if X < Y:
+                    break
+                ranges[n_out] = Y
+                means[n_out] = 0.5 * (stack[top - 2] + stack[top - 3])
+                runs[n_out] = r
+                if top == 3:
+                    # Range containing the start: half cycle, drop the start
+                    counts[n_out] = 0.5
+                    stack[0] = stack[1]
+                    stack[1] = stack[2]
+                    top = 2
+                else:
+                    counts[n_out] = 1.0
+                    stack[top - 3] = stack[top - 1]
+                    top -= 2
+                n_out += 1
+        # The residue counts as half cycles
+        for j in range(top - 1):
+            ranges[n_out] = abs(stack[j + 1] - stack[j])
+            means[n_out] = 0.5 * (stack[j + 1] + stack[j])
+            counts[n_out] = 0.5
+            runs[n_out] = r
+            n_out += 1
+    return n_out
+
+
+def _as_histories(histories):
+    # One history (1D) or many (2D array or list of arrays of any length)
+    if isinstance(histories, np.ndarray) and histories.ndim == 1:
+        return [histories], True
+    if isinstance(histories, np.ndarray):
+        return list(histories), False
+    histories = list(histories)
+    if len(histories) > 0 and np.ndim(histories[0]) == 0:
+        return [np.asarray(histories, dtype=float)], True
+    return histories, False
+
+
+def rainflow(histories, gate=0.0):
+    """
+    Rainflow cycle counting (ASTM E1049) of one or many histories.
+
+    Each history is first reduced to its turning points with vectorized
+    sign-change detection; the cycles are then counted with one compiled
+    stack pass over the turning points of all runs. Plastic excursions of an
+    inelastic run are the cycles of its plastic deformation,
+    normalized_u - normalized_fs for the EPP solvers (in units of uy); a
+    small gate (e.g. 1e-6) drops the round-off reversals of its elastic
+    stretches.
+
+    Parameters:
+    - histories: One history, or many as a 2D array (one row per run) or a
+      list of arrays of any length
+    - gate: Smallest reversal counted (see turning_points)
+
+    Returns:
+    - ranges: Cycle ranges
+    - means: Cycle means
+    - counts: 1 for full cycles, 0.5 for half cycles
+    - runs: Run index of every cycle (all 0 for one history)
+    """
+    histories, _ = _as_histories(histories)
+    tps = [turning_points(x, gate) for x in histories]
+    offsets = np.zeros(len(tps) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(tp) for tp in tps])
+    tp = np.concatenate(tps) if tps else np.zeros(0)
+
+    # At most one cycle per turning point
+    ranges = np.empty(len(tp))
+    means = np.empty(len(tp))
+    counts = np.empty(len(tp))
+    runs = np.empty(len(tp), dtype=np.int64)
+    n_out = _rainflow_count(tp, offsets, ranges, means, counts, runs)
+    return ranges[:n_out], means[:n_out], counts[:n_out], runs[:n_out]
+
+
+def miner_sum(ranges, counts, failure_range, exponent=1.5):
+    """
+    Miner's sum of low-cycle fatigue damage, D = Σ n_i / N_i, with the
+    Coffin-Manson type life N(Δ) = (Δ / failure_range)^-exponent.
+
+    Parameters:
+    - ranges, counts: Cycle ranges and counts (see rainflow)
+    - failure_range: Range failing in a single cycle (e.g. in units of uy)
+    - exponent: Exponent of the life curve (about 1.5 to 2 for plastic
+      deformation ranges)
+
+    Returns:
+    - Damage (failure at 1)
+    """
+    ranges = np.asarray(ranges, dtype=float)
+    return np.sum(np.asarray(counts) * (ranges / failure_range) ** exponent)
+
+
+def rainflow_summary(histories, bins=20, range_max=None, failure_range=None, exponent=1.5, gate=0.0):
+    """
+    Cycle-range histograms and fatigue summaries of one or many histories.
+
+    Parameters:
+    - histories: See rainflow
+    - bins: Number of range bins, from 0 to range_max
+    - range_max: Upper edge of the histogram (None for the largest range)
+    - failure_range, exponent: Life curve of miner_sum (None skips the
+      Miner's sum)
+    - gate: Smallest reversal counted (see turning_points)
+
+    Returns:
+    - Dictionary with the bin edges, the histogram of cycle counts per bin
+      (one row per run for many histories), and per run the number of cycles,
+      the largest range, the sum of the ranges (the cumulative excursion) and
+      the Miner's sum
+    """
+    histories, single = _as_histories(histories)
+    n_runs = len(histories)
+    ranges, _, counts, runs = rainflow(histories, gate)
+    if range_max is None:
+        range_max = ranges.max() if len(ranges) > 0 and ranges.max() > 0 else 1.0
+    edges = np.linspace(0.0, range_max, bins + 1)
+
+    # All runs binned at once; ranges above range_max go to the last bin
+    # (float also when there are no cycles at all, e.g. flat histories)
+    b = np.clip(np.searchsorted(edges, ranges, side="right") - 1, 0, bins - 1)
+    histogram = np.bincount(runs * bins + b, weights=counts, minlength=n_runs * bins).astype(float)
+    histogram = histogram.reshape(n_runs, bins)
+    cycles = np.bincount(runs, weights=counts, minlength=n_runs).astype(float)
+    cumulative = np.bincount(runs, weights=counts * ranges, minlength=n_runs).astype(float)
+    max_range = np.zeros(n_runs)
+    np.maximum.at(max_range, runs, ranges)
+    summary = {
+        "bin_edges": edges,
+        "histogram": histogram,
+        "cycles": cycles,
+        "max_range": max_range,
+        "cumulative_range": cumulative,
+    }
+    if failure_range is not None:
+        damage = counts * (ranges / failure_range) ** exponent
+        summary["miner_sum"] = np.bincount(runs, weights=damage, minlength=n_runs).astype(float)
+
+    if single:
+        summary = {key: (value if key == "bin_edges" else value[0]) for key, value in summary.items()}
+    return summary
@@ -0,0 +1,325 @@
+import numpy as np
+
+from solver.backend import jit, inline_jit, active_backend
+
+# Model kinds understood by the integrator kernels (solver.integrator)
+LINEAR = 0
+EPP = 1
+BILINEAR = 2
+PEAK_ORIENTED = 3
+BOUC_WEN = 4
+
+# Length of the state tuple of every model (unused entries stay zero)
+STATE_SIZE = 5
+
+# The compiled kernels update one oscillator at a time, on scalars, while
+# the vectorized path updates the whole batch, on arrays
+if active_backend() == "numba":
+    @inline_jit
+    def _select(cond, a, b):
+        return a if cond else b
+else:
+    _select = np.where
+
+
+class RestoringForceModel:
+    """
+    Restoring force fs(u) of a batch of oscillators, for solver.integrator.
+
+    A model is described by its kind and a parameter array of shape
+    (n_params, n_oscillators) whose first row is the initial stiffness k, so
+    the compiled kernels dispatch on the kind and read one column per
+    oscillator. The history of the oscillators is a tuple of STATE_SIZE
+    entries: scalars for one oscillator in a compiled loop, or flat arrays
+    updated for the whole batch at once.
+    """
+    kind = None
+
+    def __init__(self, *params):
+        params = [np.atleast_1d(np.asarray(p, dtype=float)) for p in params]
+        self.params = np.array(np.broadcast_arrays(*params))
+
+    def __len__(self):
+        return self.params.shape[1]
+
+    @property
+    def stiffness(self):
+        """Initial stiffness of every oscillator (N/m)."""
+        return self.params[0]
+
+    def initial_state(self):
+        """State of the oscillators at rest (u = 0, fs = 0), one row per entry."""
+        return np.zeros((STATE_SIZE, len(self)))
+
+
+class LinearElastic(RestoringForceModel):
+    """
+    Linear elastic spring, fs = k u.
+
+    Parameters:
+    - k: Stiffness (N/m), scalar or one per oscillator
+    """
+    kind = LINEAR
+
+    def __init__(self, k):
+        super().__init__(k)
+
+
+class ElasticPerfectlyPlastic(RestoringForceModel):
+    """
+    Elastic-perfectly plastic spring: stiffness k up to |fs| = Fy, zero
+    tangent stiffness while yielding, elastic unloading. The state holds the
+    last committed displacement and force.
+
+    Parameters:
+    - k: Elastic stiffness (N/m), scalar or one per oscillator
+    - Fy: Yield strength (N), scalar or one per oscillator
+    """
+    kind = EPP
+
+    def __init__(self, k, Fy):
+        super().__init__(k, Fy)
+
+
+class Bilinear(RestoringForceModel):
+    """
+    Bilinear spring with kinematic hardening: stiffness k inside an elastic
+    range of width 2 (1 - alpha) Fy that translates along the post-yield
+    lines fs = alpha k u ± (1 - alpha) Fy. A negative alpha gives a softening
+    post-yield branch (see BilinearPDelta).
+
+    Parameters:
+    - k: Elastic stiffness (N/m), scalar or one per oscillator
+    - Fy: Yield strength (N), scalar or one per oscillator
+    - alpha: Post-yield stiffness ratio (below 1)
+    """
+    kind = BILINEAR
+
+    def __init__(self, k, Fy, alpha=0.05):
+        super().__init__(k, Fy, alpha)
+
+
+class BilinearPDelta(Bilinear):
+    """
+    Bilinear spring under gravity load: the P-Δ effect subtracts the
+    geometric stiffness theta k from both branches, so the elastic stiffness
+    becomes (1 - theta) k and the post-yield stiffness (alpha - theta) k,
+    negative once theta > alpha. The yield displacement Fy / k is unchanged.
+
+    Parameters:
+    - k: Elastic stiffness without gravity load (N/m)
+    - Fy: Yield strength without gravity load (N)
+    - alpha: Post-yield stiffness ratio of the spring itself
+    - theta: Stability coefficient P / (k h) (below 1)
+    """
+
+    def __init__(self, k, Fy, alpha=0.0, theta=0.05):
+        theta = np.asarray(theta, dtype=float)
+        super().__init__((1 - theta) * np.asarray(k, dtype=float), (1 - theta) * np.asarray(Fy, dtype=float),
+                         (alpha - theta) / (1 - theta))
+
+
+class PeakOriented(RestoringForceModel):
+    """
+    Peak-oriented degrading spring (Clough, Takeda, pinching) on a bilinear
+    backbone with post-yield stiffness alpha k.
+
+    Unloading follows the stiffness k (u_m / uy)^-beta, where u_m is the
+    largest excursion on the loaded side. Past zero force the spring reloads
+    towards the largest excursion reached so far in the direction of motion
+    (the yield point at first). With pinching, reloading first heads for a
+    break point at kappa times the target force, on the unloading line
+    through the target, so the loop is narrow around zero force. The state
+    holds the last committed displacement and force, the largest positive
+    and negative excursions and the zero-force point of the reloading path.
+
+    Parameters:
+    - k: Elastic stiffness (N/m), scalar or one per oscillator
+    - Fy: Yield strength (N), scalar or one per oscillator
+    - alpha: Post-yield stiffness ratio of the backbone (non-negative)
+    - beta: Unloading stiffness degradation exponent (0 for Clough, about 0.4 for Takeda)
+    - kappa: Pinching factor, 1 for no pinching
+    """
+    kind = PEAK_ORIENTED
+
+    def __init__(self, k, Fy, alpha=0.0, beta=0.0, kappa=1.0):
+        super().__init__(k, Fy, alpha, beta, kappa)
+
+    def initial_state(self):
+        state = super().initial_state()
+        uy = self.params[1] / self.params[0]
+        state[2] = uy
+        state[3] = -uy
+        return state
+
+
+class Clough(PeakOriented):
+    """
+    Clough's stiffness-degrading spring: elastic unloading, reloading towards
+    the previous peak (see PeakOriented).
+
+    Parameters:
+    - k: Elastic stiffness (N/m), scalar or one per oscillator
+    - Fy: Yield strength (N), scalar or one per oscillator
+    - alpha: Post-yield stiffness ratio of the backbone (non-negative)
+    """
+
+    def __init__(self, k, Fy, alpha=0.0):
+        super().__init__(k, Fy, alpha)
+
+
+class Takeda(PeakOriented):
+    """
+    Takeda's spring: Clough's rules with an unloading stiffness that
+    degrades with the largest excursion (see PeakOriented).
+
+    Parameters:
+    - k: Elastic stiffness (N/m), scalar or one per oscillator
+    - Fy: Yield strength (N), scalar or one per oscillator
+    - alpha: Post-yield stiffness ratio of the backbone (non-negative)
+    - beta: Unloading stiffness degradation exponent
+    """
+
+    def __init__(self, k, Fy, alpha=0.0, beta=0.4):
+        super().__init__(k, Fy, alpha, beta)
+
+
+class Pinching(PeakOriented):
+    """
+    Peak-oriented spring with pinched reloading (see PeakOriented).
+
+    Parameters:
+    - k: Elastic stiffness (N/m), scalar or one per oscillator
+    - Fy: Yield strength (N), scalar or one per oscillator
+    - alpha: Post-yield stiffness ratio of the backbone (non-negative)
+    - kappa: Ratio of the break-point force to the target force (0 to 1)
+    - beta: Unloading stiffness degradation exponent
+    """
+
+    def __init__(self, k, Fy, alpha=0.0, kappa=0.5, beta=0.0):
+        super().__init__(k, Fy, alpha, beta, kappa)
+
+
+class BoucWen(RestoringForceModel):
+    """
+    Smooth Bouc-Wen spring fs = alpha k u + (1 - alpha) Fy z, with the
+    hysteretic variable z evolving as
+    dz/du = (1 - |z|^n (beta sign(du z) + gamma)) / uy, integrated over each
+    step with one Runge-Kutta step in u. z follows from the committed force,
+    so the state holds the last committed displacement and force only.
+
+    Parameters:
+    - k: Elastic stiffness (N/m), scalar or one per oscillator
+    - Fy: Yield strength (N), scalar or one per oscillator
+    - alpha: Post-yield stiffness ratio (below 1)
+    - n: Sharpness of the transition to yielding
+    - beta, gamma: Shape of the loop (beta + gamma = 1 keeps |z| <= 1)
+    """
+    kind = BOUC_WEN
+
+    def __init__(self, k, Fy, alpha=0.05, n=1.0, beta=0.5, gamma=0.5):
+        super().__init__(k, Fy, alpha, n, beta, gamma)
+
+
+@inline_jit
+def _bouc_wen_rate(z, du, uy, n, beta, gamma):
+    # dz/du of the Bouc-Wen law
+    return (1 - np.abs(z) ** n * (beta * np.sign(du * z) + gamma)) / uy
+
+
+@inline_jit
+def _peak_oriented_force(params, state, u):
+    k = params[0]
+    Fy = params[1]
+    alpha = params[2]
+    u_c = state[0]
+    fs_c = state[1]
+    uy = Fy / k
+    du = u - u_c
+    d = _select(du >= 0, 1.0, -1.0)
+
+    # Unloading stiffness, from the largest excursion on the loaded side
+    u_m = _select(fs_c >= 0, state[2], -state[3])
+    k_u = k * (u_m / uy) ** -params[3]
+    fs_el = fs_c + k_u * du
+    # Target (largest excursion in the direction of motion, on the backbone),
+    # zero-force point of the reloading path and pinching break point
+    u_t = _select(d > 0, state[2], state[3])
+    F_t = d * (Fy + alpha * k * (d * u_t - uy))
+    u_0 = _select(d * fs_c <= 0, u_c - fs_c / k_u, state[4])
+    F_b = params[4] * F_t
+    u_b = u_t - (F_t - F_b) / k_u
+    pinched = d * (u_b - u_0) > 0
+    k_b = F_b / _select(pinched, u_b - u_0, 1.0)
+    # Every branch as d * force: the reloading path is convex, so it is the
+    # larger of its two lines, and the force is the lowest of the elastic
+    # line, the reloading path and the post-yield line
+    r_1 = _select(pinched, d * k_b * (u - u_0), -np.inf)
+    r_2 = d * (F_t + k_u * (u - u_t))
+    r = np.maximum(r_1, r_2)
+    k_r = _select(r_1 >= r_2, k_b, k_u)
+    e = d * fs_el
+    b = Fy + alpha * k * (d * u - uy)
+    fs = _select(e <= 0, fs_el, d * np.minimum(np.minimum(e, r), b))
+    kt = _select((e <= r) & (e <= b) | (e <= 0), k_u, _select(r <= b, k_r, alpha * k))
+    return fs, kt
+
+
+@jit
+def trial_force(kind, params, state, u):
+    """
+    Restoring force and tangent stiffness at displacement u, from the last
+    committed state (not modified). Works on one oscillator (params and
+    state are columns) or on a batch (rows of arrays).
+
+    Returns:
+    - fs: Restoring force
+    - kt: Tangent stiffness
+    """
+    k = params[0]
+    if kind == EPP:
+        fs_trial = state[1] + k * (u - state[0])
+        Fy = params[1]
+        fs = np.minimum(np.maximum(fs_trial, -Fy), Fy)
+        return fs, k * (np.abs(fs_trial) <= Fy)
+    if kind == BILINEAR:
+        fs_trial = state[1] + k * (u - state[0])
+        back = params[2] * k * u
+        r = (1 - params[2]) * params[1]
+        fs = np.minimum(np.maximum(fs_trial, back - r), back + r)
+        return fs, _select(np.abs(fs_trial - back) <= r, k, params[2] * k)
+    if kind == PEAK_ORIENTED:
+        return _peak_oriented_force(params, state, u)
+    if kind == BOUC_WEN:
+        Fy = params[1]
+        alpha = params[2]
+        n = params[3]
+        uy = Fy / k
+        du = u - state[0]
+        z = (state[1] - alpha * k * state[0]) / ((1 - alpha) * Fy)
+        k1 = _bouc_wen_rate(z, du, uy, n, params[4], params[5])
+        k2 = _bouc_wen_rate(z + 0.5 * du * k1, du, uy, n, params[4], params[5])
+        k3 = _bouc_wen_rate(z + 0.5 * du * k2, du, uy, n, params[4], params[5])
+        k4 = _bouc_wen_rate(z + du * k3, du, uy, n, params[4], params[5])
+        z = z + du * (k1 + 2 * k2 + 2 * k3 + k4) / 6
+        kt = alpha * k + (1 - alpha) * Fy * _bouc_wen_rate(z, du, uy, n, params[4], params[5])
+        return alpha * k * u + (1 - alpha) * Fy * z, kt
+    return k * u, k
+
+
+@jit
+def commit_state(kind, params, state, u, fs):
+    """
+    New state of the oscillators once a step has converged at displacement u
+    with restoring force fs.
+    """
+    if kind == EPP or kind == BILINEAR or kind == BOUC_WEN:
+        return (u, fs, state[2], state[3], state[4])
+    if kind == PEAK_ORIENTED:
+        # Zero-force point of the next reloading path, where the force changes sign
+        fs_c = state[1]
+        u_m = _select(fs_c >= 0, state[2], -state[3])
+        k_u = params[0] * (u_m * params[0] / params[1]) ** -params[3]
+        u_0 = _select(fs_c * fs <= 0, state[0] - fs_c / k_u, state[4])
+        return (u, fs, np.maximum(state[2], u), np.minimum(state[3], u), u_0)
+    return state
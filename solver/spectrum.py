@@ -0,0 +1,71 @@
+import numpy as np
+
+from solver.free_vibration import free_vibration_peaks
+
+# Ordinates tracked by the spectrum solvers, in the order of their peak arrays
+PEAK_KEYS = ("SD", "SV", "SA")
+
+
+def track_peaks(peaks, index, i, *values):
+    """
+    Updates running peaks of |value| and the step at which each occurred.
+
+    Parameters:
+    - peaks: Array of shape (len(values), n_oscillators), updated in place
+    - index: Integer array of the same shape, updated in place
+    - i: Current time step (index may hold fractional steps)
+    - *values: Current relative displacement, relative velocity and absolute
+      acceleration of every oscillator
+    """
+    for j, x in enumerate(values):
+        ax = np.abs(x)
+        new = ax > peaks[j]
+        np.copyto(peaks[j], ax, where=new)
+        np.copyto(index[j], i, where=new)
+
+
+def track_free_vibration(peaks, index, u, v, ζ, ωn, i_end):
+    """
+    Extends running peaks with the damped free vibration that follows the
+    record, evaluated in closed form from the final state (no time stepping).
+
+    Parameters:
+    - peaks, index: As in track_peaks (index must be a float array: the peak
+      of the free vibration generally falls between time steps)
+    - u, v: Displacement and velocity of every oscillator at step i_end
+    - ζ, ωn: Damping ratio and natural frequency of every oscillator
+    - i_end: Last step of the record
+    """
+    fv, t_fv = free_vibration_peaks(u, v, ζ, ωn)
+    for j in range(len(peaks)):
+        new = fv[j] > peaks[j]
+        np.copyto(peaks[j], fv[j], where=new)
+        np.copyto(index[j], i_end + t_fv[j], where=new)
+
+
+def spectrum_result(Tn_grid, peaks, index, dt, t0, shape):
+    """
+    Collects the tracked peaks into one structured spectrum result.
+
+    Parameters:
+    - Tn_grid: Natural period of every oscillator
+    - peaks, index: Peaks of |u|, |v| and |a_abs| and the steps at which they occur
+    - dt: Time step (s)
+    - t0: Time of step 0 (s)
+    - shape: Shape of each ordinate (see damping_grid)
+
+    Returns:
+    - spectrum: Dictionary of arrays of the given shape:
+      SD (m), SV (m/s), SA (absolute acceleration, m/s²),
+      PSV = ωn SD (m/s), PSA = ωn² SD (m/s²), and the times
+      of the peaks t_SD, t_SV, t_SA (s); NaN for oscillators not computed
+    """
+    ωn = 2 * np.pi / Tn_grid
+    spectrum = {}
+    for j, key in enumerate(PEAK_KEYS):
+        spectrum[key] = peaks[j].reshape(shape)
+        t_peak = np.where(np.isnan(peaks[j]), np.nan, t0 + index[j] * dt)
+        spectrum["t_" + key] = t_peak.reshape(shape)
+    spectrum["PSV"] = (ωn * peaks[0]).reshape(shape)
+    spectrum["PSA"] = (ωn**2 * peaks[0]).reshape(shape)
+    return spectrum
@@ -0,0 +1,228 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy.linalg import matrix_balance
+from scipy.signal import lfilter
+
+
+def central_difference_state_space(m, k, c, dt):
+    """
+    Central Difference Method written as a linear recurrence
+    x[i+1] = A x[i] + B0 f[i] + B1 f[i+1] with state x = [u[i], u[i-1]].
+
+    Returns:
+    - A, B0, B1: Transition matrix and forcing vectors
+    """
+    k_hat = m / dt**2 + c / (2 * dt)
+    a1 = m / dt**2 - c / (2 * dt)
+    b = k - 2 * m / dt**2
+
+    A = np.array([[-b / k_hat, -a1 / k_hat],
+                  [1.0, 0.0]])
+    B0 = np.array([1 / k_hat, 0.0])
+    B1 = np.zeros(2)
+    return A, B0, B1
+
+
+def newmark_state_space(m, k, c, dt, gamma, beta):
+    """
+    Newmark-beta Method written as a linear recurrence
+    x[i+1] = A x[i] + B0 f[i] + B1 f[i+1] with state x = [u, v, a].
+
+    Returns:
+    - A, B0, B1: Transition matrix and forcing vectors
+    """
+    a1 = m / (beta * dt**2) + c * gamma / (beta * dt)
+    a2 = m / (beta * dt) + c * (gamma / beta - 1)
+    a3 = m / (2 * beta) - m + dt * c * (gamma / (2 * beta) - 1)
+    k_hat = k + a1
+
+    row_u = np.array([a1, a2, a3]) / k_hat
+    du = row_u - np.array([1.0, 0.0, 0.0])
+    row_v = gamma / (beta * dt) * du + np.array([0.0, 1 - gamma / beta, dt * (1 - gamma / (2 * beta))])
+    row_a = du / (beta * dt**2) + np.array([0.0, -1 / (beta * dt), -(1 / (2 * beta) - 1)])
+
+    A = np.vstack((row_u, row_v, row_a))
+    B0 = np.zeros(3)
+    B1 = np.array([1 / k_hat, gamma / (beta * dt) / k_hat, 1 / (beta * dt**2) / k_hat])
+    return A, B0, B1
+
+
+def kr_alpha_state_space(m, k, c, dt, rho):
+    """
+    KR-alpha Method written as a linear recurrence
+    x[i+1] = A x[i] + B0 f[i] + B1 f[i+1] with state x = [u, v, a].
+
+    Returns:
+    - A, B0, B1: Transition matrix and forcing vectors
+    """
+    alpha_m = (2 * rho - 1) / (rho + 1)
+    alpha_f = rho / (rho + 1)
+    gamma = 0.5 - alpha_m + alpha_f
+    beta = 0.25 * (1 - alpha_m + alpha_f) ** 2
+
+    alpha = m + gamma * dt * c + beta * dt ** 2 * k
+    alpha1 = m / alpha
+    alpha2 = ((0.5 + gamma) * m) / alpha
+    alpha3 = (alpha_m * m + alpha_f * gamma * dt * c + alpha_f * beta * dt ** 2 * k) / alpha
+
+    row_u = np.array([1.0, dt, dt ** 2 * alpha2])
+    row_v = np.array([0.0, 1.0, dt * alpha1])
+    v_alpha = (1 - alpha_f) * row_v + alpha_f * np.array([0.0, 1.0, 0.0])
+    fs_alpha = k * ((1 - alpha_f) * row_u + alpha_f * np.array([1.0, 0.0, 0.0]))
+    row_a = (-c * v_alpha - fs_alpha) / (m * (1 - alpha3)) - alpha3 / (1 - alpha3) * np.array([0.0, 0.0, 1.0])
+
+    A = np.vstack((row_u, row_v, row_a))
+    B0 = np.array([0.0, 0.0, alpha_f / (m * (1 - alpha3))])
+    B1 = np.array([0.0, 0.0, (1 - alpha_f) / (m * (1 - alpha3))])
+    return A, B0, B1
+
+
+def interpolation_state_space(m, ζ, Tn, dt):
+    """
+    Interpolation Excitation Method (exact for piecewise-linear excitation)
+    written as a linear recurrence x[i+1] = A x[i] + B0 f[i] + B1 f[i+1]
+    with state x = [u, v]. The entries are the recurrence coefficients of
+    solver.Interpolation_Excitation_THL._interpolation_coefficients.
+
+    Returns:
+    - A, B0, B1: Transition matrix and forcing vectors
+    """
+    from solver.Interpolation_Excitation_THL import _interpolation_coefficients
+
+    wn = 2 * np.pi / Tn
+    k = wn**2 * m
+    A, B, C, D, A_dash, B_dash, C_dash, D_dash = _interpolation_coefficients(ζ, wn, k, dt)
+
+    return (np.array([[A, B], [A_dash, B_dash]]),
+            np.array([C, C_dash]),
+            np.array([D, D_dash]))
+
+
+def _modal_form(A, max_cond):
+    """
+    Diagonalises the balanced transition matrix.
+
+    Returns:
+    - lam, V, V_inv, scale: Eigenvalues, eigenvectors, their inverse and the
+      balancing scale, or None when A is (nearly) defective
+    """
+    A_bal, T = matrix_balance(A, permute=False, separate=True)
+    scale = T[0]
+    lam, V = np.linalg.eig(A_bal)
+    if not np.all(np.isfinite(V)) or np.linalg.cond(V) > max_cond:
+        return None
+    return lam, V, np.linalg.inv(V), scale
+
+
+def _modal_filter(lam, V_inv, scale, B0, B1, f, x0):
+    """
+    Runs every modal coordinate through a first-order IIR filter.
+
+    Returns:
+    - q: Modal state history of shape (len(f), len(lam))
+    """
+    # Forcing in modal coordinates; the initial state is fed in as sample 0
+    # so that q[i] = lam * q[i-1] + drive[i] reproduces the recurrence.
+    drive = np.empty((len(f), len(lam)), dtype=complex)
+    drive[0] = V_inv @ (np.asarray(x0, dtype=float) / scale)
+    drive[1:] = (np.outer(f[:-1], B0 / scale) + np.outer(f[1:], B1 / scale)) @ V_inv.T
+
+    q = np.empty_like(drive)
+    for j in range(len(lam)):
+        q[:, j] = lfilter([1.0], [1.0, -lam[j]], drive[:, j])
+    return q
+
+
+def filter_response(A, B0, B1, f, x0, max_cond=1e8):
+    """
+    Evaluates x[i+1] = A x[i] + B0 f[i] + B1 f[i+1] for the whole forcing
+    history without a Python-level time loop.
+
+    The (balanced) transition matrix is diagonalised and every modal
+    coordinate is run through a first-order IIR filter with
+    scipy.signal.lfilter; the initial state enters as the first filter input.
+
+    Parameters:
+    - A, B0, B1: Recurrence matrices (see the *_state_space functions)
+    - f: Forcing array (length n)
+    - x0: Initial state
+    - max_cond: Largest eigenvector condition number accepted
+
+    Returns:
+    - x: State history of shape (n, len(x0)), or None when A is (nearly)
+      defective and the recurrence should be evaluated by the loop instead
+    """
+    f = np.asarray(f, dtype=float)
+    modal = _modal_form(A, max_cond)
+    if modal is None:
+        return None
+    lam, V, V_inv, scale = modal
+
+    q = _modal_filter(lam, V_inv, scale, B0, B1, f, x0)
+    return (q @ V.T).real * scale
+
+
+def chunked_filter_response(A, B0, B1, f, x0, n_chunks=None, max_cond=1e8):
+    """
+    Same result as filter_response, but the time axis is split into chunks
+    that are solved concurrently in a thread pool (lfilter releases the GIL).
+
+    By superposition, every chunk is first solved from a zero initial state.
+    A short sequential pass then carries the true state across the chunk
+    boundaries, q[s + L] = q_zero[L] + lam**L * q[s], and each chunk adds
+    its homogeneous part lam**i * q[s]. In modal coordinates both steps are
+    element-wise powers of the eigenvalues.
+
+    Parameters:
+    - A, B0, B1: Recurrence matrices (see the *_state_space functions)
+    - f: Forcing array (length n)
+    - x0: Initial state
+    - n_chunks: Number of chunks / threads (default os.cpu_count())
+    - max_cond: Largest eigenvector condition number accepted
+
+    Returns:
+    - x: State history of shape (n, len(x0)), or None when A is (nearly)
+      defective and the recurrence should be evaluated by the loop instead
+    """
+    f = np.asarray(f, dtype=float)
+    n = len(f)
+    modal = _modal_form(A, max_cond)
+    if modal is None:
+        return None
+    lam, V, V_inv, scale = modal
+
+    if n_chunks is None:
+        n_chunks = os.cpu_count() or 1
+    n_chunks = max(1, min(int(n_chunks), n - 1))
+    # Chunk j spans samples bounds[j] ... bounds[j+1] (boundaries shared)
+    bounds = np.linspace(0, n - 1, n_chunks + 1).astype(int)
+    zero = np.zeros(len(x0))
+
+    def particular(j):
+        return _modal_filter(lam, V_inv, scale, B0, B1, f[bounds[j]:bounds[j + 1] + 1], zero)
+
+    with ThreadPoolExecutor(max_workers=n_chunks) as pool:
+        parts = list(pool.map(particular, range(n_chunks)))
+
+    # Sequential pass over the chunk boundaries
+    starts = np.empty((n_chunks, len(lam)), dtype=complex)
+    q0 = V_inv @ (np.asarray(x0, dtype=float) / scale)
+    for j in range(n_chunks):
+        starts[j] = q0
+        q0 = parts[j][-1] + lam ** (bounds[j + 1] - bounds[j]) * q0
+
+    x = np.empty((n, len(x0)))
+
+    def assemble(j):
+        # The shared boundary sample is written by the chunk that starts there
+        stop = bounds[j + 1] + (j == n_chunks - 1)
+        steps = np.arange(stop - bounds[j])
+        q = parts[j][:len(steps)] + lam ** steps[:, None] * starts[j]
+        x[bounds[j]:stop] = (q @ V.T).real * scale
+
+    with ThreadPoolExecutor(max_workers=n_chunks) as pool:
+        list(pool.map(assemble, range(n_chunks)))
+
+    return x
@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from solver.fragility import fit_lognormal_fragility, monte_carlo_fragility
+from solver.preprocessing import load_record
+
+GM_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "GM_data")
+
+
+@pytest.fixture(scope="module")
+def records():
+    return [load_record(os.path.join(GM_DATA, name))
+            for name in ("ElCentro.txt", "Hollywood_090.txt", "Poe Road_270.txt")]
+
+
+def test_sa_fragility_rises_with_intensity(records):
+    distributions = {"Tn": stats.uniform(0.3, 1.2), "ζ": 0.05, "Cy": stats.uniform(0.15, 0.15),
+                     "Sa": stats.loguniform(0.05, 3.0)}
+    im_bins = np.geomspace(0.05, 3.0, 7)
+    result = monte_carlo_fragility(distributions, records, n_samples=600, mu_limits=(2.0, 4.0), im="Sa",
+                                   im_bins=im_bins, seed=1, dt=0.005, pad=5.0, n_workers=1)
+
+    assert result["counts"].sum() == 600
+    for probability in result["probability"]:
+        assert np.all(np.diff(probability) >= -0.05)
+        assert probability[-1] - probability[0] > 0.5
+    assert np.all(result["theta"] > im_bins[0]) and np.all(result["theta"] < im_bins[-1])
+    assert np.all((result["beta"] >= 0.05) & (result["beta"] <= 3.0))
+    # A weaker limit state is reached at a lower intensity
+    assert result["theta"][0] < result["theta"][1]
+
+
+
+def test_result_does_not_depend_on_workers(records):
+    # More samples than one default batch, so the split into batches matters
+    distributions = {"Tn": stats.uniform(0.3, 1.2), "ζ": 0.05, "Ry": stats.uniform(1.0, 7.0)}
+    runs = [monte_carlo_fragility(distributions, records, n_samples=2100, mu_limits=(2.0, 4.0),
+                                  im_bins=np.geomspace(1.0, 8.0, 6), seed=3, dt=0.005, pad=5.0, n_workers=n)
+            for n in (1, 4)]
+    np.testing.assert_array_equal(runs[0]["exceedances"], runs[1]["exceedances"])
+    np.testing.assert_array_equal(runs[0]["counts"], runs[1]["counts"])
+    assert runs[0]["mean"] == runs[1]["mean"]
+    np.testing.assert_array_equal(runs[0]["ductility_mean"], runs[1]["ductility_mean"])
+
+def test_fit_recovers_lognormal_parameters():
+    im = np.geomspace(0.5, 10.0, 30)
+    counts = np.full(len(im), 2000.0)
+    exceedances = np.round(counts * stats.norm.cdf(np.log(im / 3.0) / 0.4))
+    theta, beta = fit_lognormal_fragility(im, counts, exceedances)
+    assert theta == pytest.approx(3.0, rel=1e-2)
+    assert beta == pytest.approx(0.4, rel=1e-2)
+
+
+def test_fit_rejects_degenerate_counts():
+    # Exceedance falling with the intensity has no lognormal fragility
+    theta, beta = fit_lognormal_fragility([0.1, 0.3, 1.0, 3.0], [100, 100, 100, 100], [100, 70, 30, 15])
+    assert np.isnan(theta) and np.isnan(beta)
+    assert np.isnan(fit_lognormal_fragility([0.1, 1.0], [10, 10], [0, 0])[0])
@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+import pytest
+
+from solver.ida import ida_fractiles, ida_record
+from solver.preprocessing import load_record, resample_record
+from solver.restoring_force import Bilinear
+
+GM_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "GM_data")
+
+
+@pytest.fixture(scope="module")
+def curves():
+    curves = []
+    for name in ("ElCentro.txt", "Hollywood_090.txt", "Poe Road_270.txt"):
+        time, accel = load_record(os.path.join(GM_DATA, name))
+        time, accel = resample_record(accel, time, dt=0.005, pad=5.0)
+        curves.append(ida_record(accel, time, Tn=1.0, Cy=0.2, model=Bilinear, alpha=0.3, n_hunt=8))
+    return curves
+
+
+def never_collapsed(curve):
+    # The curve of a record whose ladder topped out at its last level standing
+    standing = np.isfinite(curve["ductility"])
+    return dict(curve, im=curve["im"][standing], scale=curve["scale"][standing],
+                ductility=curve["ductility"][standing], collapse_im=np.inf)
+
+
+def test_fractiles_with_records_that_never_collapse(curves):
+    mixed = [curves[0], never_collapsed(curves[1]), never_collapsed(curves[2])]
+    summary = ida_fractiles(mixed, np.linspace(0.5, 30.0, 20))
+
+    assert np.all(np.isfinite(summary["im_fractiles"]))
+    # Beyond their highest demand the censored records stay at their top level
+    for row, curve in zip(summary["im"][1:], mixed[1:]):
+        assert row[-1] == curve["im"][-1]
+    assert not np.any(np.isnan(summary["collapse_fractiles"]))
+    assert np.isinf(summary["collapse_fractiles"][-1])
+
+
+def test_fractiles_when_every_record_collapses(curves):
+    summary = ida_fractiles(curves, np.linspace(0.5, 30.0, 20))
+    collapse_im = [curve["collapse_im"] for curve in curves]
+    np.testing.assert_allclose(summary["collapse_fractiles"], np.percentile(collapse_im, (16, 50, 84)))
+    assert np.all(np.isfinite(summary["im_fractiles"]))
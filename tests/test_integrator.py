@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pytest
+
+from solver.EPP_CDM_THL import epp_time_history_solver
+from solver.EPP_Event_THL import epp_event_solver
+from solver.EPP_KR_THL import epp_kr_alpha_solver
+from solver.EPP_Newmark_THL import epp_newmark_solver
+from solver.integrator import CentralDifference, KRAlpha, Newmark, PiecewiseExact, integrate
+from solver.preprocessing import load_record, resample_record
+from solver.restoring_force import LinearElastic
+
+GM_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "GM_data")
+
+EPP_SOLVERS = [epp_time_history_solver, epp_newmark_solver, epp_kr_alpha_solver]
+
+
+@pytest.fixture(scope="module")
+def el_centro():
+    time, accel = load_record(os.path.join(GM_DATA, "ElCentro.txt"))
+    return resample_record(accel, time, dt=0.001, pad=20.0)
+
+
+@pytest.fixture(scope="module")
+def event_reference(el_centro):
+    time, accel = el_centro
+    return epp_event_solver(1.0, 0.05, 1.0, 6.0, accel, time)
+
+
+@pytest.mark.parametrize("scheme", [CentralDifference(), Newmark(), Newmark(0.5, 1 / 6), KRAlpha(1.0), KRAlpha(0.8),
+                                    PiecewiseExact()])
+def test_linear_step_response_matches_closed_form(scheme):
+    # Suddenly applied constant force on a batch of damped oscillators
+    m, ζ, F, dt = 1.0, 0.05, 1.0, 0.001
+    Tn = np.array([0.2, 1.0, 3.0])
+    k = (2 * np.pi / Tn) ** 2 * m
+    c = 2 * ζ * np.sqrt(k * m)
+    t = np.arange(int(round(10.0 / dt)) + 1) * dt
+    u = integrate(scheme, LinearElastic(k), m, c, np.full(len(t), F), dt, history=True)[4][0]
+
+    wn = np.sqrt(k / m)[:, None]
+    wd = wn * np.sqrt(1 - ζ**2)
+    exact = F / k[:, None] * (1 - np.exp(-ζ * wn * t) * (np.cos(wd * t) + ζ / np.sqrt(1 - ζ**2) * np.sin(wd * t)))
+    np.testing.assert_allclose(u, exact, atol=2e-3 * F / k.min())
+
+
+@pytest.mark.parametrize("solver", EPP_SOLVERS)
+def test_epp_stays_elastic_below_yield(el_centro, solver):
+    # With Ry < 1 the peak is the elastic one, so the ductility demand is Ry
+    time, accel = el_centro
+    _, _, _, ductility, residual = solver(1.0, 0.05, 1.0, 0.5, accel, time)
+    assert ductility == pytest.approx(0.5, rel=1e-4)
+    assert abs(residual) < 1e-9
+
+
+@pytest.mark.parametrize("solver", EPP_SOLVERS)
+def test_epp_matches_event_reference(el_centro, event_reference, solver):
+    time, accel = el_centro
+    _, _, _, ductility, residual = solver(1.0, 0.05, 1.0, 6.0, accel, time)
+    assert ductility == pytest.approx(event_reference[3], rel=1e-4)
+    assert residual == pytest.approx(event_reference[4], rel=1e-3)
+    # CDM, Newmark and KR-alpha agree on the El Centro demand
+    assert ductility == pytest.approx(5.667, abs=1e-3)
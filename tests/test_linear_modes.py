@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pytest
+
+from solver.Interpolation_Excitation_RSL import interpolation_response_spectrum_solver
+from solver.Interpolation_Excitation_THL import interpolation_excitation_solver
+from solver.KR_aplha_THL import kr_alpha_linear_solver
+from solver.central_difference_THL import central_difference_solver
+from solver.frequency_domain_RSL import frequency_domain_response_spectrum_solver
+from solver.frequency_domain_THL import frequency_domain_solver
+from solver.newmark_method_THL import newmark_solver
+from solver.preprocessing import load_record, resample_record
+
+GM_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "GM_data")
+
+
+@pytest.fixture(scope="module")
+def el_centro():
+    time, accel = load_record(os.path.join(GM_DATA, "ElCentro.txt"))
+    return resample_record(accel, time, dt=0.001, pad=20.0)
+
+
+def assert_same_response(result, reference, rtol):
+    # Every output history agrees with the reference up to rtol of its peak
+    assert len(result) == len(reference)
+    for x, y in zip(result, reference):
+        np.testing.assert_allclose(x, y, rtol=0, atol=rtol * np.max(np.abs(y)))
+
+
+@pytest.mark.parametrize("solver, args", [
+    (central_difference_solver, ()),
+    (newmark_solver, (0.5, 0.25)),
+    (newmark_solver, (0.5, 1 / 6)),
+    (kr_alpha_linear_solver, (1.0,)),
+    (kr_alpha_linear_solver, (0.8,)),
+    (interpolation_excitation_solver, ()),
+])
+@pytest.mark.parametrize("Tn", [0.1, 1.0, 3.0])
+def test_filter_mode_matches_loop(el_centro, solver, args, Tn):
+    time, accel = el_centro
+    loop = solver(1.0, 0.05, Tn, accel, time, *args, mode="loop")
+    assert_same_response(solver(1.0, 0.05, Tn, accel, time, *args, mode="filter"), loop, 1e-9)
+
+
+
+@pytest.mark.parametrize("solver, args", [
+    (newmark_solver, (0.5, 0.25)),
+    (interpolation_excitation_solver, ()),
+])
+@pytest.mark.parametrize("n_workers", [1, 3, 8])
+def test_chunked_mode_matches_loop(el_centro, solver, args, n_workers):
+    time, accel = el_centro
+    loop = solver(1.0, 0.05, 1.0, accel, time, *args, mode="loop")
+    chunked = solver(1.0, 0.05, 1.0, accel, time, *args, mode="chunked", n_workers=n_workers)
+    assert_same_response(chunked, loop, 1e-9)
+
+# The FFT solvers have no time loop; the reference is the loop of the
+# interpolation of excitation, exact for the same (already padded) record.
+# The FFT treats the samples as band-limited, an O((ωn dt)²) difference
+
+@pytest.mark.parametrize("Tn", [0.1, 1.0, 3.0])
+def test_frequency_domain_matches_interpolation_loop(el_centro, Tn):
+    time, accel = el_centro
+    u, v, a, t = frequency_domain_solver(1.0, 0.05, Tn, accel, time, pad=0.0)
+    u_ref, v_ref, _ = interpolation_excitation_solver(1.0, 0.05, Tn, accel, time, mode="loop")
+    np.testing.assert_allclose(t, time)
+    assert_same_response((u, v), (u_ref, v_ref), 1e-3)
+
+
+def test_frequency_domain_spectrum_matches_interpolation(el_centro):
+    time, accel = el_centro
+    Tn_values = np.arange(0.05, 3.0, 0.05)
+    _, spectrum = frequency_domain_response_spectrum_solver(0.05, accel, time, pad=0.0, Tn_values=Tn_values,
+                                                            full_output=True)
+    _, reference = interpolation_response_spectrum_solver(0.05, accel, time, Tn_values=Tn_values, full_output=True)
+    for key in ("SD", "SV", "SA"):
+        np.testing.assert_allclose(spectrum[key], reference[key], rtol=2e-3)
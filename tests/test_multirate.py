@@ -0,0 +1,82 @@
+import os
+from functools import partial
+
+import numpy as np
+import pytest
+
+from solver.Interpolation_Excitation_RSL import interpolation_response_spectrum_solver
+from solver.KR_alpha_RSL import kr_alpha_response_spectrum_solver
+from solver.central_difference_RSL import cd_response_spectrum_solver
+from solver.multirate_RSL import multirate_levels, multirate_response_spectrum, period_error
+from solver.newmark_method_RSL import newmark_response_spectrum_solver
+from solver.period_grid import adaptive_response_spectrum
+from solver.preprocessing import load_record, resample_record
+
+GM_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "GM_data")
+
+
+@pytest.fixture(scope="module")
+def el_centro():
+    time, accel = load_record(os.path.join(GM_DATA, "ElCentro.txt"))
+    return resample_record(accel, time, dt=0.001, pad=20.0)
+
+
+@pytest.mark.parametrize("solver, args, Tn_values", [
+    # Every band decimated at least twice: the record must be halved once per level
+    (newmark_response_spectrum_solver, (0.5, 0.25), [2.0, 2.5, 3.0]),
+    (interpolation_response_spectrum_solver, (), [0.5, 2.0, 3.0]),
+    (cd_response_spectrum_solver, (), [1.5, 3.0]),
+    (newmark_response_spectrum_solver, (0.5, 0.25), np.arange(0.05, 3.0, 0.05)),
+])
+def test_multirate_matches_dense_solver(el_centro, solver, args, Tn_values):
+    time, accel = el_centro
+    Tn_values = np.asarray(Tn_values, dtype=float)
+    _, dense = solver(0.05, accel, time, *args, Tn_values=Tn_values)
+    _, multirate = multirate_response_spectrum(solver, 0.05, accel, time, *args, Tn_values=Tn_values)
+    np.testing.assert_allclose(multirate, dense, rtol=1e-2)
+
+
+def test_adaptive_multirate_matches_dense_solver(el_centro):
+    time, accel = el_centro
+    solver = partial(multirate_response_spectrum, newmark_response_spectrum_solver)
+    Tn_values, spectrum = adaptive_response_spectrum(solver, 0.05, accel, time, 0.5, 0.25, Tn_min=0.05, Tn_max=3.0,
+                                                     full_output=True)
+    _, dense = newmark_response_spectrum_solver(0.05, accel, time, 0.5, 0.25, Tn_values=Tn_values)
+    np.testing.assert_allclose(spectrum["SD"], dense, rtol=1e-2)
+    # The grid only refines the true peaks, not multirate artifacts
+    assert len(Tn_values) < 400
+
+
+@pytest.mark.parametrize("solver, args, C", [
+    (newmark_response_spectrum_solver, (0.5, 0.25), 1 / 12),
+    (newmark_response_spectrum_solver, (0.5, 1 / 6), 1 / 24),
+    (cd_response_spectrum_solver, (), 1 / 24),
+    (kr_alpha_response_spectrum_solver, (1.0,), 1 / 12),
+    (interpolation_response_spectrum_solver, (), 0.0),
+])
+def test_period_error_follows_scheme_parameters(solver, args, C):
+    assert period_error(solver, *args) == pytest.approx(C, rel=1e-4, abs=1e-12)
+
+
+def test_numerical_dissipation_refines_steps():
+    # KR-alpha with rho < 1 has a larger period error than with rho = 1
+    assert period_error(kr_alpha_response_spectrum_solver, 0.5) > 1.2 * period_error(kr_alpha_response_spectrum_solver, 1.0)
+    Tn_values = np.geomspace(0.05, 3.0, 20)
+    assert np.all(multirate_levels(kr_alpha_response_spectrum_solver, Tn_values, 0.001, 0.5) <=
+                  multirate_levels(kr_alpha_response_spectrum_solver, Tn_values, 0.001, 1.0))
+
+
+def test_levels_see_through_partial():
+    Tn_values = np.geomspace(0.01, 3.0, 20)
+    bare = multirate_levels(newmark_response_spectrum_solver, Tn_values, 0.001, 0.5, 1 / 6, tol=0.1)
+    wrapped = multirate_levels(partial(newmark_response_spectrum_solver, gamma=0.5, beta=1 / 6), Tn_values, 0.001,
+                               tol=0.1)
+    np.testing.assert_array_equal(wrapped, bare)
+    # The stability cap of the Central Difference Method survives the wrapper
+    cd = multirate_levels(partial(cd_response_spectrum_solver, free_vibration=True), Tn_values, 0.001, tol=0.5)
+    assert np.all(2 * np.pi / Tn_values * 0.001 * 2.0**cd < 2)
+
+
+def test_unknown_solver_is_rejected():
+    with pytest.raises(ValueError):
+        multirate_levels(lambda ζ, accel, time, Tn_values=None: None, [1.0], 0.001)
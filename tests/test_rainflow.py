@@ -0,0 +1,23 @@
+import numpy as np
+
+from solver.rainflow import rainflow, rainflow_summary, turning_points
+
+
+def test_astm_e1049_example():
+    # Rainflow example of ASTM E1049 (fig. 6)
+    ranges, _, counts, _ = rainflow(np.array([-2.0, 1.0, -3.0, 5.0, -1.0, 3.0, -4.0, 4.0, -2.0]))
+    total = {}
+    for r, n in zip(ranges, counts):
+        total[r] = total.get(r, 0.0) + n
+    assert total == {3.0: 0.5, 4.0: 1.5, 6.0: 0.5, 8.0: 1.0, 9.0: 0.5}
+
+
+def test_flat_history_has_no_cycles():
+    np.testing.assert_array_equal(turning_points(np.full(10, 2.0)), [2.0])
+    summary = rainflow_summary(np.zeros(10), failure_range=1.0)
+    assert summary["cycles"] == 0.0
+    assert summary["miner_sum"] == 0.0
+    # A flat run next to a cycling one
+    summary = rainflow_summary([np.zeros(5), np.array([0.0, 1.0, -1.0, 0.0])])
+    np.testing.assert_array_equal(summary["cycles"], [0.0, 1.5])
+    assert summary["histogram"].dtype == float